@@ -4,4 +4,56 @@
 - Алгоритм Диффи-Хеллмана для обмена ключами
 - RSA алгоритм для шифрования/дешифрования и генерации ключей
 - Алгоритм Эль-Гамаля для шифрования/дешифрования
-"""
\ No newline at end of file
+
+Алгоритмы реализуют общий интерфейс cipher.interface.CipherAlgorithm и доступны
+по названию через реестр:
+    algorithm = get_algorithm('rsa')
+    cipher = algorithm.keygen(2048)
+    data = cipher.decrypt_bytes(cipher.encrypt_bytes(b'...'))
+"""
+import importlib
+
+# Реестр: название -> класс алгоритма или строка 'модуль:класс'.
+# Классы импортируются при первом обращении, чтобы импорт пакета не загружал все алгоритмы
+_registry = {
+    'rsa': 'cipher.rsa.rsa:RSA',
+    'elgamal': 'cipher.elgamal.elgamal:ElGamal',
+    'dh': 'cipher.diffie_hellman.session:DiffieHellmanSession',
+}
+
+
+def register(name, algorithm):
+    """
+    Регистрация алгоритма.
+
+    :param name: Название алгоритма
+    :param algorithm: Подкласс CipherAlgorithm или строка 'модуль:класс'
+    """
+    _registry[name] = algorithm
+
+
+def get_algorithm(name):
+    """
+    Класс алгоритма по названию.
+
+    :param name: Название алгоритма
+    :return: Подкласс CipherAlgorithm
+    """
+    try:
+        algorithm = _registry[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм: {name}") from None
+
+    if isinstance(algorithm, str):
+        module_name, class_name = algorithm.split(':')
+        algorithm = _registry[name] = getattr(importlib.import_module(module_name), class_name)
+    return algorithm
+
+
+def algorithms():
+    """
+    Названия зарегистрированных алгоритмов.
+
+    :return: Отсортированный список названий
+    """
+    return sorted(_registry)
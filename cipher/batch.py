@@ -0,0 +1,294 @@
+"""
+Пакетное шифрование и дешифрование множества файлов.
+
+Задания берутся из каталога (рекурсивный обход) или из файла-манифеста
+и выполняются параллельно в пуле процессов. Завершенные задания записываются
+в журнал, поэтому прерванный запуск продолжается с того места, где остановился.
+
+Запуск из корня репозитория:
+    python -m cipher.batch keygen --algorithm rsa --key rsa_key.json
+    python -m cipher.batch encrypt --algorithm rsa --key rsa_key.json --input-dir data --output-dir enc
+    python -m cipher.batch decrypt --algorithm rsa --key rsa_key.json --input-dir enc --output-dir dec
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cipher import algorithms, get_algorithm
+
+# Расширение зашифрованных файлов при обходе каталога
+ENCRYPTED_SUFFIX = '.enc'
+
+# Шифр, переданный процессу пула при его запуске
+_worker_cipher = None
+
+
+def collect_tasks(input_dir, output_dir, operation):
+    """
+    Формирование заданий по содержимому каталога.
+
+    При шифровании к имени файла добавляется расширение .enc, при дешифровании
+    оно отбрасывается (или добавляется .dec, если его не было).
+    Структура подкаталогов сохраняется.
+
+    :param input_dir: Исходный каталог
+    :param output_dir: Каталог для результатов
+    :param operation: 'encrypt' или 'decrypt'
+    :return: Список пар (исходный файл, файл результата)
+    """
+    tasks = []
+    for root, _, files in os.walk(input_dir):
+        for name in sorted(files):
+            src = os.path.join(root, name)
+            rel = os.path.relpath(src, input_dir)
+            if operation == 'encrypt':
+                rel += ENCRYPTED_SUFFIX
+            elif rel.endswith(ENCRYPTED_SUFFIX):
+                rel = rel[:-len(ENCRYPTED_SUFFIX)]
+            else:
+                rel += '.dec'
+            tasks.append((src, os.path.join(output_dir, rel)))
+    return tasks
+
+
+def read_manifest(path):
+    """
+    Чтение заданий из манифеста.
+
+    Каждая непустая строка манифеста - путь к исходному файлу и путь к результату,
+    разделенные табуляцией. Строки, начинающиеся с #, пропускаются.
+
+    :param path: Путь к манифесту
+    :return: Список пар (исходный файл, файл результата)
+    """
+    tasks = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            parts = line.split('\t')
+            if len(parts) != 2:
+                raise ValueError(f"Строка {line_number} манифеста должна содержать два пути через табуляцию")
+            tasks.append((parts[0], parts[1]))
+    return tasks
+
+
+def read_journal(path):
+    """
+    Чтение журнала завершенных заданий.
+
+    :param path: Путь к журналу
+    :return: Множество пар (исходный файл, файл результата), которые уже обработаны
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Последняя строка могла остаться недописанной при аварийном завершении
+                continue
+            done.add((entry['src'], entry['dst']))
+    return done
+
+
+def _init_worker(cipher):
+    """Запоминание шифра в процессе пула (передается один раз на процесс)"""
+    global _worker_cipher
+    _worker_cipher = cipher
+
+
+def _run_task(operation, src, dst, cipher=None):
+    """
+    Выполнение одного задания.
+
+    :param operation: 'encrypt' или 'decrypt'
+    :param src: Исходный файл
+    :param dst: Файл результата
+    :param cipher: Шифр (None - шифр процесса пула)
+    :return: Словарь с результатом: пути, объемы и время обработки
+    """
+    if cipher is None:
+        cipher = _worker_cipher
+
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+
+    # Результат пишется во временный файл и переименовывается только после успеха,
+    # чтобы прерванное задание не оставило недописанный файл; шифрование в этот же
+    # временный файл при повторном запуске продолжается с его контрольной точки
+    tmp = dst + '.part'
+    if operation == 'encrypt':
+        cipher.encrypt_file(src, tmp)
+    else:
+        cipher.decrypt_file(src, tmp)
+    os.replace(tmp, dst)
+
+    return {
+        'src': src,
+        'dst': dst,
+        'bytes_in': os.path.getsize(src),
+        'bytes_out': os.path.getsize(dst),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+class BatchReport:
+    def __init__(self, total, skipped):
+        """
+        Сводка по пакетному запуску.
+
+        :param total: Общее количество заданий
+        :param skipped: Количество заданий, пропущенных по журналу
+        """
+        self.total = total
+        self.skipped = skipped
+        self.completed = []
+        self.failed = []
+        self.elapsed = 0.0
+
+    @property
+    def bytes_in(self):
+        """Объем обработанных исходных данных в байтах"""
+        return sum(result['bytes_in'] for result in self.completed)
+
+    @property
+    def throughput(self):
+        """Пропускная способность в байтах исходных данных в секунду"""
+        return self.bytes_in / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Текстовая сводка для вывода пользователю"""
+        mb = self.bytes_in / 2**20
+        return (f"Обработано файлов: {len(self.completed)}, ошибок: {len(self.failed)}, "
+                f"пропущено по журналу: {self.skipped}, всего заданий: {self.total}\n"
+                f"Объем: {mb:.2f} МБ за {self.elapsed:.2f} с "
+                f"({self.throughput / 2**20:.2f} МБ/с, "
+                f"{len(self.completed) / self.elapsed if self.elapsed else 0:.1f} файлов/с)")
+
+
+def run_batch(cipher, operation, tasks, journal_path=None, workers=None, progress=None):
+    """
+    Параллельное выполнение пакета заданий.
+
+    :param cipher: Объект алгоритма (cipher.interface.CipherAlgorithm)
+    :param operation: 'encrypt' или 'decrypt'
+    :param tasks: Список пар (исходный файл, файл результата)
+    :param journal_path: Путь к журналу завершенных заданий (None - без журнала)
+    :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+    :param progress: Функция progress(номер, всего, результат), вызываемая после каждого файла;
+                     результат - словарь из _run_task или словарь с ключом 'error'
+    :return: Объект BatchReport
+    """
+    if operation not in ('encrypt', 'decrypt'):
+        raise ValueError(f"Неизвестная операция: {operation}")
+
+    done = read_journal(journal_path) if journal_path else set()
+    pending = [task for task in tasks if tuple(task) not in done]
+    report = BatchReport(len(tasks), len(tasks) - len(pending))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+
+    def record(result):
+        if 'error' in result:
+            report.failed.append(result)
+        else:
+            report.completed.append(result)
+            if journal:
+                journal.write(json.dumps(result, ensure_ascii=False) + '\n')
+                journal.flush()
+        if progress:
+            progress(len(report.completed) + len(report.failed), len(pending), result)
+
+    start = time.perf_counter()
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            for src, dst in pending:
+                try:
+                    record(_run_task(operation, src, dst, cipher))
+                except Exception as e:
+                    record({'src': src, 'dst': dst, 'error': str(e)})
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(cipher,)) as pool:
+                futures = {pool.submit(_run_task, operation, src, dst): (src, dst) for src, dst in pending}
+                for future in as_completed(futures):
+                    src, dst = futures[future]
+                    try:
+                        record(future.result())
+                    except Exception as e:
+                        record({'src': src, 'dst': dst, 'error': str(e)})
+    finally:
+        report.elapsed = time.perf_counter() - start
+        if journal:
+            journal.close()
+
+    return report
+
+
+def generate_key(algorithm, path, key_size):
+    """
+    Генерация ключа и сохранение его в файл.
+
+    Для Диффи-Хеллмана выполняется обмен ключами между двумя сторонами,
+    а в файл сохраняется ключ сеанса AES на общем секрете.
+
+    :param algorithm: Название алгоритма из реестра cipher ('rsa', 'elgamal', 'dh')
+    :param path: Путь к файлу ключа
+    :param key_size: Размер ключа в битах
+    """
+    get_algorithm(algorithm).keygen(key_size).save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетное шифрование и дешифрование файлов")
+    parser.add_argument('operation', choices=['keygen', 'encrypt', 'decrypt'], help="Операция")
+    parser.add_argument('--algorithm', choices=algorithms(), required=True, help="Алгоритм")
+    parser.add_argument('--key', required=True, help="Файл ключа (JSON)")
+    parser.add_argument('--key-size', type=int, default=1024, help="Размер ключа для keygen")
+    parser.add_argument('--input-dir', help="Каталог с исходными файлами")
+    parser.add_argument('--output-dir', help="Каталог для результатов")
+    parser.add_argument('--manifest', help="Манифест: строки 'исходный файл<TAB>результат'")
+    parser.add_argument('--journal', help="Журнал завершенных заданий для продолжения прерванного запуска")
+    parser.add_argument('--workers', type=int, default=None, help="Количество процессов")
+    args = parser.parse_args()
+
+    if args.operation == 'keygen':
+        generate_key(args.algorithm, args.key, args.key_size)
+        print(f"Ключ сохранен в {args.key}")
+        return
+
+    if args.manifest:
+        tasks = read_manifest(args.manifest)
+    elif args.input_dir and args.output_dir:
+        tasks = collect_tasks(args.input_dir, args.output_dir, args.operation)
+    else:
+        parser.error("нужно указать --manifest или --input-dir и --output-dir")
+
+    cipher = get_algorithm(args.algorithm).load(args.key)
+
+    def progress(number, total, result):
+        if 'error' in result:
+            print(f"[{number}/{total}] ОШИБКА {result['src']}: {result['error']}")
+        else:
+            print(f"[{number}/{total}] {result['src']} -> {result['dst']} "
+                  f"({result['bytes_in']} байт, {result['seconds']:.2f} с)")
+
+    report = run_batch(cipher, args.operation, tasks, args.journal, args.workers, progress)
+    print(report.summary())
+
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
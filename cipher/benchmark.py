@@ -0,0 +1,247 @@
+"""
+Замеры производительности общих арифметических модулей пакета cipher.
+
+Запуск из корня репозитория:
+    python -m cipher.benchmark --bits 1024 2048 4096
+    python -m cipher.benchmark keys --key-bits 128 256 512
+    python -m cipher.benchmark nonces
+    python -m cipher.benchmark multiexp --bits 1024 2048
+"""
+import argparse
+import os
+import random
+import secrets
+import time
+
+from cipher.elgamal.elgamal import ElGamal
+from cipher.modular import ModulusContext
+from cipher.multiexp import choose_window, multi_pow
+from cipher.randomness import BufferedRandomSource, DeterministicRandomSource
+from cipher.rsa.rsa import RSA
+
+BENCHMARKS = ('context', 'keys', 'nonces', 'multiexp')
+
+
+def measure(func, iterations):
+    """
+    Замер среднего времени выполнения функции.
+    
+    :param func: Функция без аргументов
+    :param iterations: Количество повторений
+    :return: Среднее время одного вызова в секундах
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_modulus_context(bits, iterations):
+    """
+    Сравнение встроенной pow и ModulusContext.pow для фиксированного основания.
+    
+    :param bits: Размер модуля в битах
+    :param iterations: Количество возведений в степень
+    """
+    modulus = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+    base = random.randrange(2, modulus)
+    exponents = [random.getrandbits(bits) for _ in range(iterations)]
+    
+    start = time.perf_counter()
+    context = ModulusContext(modulus)
+    context.precompute(base)
+    setup_time = time.perf_counter() - start
+    
+    for exponent in exponents:
+        assert context.pow(base, exponent) == pow(base, exponent, modulus)
+    
+    it = iter(exponents * 2)
+    builtin_time = measure(lambda: pow(base, next(it), modulus), iterations)
+    it = iter(exponents * 2)
+    context_time = measure(lambda: context.pow(base, next(it)), iterations)
+    
+    print(f"  {bits:5} бит  pow: {builtin_time * 1000:9.3f} мс  "
+          f"контекст: {context_time * 1000:9.3f} мс  (x{builtin_time / context_time:.2f}, "
+          f"подготовка {setup_time * 1000:.1f} мс)")
+
+
+def _rsa_records_uncached(data, public_key):
+    """
+    Цикл RSA._encrypt_records, в котором производные значения ключа (размер блока
+    и ширина записи) вычисляются заново для каждого блока, как до введения контекста ключа.
+    """
+    n, _ = public_key
+    block_size = (n.bit_length() - 1) // 8
+    view = memoryview(data)
+    records = bytearray(((n.bit_length() + 7) // 8) * -(-len(data) // block_size))
+    
+    pos = 0
+    for i in range(0, len(data), block_size):
+        n, e = public_key
+        size = (n.bit_length() - 1) // 8
+        width = (n.bit_length() + 7) // 8
+        block = pow(int.from_bytes(view[i:i + size], 'big'), e, n)
+        records[pos:pos + width] = block.to_bytes(width, 'big')
+        pos += width
+    
+    return records
+
+
+def _elgamal_records_uncached(cipher, data, public_key):
+    """
+    Цикл ElGamal._encrypt_records, в котором ключ, таблицы оснований и размеры
+    разрешаются заново для каждого байта, как до введения контекста ключа
+    (коды байтов g^m появились позже и берутся готовыми, как в основном цикле).
+    """
+    records = bytearray(public_key.record_width * len(data))
+    codes = cipher._byte_codes
+    
+    pos = 0
+    # Одноразовые k выбираются одним запросом, как в ElGamal._encrypt_records
+    nonces = cipher.key_context(public_key)[2].sample_many(len(data))
+    for byte, k in zip(data, nonces):
+        key, context, _ = cipher.key_context(public_key)
+        p, g, y = key
+        width = key.byte_length
+        g_table, y_table = context.table(g), context.table(y)
+        pow_g = g_table.pow if g_table else lambda k: pow(g, k, p)
+        pow_y = y_table.pow if y_table else lambda k: pow(y, k, p)
+        records[pos:pos + width] = pow_g(k).to_bytes(width, 'big')
+        records[pos + width:pos + 2 * width] = (pow_y(k) * codes[byte] % p).to_bytes(width, 'big')
+        pos += 2 * width
+    
+    return records
+
+
+def bench_key_context(bits, blocks):
+    """
+    Время шифрования одного блока с производными значениями ключа,
+    вычисляемыми заново на каждый блок, и с контекстом ключа.
+    
+    Разница заметна при малых ключах, где возведение в степень дешево
+    и накладные расходы на блок составляют большую долю времени.
+    
+    :param bits: Размер ключа в битах
+    :param blocks: Количество блоков в замере
+    """
+    rsa = RSA(bits)
+    elgamal = ElGamal(bits)
+    
+    variants = (
+        ('RSA', rsa, rsa.public_key.block_size,
+         lambda data: _rsa_records_uncached(data, tuple(rsa.public_key))),
+        ('Эль-Гамаль', elgamal, 1,
+         lambda data: _elgamal_records_uncached(elgamal, data, elgamal.public_key)),
+    )
+    
+    for name, cipher, block_size, uncached in variants:
+        data = os.urandom(block_size * blocks)
+        key = cipher.public_key
+        # Лучшее из нескольких повторений, чтобы сгладить шум планировщика
+        uncached_time = min(measure(lambda: uncached(data), 1) for _ in range(5))
+        cached_time = min(measure(lambda: cipher._encrypt_records(data, key), 1) for _ in range(5))
+        
+        print(f"  {bits:5} бит  {name:10}  блок {block_size:3} Б  "
+              f"без контекста: {uncached_time / blocks * 1e6:8.2f} мкс  "
+              f"с контекстом: {cached_time / blocks * 1e6:8.2f} мкс  "
+              f"(x{uncached_time / cached_time:.2f})")
+
+
+def bench_nonces(bits, count):
+    """
+    Выбор count случайных чисел меньше bits-битной границы: secrets.randbelow по одному,
+    буферизованный источник по одному и пакетом, детерминированный источник пакетом.
+    
+    :param bits: Размер границы в битах (порядок подгруппы q)
+    :param count: Количество чисел
+    """
+    bound = random.getrandbits(bits) | (1 << (bits - 1))
+    buffered = BufferedRandomSource()
+    deterministic = DeterministicRandomSource(0)
+    
+    timings = (
+        ('secrets', measure(lambda: [secrets.randbelow(bound) for _ in range(count)], 5)),
+        ('буфер', measure(lambda: [buffered.randbelow(bound) for _ in range(count)], 5)),
+        ('буфер пакетом', measure(lambda: buffered.randbelow_many(bound, count), 5)),
+        ('детерм. пакетом', measure(lambda: deterministic.randbelow_many(bound, count), 5)),
+    )
+    print(f"  {bits:5} бит  " + "  ".join(f"{name}: {t / count * 1e6:6.2f} мкс" for name, t in timings))
+
+
+def bench_multiexp(bits, count, exponent_bits, iterations):
+    """
+    Произведение count степеней по модулю: отдельные вызовы pow, прием Шамира
+    (окно 1 бит) и метод Штрауса с выбранным окном.
+    
+    :param bits: Размер модуля в битах
+    :param count: Количество оснований
+    :param exponent_bits: Размер показателей в битах (порядок подгруппы или модуль)
+    :param iterations: Количество вычислений
+    """
+    modulus = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+    pairs = [(random.randrange(2, modulus), random.getrandbits(exponent_bits)) for _ in range(count)]
+    
+    def separate():
+        result = 1
+        for base, exponent in pairs:
+            result = result * pow(base, exponent, modulus) % modulus
+        return result
+    
+    assert multi_pow(pairs, modulus) == multi_pow(pairs, modulus, 1, True) == separate()
+    
+    window, joint = choose_window(exponent_bits, count)
+    separate_time = measure(separate, iterations)
+    shamir_time = measure(lambda: multi_pow(pairs, modulus, 1, True), iterations)
+    straus_time = measure(lambda: multi_pow(pairs, modulus), iterations)
+    
+    print(f"  {bits:5} бит  {count} осн.  показатели {exponent_bits:4} бит  "
+          f"pow: {separate_time * 1000:8.3f} мс  Шамир: {shamir_time * 1000:8.3f} мс  "
+          f"Штраус (окно {window}, {'общая' if joint else 'раздельные'}): {straus_time * 1000:8.3f} мс  "
+          f"(x{separate_time / straus_time:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности модульной арифметики")
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"Запускаемые замеры: {', '.join(BENCHMARKS)} (по умолчанию все)")
+    parser.add_argument('--bits', type=int, nargs='+', default=[1024, 2048, 3072, 4096],
+                        help="Размеры модуля в битах")
+    parser.add_argument('--iterations', type=int, default=20,
+                        help="Количество операций в каждом замере")
+    parser.add_argument('--key-bits', type=int, nargs='+', default=[128, 256, 512],
+                        help="Размеры ключей для замера контекста ключа")
+    parser.add_argument('--blocks', type=int, default=2000,
+                        help="Количество блоков в замере контекста ключа")
+    parser.add_argument('--nonces', type=int, default=4096,
+                        help="Количество одноразовых чисел в замере источников случайности")
+    args = parser.parse_args()
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"неизвестные замеры: {', '.join(unknown)}")
+    args.benchmarks = args.benchmarks or list(BENCHMARKS)
+    
+    if 'context' in args.benchmarks:
+        print("Возведение фиксированного основания в степень")
+        for bits in args.bits:
+            bench_modulus_context(bits, args.iterations)
+    
+    if 'keys' in args.benchmarks:
+        print("Шифрование блока с контекстом ключа")
+        for bits in args.key_bits:
+            bench_key_context(bits, args.blocks)
+    
+    if 'nonces' in args.benchmarks:
+        print("Выбор одноразовых чисел")
+        for bits in (160, 256):
+            bench_nonces(bits, args.nonces)
+    
+    if 'multiexp' in args.benchmarks:
+        print("Произведение степеней (проверка подписи Эль-Гамаля и Шнорра)")
+        for bits in args.bits:
+            for count in (2, 3):
+                for exponent_bits in (256, bits):
+                    bench_multiexp(bits, count, exponent_bits, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Двоичный формат файлов с шифротекстом из блоков фиксированной ширины.
+
+Структура файла:
+    заголовок - сигнатура алгоритма (4 байта), версия формата (1 байт),
+                ширина записи в байтах (2 байта), размер блока открытого текста
+                в байтах (4 байта), длина открытого текста в байтах (8 байт);
+    записи    - зашифрованные блоки, каждый ровно по ширине записи.
+
+Блок i открытого текста занимает байты [i * block_size, (i+1) * block_size),
+последний блок может быть короче. Фиксированная ширина записей позволяет читать
+файл через mmap без промежуточных строк и списков. Тот же формат используется
+для шифротекста в памяти (encrypt_bytes/decrypt_bytes).
+"""
+import mmap
+import os
+import struct
+
+# Версия формата
+VERSION = 1
+
+# Заголовок: сигнатура, версия, ширина записи, размер блока, длина открытого текста
+HEADER = struct.Struct('>4sBHIQ')
+
+# Длина сигнатуры алгоритма
+MAGIC_SIZE = 4
+
+
+def pack_header(magic, record_width, block_size, plaintext_length):
+    """
+    Формирование заголовка.
+    
+    :param magic: Сигнатура алгоритма (4 байта)
+    :param record_width: Ширина одной записи в байтах
+    :param block_size: Размер блока открытого текста в байтах
+    :param plaintext_length: Длина открытого текста в байтах
+    :return: Байты заголовка
+    """
+    return HEADER.pack(magic, VERSION, record_width, block_size, plaintext_length)
+
+
+def record_count(plaintext_length, block_size):
+    """
+    Количество записей шифротекста для открытого текста заданной длины.
+    
+    :param plaintext_length: Длина открытого текста в байтах
+    :param block_size: Размер блока открытого текста в байтах
+    :return: Количество блоков (последний блок может быть короче остальных)
+    """
+    return -(-plaintext_length // block_size)
+
+
+def unpack_header(header, magic):
+    """
+    Разбор и проверка заголовка.
+    
+    :param header: Байты заголовка (не короче HEADER.size)
+    :param magic: Ожидаемая сигнатура алгоритма или кортеж допустимых сигнатур
+    :return: Кортеж (ширина записи, размер блока, длина открытого текста)
+    """
+    if len(header) < HEADER.size:
+        raise ValueError("Данные слишком короткие для заголовка")
+    
+    data_magic, version, record_width, block_size, plaintext_length = HEADER.unpack_from(header)
+    
+    if data_magic not in (magic if isinstance(magic, tuple) else (magic,)):
+        raise ValueError("Данные записаны в формате другого алгоритма")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {version}")
+    if record_width == 0:
+        raise ValueError("Некорректная ширина записи")
+    if block_size == 0:
+        raise ValueError("Некорректный размер блока")
+    
+    return record_width, block_size, plaintext_length
+
+
+def parse_header(buffer, magic):
+    """
+    Разбор заголовка шифротекста, целиком находящегося в памяти.
+    
+    Количество записей должно точно соответствовать длине открытого текста из заголовка:
+    обрезанный или дополненный шифротекст отклоняется до дешифрования.
+    
+    :param buffer: Шифротекст целиком (bytes, memoryview или mmap)
+    :param magic: Ожидаемая сигнатура алгоритма или кортеж допустимых сигнатур
+    :return: Кортеж (ширина записи, размер блока, длина открытого текста, количество записей)
+    :raises ValueError: Если заголовок некорректен или количество записей не совпадает с заголовком
+    """
+    record_width, block_size, plaintext_length = unpack_header(buffer, magic)
+    
+    payload = len(buffer) - HEADER.size
+    if payload % record_width:
+        raise ValueError("Размер данных не кратен ширине записи")
+    
+    count = payload // record_width
+    if count != record_count(plaintext_length, block_size):
+        raise ValueError("Количество записей не соответствует длине открытого текста")
+    
+    return record_width, block_size, plaintext_length, count
+
+
+def iter_records(buffer, record_width, start, stop, offset=HEADER.size):
+    """
+    Срезы memoryview записей с номерами [start, stop) без копирования данных.
+    
+    :param buffer: Шифротекст (bytes или mmap)
+    :param record_width: Ширина одной записи в байтах
+    :param start: Номер первой записи
+    :param stop: Номер записи после последней
+    :param offset: Смещение первой записи в буфере (по умолчанию - сразу после заголовка)
+    :return: Генератор срезов memoryview
+    """
+    with memoryview(buffer) as view:
+        for pos in range(offset + start * record_width, offset + stop * record_width, record_width):
+            yield view[pos:pos + record_width]
+
+
+def is_block_file(path, magic):
+    """
+    Проверка, что файл записан в двоичном формате указанного алгоритма.
+    
+    :param path: Путь к файлу
+    :param magic: Сигнатура алгоритма или кортеж допустимых сигнатур
+    :return: True, если файл начинается с заголовка формата с этой сигнатурой
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(MAGIC_SIZE)
+    return prefix in (magic if isinstance(magic, tuple) else (magic,))
+
+
+class BlockCiphertext:
+    __slots__ = ('magic', 'buffer', 'record_width', 'block_size', 'plaintext_length', 'record_count')
+
+    def __init__(self, buffer, magic):
+        """
+        Шифротекст в памяти: заголовок и записи фиксированной ширины в одном объекте bytes.
+
+        В отличие от списка чисел или пар чисел, на весь шифротекст приходится
+        один объект, поэтому накладные расходы не зависят от числа блоков,
+        а сериализация (pickle, передача между процессами) сводится к копированию байтов.
+
+        :param buffer: Шифротекст в двоичном формате (например, результат encrypt_bytes)
+        :param magic: Ожидаемая сигнатура алгоритма или кортеж допустимых сигнатур
+        """
+        self.buffer = bytes(buffer)
+        self.record_width, self.block_size, self.plaintext_length, self.record_count = \
+            parse_header(self.buffer, magic)
+        self.magic = self.buffer[:MAGIC_SIZE]
+
+    def __len__(self):
+        return self.record_count
+
+    def __getitem__(self, index):
+        """Запись с номером index (отрицательные номера отсчитываются с конца)"""
+        if index < 0:
+            index += self.record_count
+        if not 0 <= index < self.record_count:
+            raise IndexError("Номер записи вне диапазона")
+        start = HEADER.size + index * self.record_width
+        return self.buffer[start:start + self.record_width]
+
+    def __iter__(self):
+        return iter_records(self.buffer, self.record_width, 0, self.record_count)
+
+    def __bytes__(self):
+        return self.buffer
+
+    def __eq__(self, other):
+        if not isinstance(other, BlockCiphertext):
+            return NotImplemented
+        return self.buffer == other.buffer
+
+    def __hash__(self):
+        return hash(self.buffer)
+
+    def __reduce__(self):
+        return type(self), (self.buffer, self.magic)
+
+    def records(self, start=0, stop=None):
+        """
+        Срезы memoryview записей с номерами [start, stop) без копирования данных.
+
+        :param start: Номер первой записи
+        :param stop: Номер записи после последней (None - до конца)
+        :return: Генератор срезов memoryview
+        """
+        if stop is None or stop > self.record_count:
+            stop = self.record_count
+        return iter_records(self.buffer, self.record_width, start, stop)
+
+
+class BlockFileWriter:
+    def __init__(self, file, magic, record_width, block_size):
+        """
+        Запись зашифрованных блоков в двоичный файл.
+        
+        Длина открытого текста накапливается по мере записи и сохраняется в заголовок
+        при закрытии, поэтому файл должен поддерживать seek.
+        
+        :param file: Путь к выходному файлу или двоичный файловый объект с поддержкой seek
+        :param magic: Сигнатура алгоритма (4 байта)
+        :param record_width: Ширина одной записи в байтах
+        :param block_size: Размер блока открытого текста в байтах
+        """
+        self.magic = magic
+        self.record_width = record_width
+        self.block_size = block_size
+        self.plaintext_length = 0
+        
+        # Файл, открытый по пути, закрывается вместе с объектом записи
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._file = open(file, 'wb') if self._owns_file else file
+        if not self._file.seekable():
+            raise ValueError("Поток для записи шифротекста должен поддерживать seek")
+        
+        self._start = self._file.tell()
+        self._closed = False
+        self._write_header()
+    
+    @classmethod
+    def resume(cls, path, magic, record_width, block_size, record_count, plaintext_length):
+        """
+        Продолжение записи в файл, созданный ранее и прерванный.
+        
+        Все, что записано после первых record_count записей, отбрасывается.
+        
+        :param path: Путь к выходному файлу
+        :param magic: Сигнатура алгоритма
+        :param record_width: Ширина одной записи в байтах
+        :param block_size: Размер блока открытого текста в байтах
+        :param record_count: Количество сохраняемых записей
+        :param plaintext_length: Длина открытого текста, соответствующего этим записям
+        :return: Объект BlockFileWriter, дописывающий файл
+        """
+        file = open(path, 'r+b')
+        try:
+            header = unpack_header(file.read(HEADER.size), magic)
+            if header[:2] != (record_width, block_size):
+                raise ValueError("Файл записан с другими параметрами блоков")
+        except ValueError:
+            file.close()
+            raise
+        
+        file.truncate(HEADER.size + record_count * record_width)
+        file.seek(0, os.SEEK_END)
+        
+        writer = cls.__new__(cls)
+        writer.magic = magic
+        writer.record_width = record_width
+        writer.block_size = block_size
+        writer.plaintext_length = plaintext_length
+        writer._owns_file = True
+        writer._file = file
+        writer._start = 0
+        writer._closed = False
+        return writer
+    
+    def _write_header(self):
+        """Запись заголовка с текущей длиной открытого текста"""
+        self._file.write(pack_header(self.magic, self.record_width, self.block_size, self.plaintext_length))
+    
+    def write(self, records, plaintext_length):
+        """
+        Запись последовательности записей.
+        
+        :param records: Байты записей, длина кратна ширине записи
+        :param plaintext_length: Длина открытого текста, соответствующего записям
+        """
+        if len(records) % self.record_width:
+            raise ValueError("Длина данных не кратна ширине записи")
+        self._file.write(records)
+        self.plaintext_length += plaintext_length
+    
+    def flush(self):
+        """Сброс буфера выходного файла"""
+        self._file.flush()
+    
+    def fileno(self):
+        """Дескриптор выходного файла"""
+        return self._file.fileno()
+    
+    def close(self):
+        """Сохранение итоговой длины открытого текста в заголовок"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        end = self._file.tell()
+        self._file.seek(self._start)
+        self._write_header()
+        self._file.seek(end)
+        
+        if self._owns_file:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BlockStreamReader:
+    def __init__(self, file, magic):
+        """
+        Последовательное чтение двоичного шифротекста из файлового объекта
+        (когда mmap недоступен, например, для сетевых потоков или BytesIO).
+        
+        :param file: Двоичный файловый объект
+        :param magic: Ожидаемая сигнатура алгоритма или кортеж допустимых сигнатур
+        """
+        self._file = file
+        header = file.read(HEADER.size)
+        self.record_width, self.block_size, self.plaintext_length = unpack_header(header, magic)
+        self.magic = header[:MAGIC_SIZE]
+        self.record_count = record_count(self.plaintext_length, self.block_size)
+    
+    def chunks(self, count):
+        """
+        Чтение записей частями.
+        
+        Количество записей сверяется с длиной открытого текста из заголовка: лишняя запись
+        отклоняется сразу, недостающие - в конце потока.
+        
+        :param count: Максимальное количество записей в части
+        :return: Генератор байтов частей, длина каждой кратна ширине записи
+        :raises ValueError: Если поток обрывается или количество записей не совпадает с заголовком
+        """
+        size = count * self.record_width
+        remaining = self.record_count
+        while True:
+            chunk = self._file.read(size)
+            if not chunk:
+                break
+            # Поток может вернуть меньше запрошенного - дочитываем до границы записи
+            while len(chunk) % self.record_width:
+                tail = self._file.read(self.record_width - len(chunk) % self.record_width)
+                if not tail:
+                    raise ValueError("Шифротекст обрывается посреди записи")
+                chunk += tail
+            remaining -= len(chunk) // self.record_width
+            if remaining < 0:
+                raise ValueError("Количество записей не соответствует длине открытого текста")
+            yield chunk
+        
+        if remaining:
+            raise ValueError("Количество записей не соответствует длине открытого текста")
+
+
+class BlockFileReader:
+    def __init__(self, path, magic):
+        """
+        Чтение двоичного файла с зашифрованными блоками через mmap.
+        
+        :param path: Путь к файлу
+        :param magic: Ожидаемая сигнатура алгоритма или кортеж допустимых сигнатур
+        """
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()
+            raise ValueError("Файл слишком короткий для заголовка")
+        
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            self.record_width, self.block_size, self.plaintext_length, self.record_count = \
+                parse_header(self._mmap, magic)
+            self.magic = self._mmap[:MAGIC_SIZE]
+        except ValueError:
+            self.close()
+            raise
+    
+    def records(self, start=0, stop=None):
+        """
+        Срезы memoryview записей с номерами [start, stop) без копирования данных.
+        
+        :param start: Номер первой записи
+        :param stop: Номер записи после последней (None - до конца файла)
+        :return: Генератор срезов memoryview
+        """
+        if stop is None or stop > self.record_count:
+            stop = self.record_count
+        return iter_records(self._mmap, self.record_width, start, stop)
+    
+    def close(self):
+        """Освобождение mmap и закрытие файла"""
+        if self._file.closed:
+            return
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Срезы еще удерживаются незавершенным чтением - mmap освободит сборщик мусора
+            pass
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
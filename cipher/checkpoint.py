@@ -0,0 +1,182 @@
+"""
+Контрольные точки для возобновляемого шифрования больших файлов.
+
+Шифротекст пишется в выходной файл по частям, а после каждой части рядом
+сохраняется небольшой файл контрольной точки (путь результата + .ckpt):
+сколько байтов исходного файла обработано, сколько блоков записано
+и отпечаток ключа. Если шифрование прервано, повторный вызов с тем же
+ключом и неизмененным исходным файлом отбрасывает недописанный хвост
+и продолжает с последней сохраненной части.
+"""
+import hashlib
+import json
+import os
+
+from cipher.binfile import HEADER, BlockFileWriter
+
+# Расширение файла контрольной точки
+CHECKPOINT_SUFFIX = '.ckpt'
+
+
+def key_fingerprint(*parts):
+    """
+    Отпечаток ключа для проверки, что шифрование продолжается тем же ключом.
+
+    :param parts: Открытые параметры ключа (числа или строки)
+    :return: SHA-256 в шестнадцатеричном виде
+    """
+    return hashlib.sha256(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _source_stat(path):
+    """Размер и время изменения исходного файла (для обнаружения его изменения)"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Checkpoint:
+    def __init__(self, path, fingerprint, source_size, source_mtime, bytes_consumed=0, blocks_emitted=0):
+        """
+        Состояние прерываемого шифрования одного файла.
+
+        :param path: Путь к файлу контрольной точки
+        :param fingerprint: Отпечаток ключа
+        :param source_size: Размер исходного файла
+        :param source_mtime: Время изменения исходного файла в наносекундах
+        :param bytes_consumed: Количество обработанных байтов исходного файла
+        :param blocks_emitted: Количество записанных блоков шифротекста
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+        self.bytes_consumed = bytes_consumed
+        self.blocks_emitted = blocks_emitted
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка контрольной точки.
+
+        :param path: Путь к файлу контрольной точки
+        :return: Объект Checkpoint или None, если файла нет или он поврежден
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(path, data['fingerprint'], data['source_size'], data['source_mtime'],
+                       data['bytes_consumed'], data['blocks_emitted'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def matches(self, fingerprint, source_path):
+        """
+        Проверка, что контрольная точка относится к тому же ключу и исходному файлу.
+
+        :param fingerprint: Отпечаток текущего ключа
+        :param source_path: Путь к исходному файлу
+        :return: True, если шифрование можно продолжить
+        """
+        return (self.fingerprint == fingerprint
+                and (self.source_size, self.source_mtime) == _source_stat(source_path))
+
+    def save(self):
+        """Атомарная запись контрольной точки (через временный файл и переименование)"""
+        data = {
+            'fingerprint': self.fingerprint,
+            'source_size': self.source_size,
+            'source_mtime': self.source_mtime,
+            'bytes_consumed': self.bytes_consumed,
+            'blocks_emitted': self.blocks_emitted,
+        }
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def remove(self):
+        """Удаление контрольной точки после успешного завершения"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def commit(file, checkpoint):
+    """
+    Сброс записанной части на диск и сохранение контрольной точки после нее.
+
+    :param file: Выходной файл (объект с методами flush и fileno)
+    :param checkpoint: Контрольная точка, описывающая записанное
+    """
+    file.flush()
+    os.fsync(file.fileno())
+    checkpoint.save()
+
+
+def open_checkpoint(input_path, output_path, fingerprint, min_output_size):
+    """
+    Поиск контрольной точки, с которой можно продолжить шифрование.
+
+    :param input_path: Путь к исходному файлу
+    :param output_path: Путь к выходному файлу
+    :param fingerprint: Отпечаток ключа
+    :param min_output_size: Функция, возвращающая размер выходного файла,
+                            которого требует контрольная точка
+    :return: Кортеж (контрольная точка, True если шифрование продолжается)
+    """
+    path = output_path + CHECKPOINT_SUFFIX
+    checkpoint = Checkpoint.load(path)
+    if (checkpoint is not None and checkpoint.matches(fingerprint, input_path)
+            and os.path.exists(output_path)
+            and os.path.getsize(output_path) >= min_output_size(checkpoint)):
+        return checkpoint, True
+
+    size, mtime = _source_stat(input_path)
+    return Checkpoint(path, fingerprint, size, mtime), False
+
+
+def encrypt_blocks_resumable(input_path, output_path, magic, record_width, block_size,
+                             chunk_size, encrypt_chunk, fingerprint):
+    """
+    Возобновляемое шифрование файла в двоичный формат с блоками фиксированной ширины.
+
+    :param input_path: Путь к исходному файлу
+    :param output_path: Путь к зашифрованному файлу
+    :param magic: Сигнатура алгоритма
+    :param record_width: Ширина одной записи в байтах
+    :param block_size: Размер блока открытого текста в байтах
+    :param chunk_size: Размер части исходных данных (кратен размеру блока)
+    :param encrypt_chunk: Функция, шифрующая часть данных в байты записей
+    :param fingerprint: Отпечаток ключа
+    :return: True, если шифрование было продолжено с контрольной точки
+    """
+    checkpoint, resumed = open_checkpoint(
+        input_path, output_path, fingerprint,
+        lambda cp: HEADER.size + cp.blocks_emitted * record_width)
+
+    with open(input_path, 'rb') as src:
+        if resumed:
+            src.seek(checkpoint.bytes_consumed)
+            writer = BlockFileWriter.resume(output_path, magic, record_width, block_size,
+                                            checkpoint.blocks_emitted, checkpoint.bytes_consumed)
+        else:
+            writer = BlockFileWriter(output_path, magic, record_width, block_size)
+            commit(writer, checkpoint)
+
+        with writer:
+            while True:
+                data = src.read(chunk_size)
+                if not data:
+                    break
+                records = encrypt_chunk(data)
+                writer.write(records, len(data))
+
+                checkpoint.bytes_consumed += len(data)
+                checkpoint.blocks_emitted += len(records) // record_width
+                commit(writer, checkpoint)
+
+    checkpoint.remove()
+    return resumed
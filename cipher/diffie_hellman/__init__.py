@@ -0,0 +1,5 @@
+"""
+Пакет для работы с алгоритмом обмена ключами Диффи-Хеллмана.
+"""
+from .diffie_hellman import DiffieHellman
+from .session import DiffieHellmanSession
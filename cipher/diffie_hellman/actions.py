@@ -0,0 +1,76 @@
+"""
+Действия графического интерфейса Диффи-Хеллмана без виджетов.
+
+Обработчики кнопок DiffieHellmanApp читают поля ввода и показывают результат или ошибку,
+а сама работа выполняется функциями этого модуля. Их же вызывает cipher.profiling,
+поэтому профилируется тот же код, что выполняется по кнопке.
+"""
+from cipher.diffie_hellman.diffie_hellman import DiffieHellman
+from cipher.diffie_hellman.session import DiffieHellmanSession
+
+
+def generate_keys(key_size):
+    """
+    Параметры и ключи двух сторон (Alice и Bob) и сеанс на их общем секрете.
+
+    :param key_size: Размер ключа в битах
+    :return: Кортеж (alice, bob, общий секрет, DiffieHellmanSession)
+    :raises ValueError: Если общие секреты сторон не совпадают
+    """
+    # Сначала генерируем параметры для Alice, затем те же p и g используются для Bob
+    alice = DiffieHellman(key_size)
+    bob = DiffieHellman(key_size=key_size, p=alice.p, g=alice.g)
+
+    alice_shared_secret = alice.generate_shared_secret(bob.public_key)
+    bob_shared_secret = bob.generate_shared_secret(alice.public_key)
+    if alice_shared_secret != bob_shared_secret:
+        raise ValueError(f"общие секреты не совпадают!\n"
+                         f"Alice: {alice_shared_secret}\n"
+                         f"Bob: {bob_shared_secret}")
+
+    return alice, bob, alice_shared_secret, DiffieHellmanSession(alice_shared_secret)
+
+
+def encrypt_text(session, text):
+    """
+    Шифрование текста AES-CBC на общем ключе.
+
+    :param session: Объект DiffieHellmanSession
+    :param text: Текст для шифрования
+    :return: Шифротекст в base64
+    """
+    return session.encrypt_string(text)
+
+
+def decrypt_text(session, text):
+    """
+    Дешифрование текста AES-CBC на общем ключе.
+
+    :param session: Объект DiffieHellmanSession
+    :param text: Шифротекст в base64
+    :return: Расшифрованный текст
+    """
+    return session.decrypt_string(text)
+
+
+def encrypt_file(session, input_path, output_path):
+    """
+    Потоковое шифрование файла любого типа.
+
+    :param session: Объект DiffieHellmanSession
+    :param input_path: Путь к исходному файлу
+    :param output_path: Путь к зашифрованному файлу
+    :return: True, если шифрование было продолжено с контрольной точки
+    """
+    return session.encrypt_file(input_path, output_path)
+
+
+def decrypt_file(session, input_path, output_path):
+    """
+    Потоковое дешифрование файла.
+
+    :param session: Объект DiffieHellmanSession
+    :param input_path: Путь к зашифрованному файлу
+    :param output_path: Путь к расшифрованному файлу
+    """
+    session.decrypt_file(input_path, output_path)
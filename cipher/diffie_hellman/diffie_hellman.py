@@ -1,30 +1,44 @@
 """
 Реализация алгоритма Диффи-Хеллмана для обмена ключами.
 """
-import random
 import sympy
 
+from cipher.diffie_hellman.session import DiffieHellmanSession
+from cipher.randomness import default_source
+from cipher.validation import check_element, has_quadratic_residue_subgroup
+
+# Кэш проверки безопасности простого в памяти процесса: p -> является ли (p-1)/2 простым
+_safe_prime_cache = {}
+
 
 class DiffieHellman:
-    def __init__(self, key_size=1024, p=None, g=None):
+    def __init__(self, key_size=1024, p=None, g=None, rng=None):
         """
         Инициализация алгоритма Диффи-Хеллмана.
         
         :param key_size: Размер ключа в битах
         :param p: Простое число p (если None, будет сгенерировано)
         :param g: Основание g (если None, будет использовано значение 2)
+        :param rng: Источник случайных чисел (None - буферизованный os.urandom,
+                    см. cipher.randomness)
         """
+        rng = rng if rng is not None else default_source
+        
         # Используем переданное значение p или генерируем новое
-        self.p = p if p is not None else sympy.randprime(2**(key_size-1), 2**key_size)
+        self.p = p if p is not None else rng.randprime(2**(key_size-1), 2**key_size)
         
         # Используем переданное значение g или значение 2
         self.g = g if g is not None else 2
         
         # Сгенерируем случайное целое число в качестве секретного ключа
-        self._private_key = random.randint(2, self.p - 2)
+        self._private_key = rng.randrange(2, self.p - 1)
         
         # Вычисление открытого ключа
         self._public_key = pow(self.g, self._private_key, self.p)
+        
+        # Для безопасного простого p и g - квадратичного вычета открытые ключи другой
+        # стороны дополнительно проверяются символом Якоби (см. cipher.validation)
+        self._check_subgroup = has_quadratic_residue_subgroup(self.p, self.g, _is_safe_prime(self.p))
     
     @property
     def public_key(self):
@@ -35,7 +49,36 @@ class DiffieHellman:
         """
         Генерация общего секретного ключа на основе открытого ключа другой стороны.
         
+        Ключ другой стороны проверяется до возведения в степень: значения вне (1, p-1)
+        и, если возможно, вне подгруппы простого порядка отклоняются.
+        
         :param other_public_key: Открытый ключ другой стороны
         :return: Общий секретный ключ
+        :raises ValueError: Если ключ другой стороны некорректен
+        """
+        check_element(other_public_key, self.p, 'dh.peer_key', self._check_subgroup)
+        return pow(other_public_key, self._private_key, self.p)
+    
+    def create_session(self, other_public_key):
         """
-        return pow(other_public_key, self._private_key, self.p)
\ No newline at end of file
+        Создание сеанса симметричного шифрования на общем секретном ключе.
+        
+        :param other_public_key: Открытый ключ другой стороны
+        :return: Объект DiffieHellmanSession
+        """
+        return DiffieHellmanSession(self.generate_shared_secret(other_public_key))
+
+
+def _is_safe_prime(p):
+    """
+    Является ли простое p безопасным (p = 2q + 1 с простым q).
+    
+    Тест простоты q выполняется один раз для каждого p: сеансы обычно создаются
+    многократно с общими параметрами (p, g).
+    
+    :param p: Простой модуль
+    :return: True, если (p-1)/2 - простое число
+    """
+    if p not in _safe_prime_cache:
+        _safe_prime_cache[p] = sympy.isprime((p - 1) // 2)
+    return _safe_prime_cache[p]
@@ -4,8 +4,6 @@
 """
 import os
 import sys
-import base64
-import hashlib
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QTabWidget, QTextEdit, QPushButton, QFileDialog, 
@@ -13,10 +11,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QPalette, QAction
 from PyQt6.QtCore import Qt
-from diffie_hellman import DiffieHellman
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.backends import default_backend
+
+# Корень репозитория нужен в sys.path для импорта общих модулей пакета cipher
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cipher.diffie_hellman import actions
 
 class DiffieHellmanApp(QMainWindow):
     def __init__(self):
@@ -26,6 +25,7 @@ class DiffieHellmanApp(QMainWindow):
         self.alice = None
         self.bob = None
         self.shared_secret = None
+        self.session = None
         
         self.setWindowTitle("Диффи-Хеллман шифрование")
         self.setGeometry(100, 100, 900, 700)
@@ -132,6 +132,16 @@ class DiffieHellmanApp(QMainWindow):
         # Меню "Файл"
         file_menu = menubar.addMenu("Файл")
         
+        encrypt_file_action = QAction("Зашифровать файл...", self)
+        encrypt_file_action.triggered.connect(self.encrypt_file)
+        file_menu.addAction(encrypt_file_action)
+        
+        decrypt_file_action = QAction("Расшифровать файл...", self)
+        decrypt_file_action.triggered.connect(self.decrypt_file)
+        file_menu.addAction(decrypt_file_action)
+        
+        file_menu.addSeparator()
+        
         exit_action = QAction("Выход", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -310,40 +320,21 @@ class DiffieHellmanApp(QMainWindow):
         try:
             key_size = int(self.key_size_combo.currentText())
             
-            # Сначала генерируем параметры для Alice
-            self.alice = DiffieHellman(key_size)
+            # Параметры и ключи Alice и Bob; несовпадение общих секретов вызывает ошибку
+            self.alice, self.bob, self.shared_secret, self.session = actions.generate_keys(key_size)
             
-            # Используем те же параметры p и g для Bob
-            self.bob = DiffieHellman(key_size=key_size, p=self.alice.p, g=self.alice.g)
+            # Обновляем информацию о ключах
+            info = f"Простое число p: {self.alice.p}\n\n"
+            info += f"Основание g: {self.alice.g}\n\n"
+            info += f"Публичный ключ Alice: {self.alice.public_key}\n\n"
+            info += f"Публичный ключ Bob: {self.bob.public_key}\n\n"
+            info += f"Общий секретный ключ (первые 50 знаков): {str(self.shared_secret)[:50]}...\n\n"
+            info += "Ключи успешно сгенерированы!"
             
-            # Вычисляем общие секретные ключи
-            alice_shared_secret = self.alice.generate_shared_secret(self.bob.public_key)
-            bob_shared_secret = self.bob.generate_shared_secret(self.alice.public_key)
+            self.key_info_text.clear()
+            self.key_info_text.insertPlainText(info)
             
-            # Для отладки выводим значения
-            print(f"Alice's shared secret: {alice_shared_secret}")
-            print(f"Bob's shared secret: {bob_shared_secret}")
-            
-            # Проверяем, что общие ключи совпадают
-            if alice_shared_secret == bob_shared_secret:
-                self.shared_secret = alice_shared_secret
-                
-                # Обновляем информацию о ключах
-                info = f"Простое число p: {self.alice.p}\n\n"
-                info += f"Основание g: {self.alice.g}\n\n"
-                info += f"Публичный ключ Alice: {self.alice.public_key}\n\n"
-                info += f"Публичный ключ Bob: {self.bob.public_key}\n\n"
-                info += f"Общий секретный ключ (первые 50 знаков): {str(self.shared_secret)[:50]}...\n\n"
-                info += "Ключи успешно сгенерированы!"
-                
-                self.key_info_text.clear()
-                self.key_info_text.insertPlainText(info)
-                
-                QMessageBox.information(self, "Успех", "Ключи успешно сгенерированы!")
-            else:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка генерации ключей: общие секреты не совпадают!\n"
-                                     f"Alice: {alice_shared_secret}\n"
-                                     f"Bob: {bob_shared_secret}")
+            QMessageBox.information(self, "Успех", "Ключи успешно сгенерированы!")
                 
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка при генерации ключей: {str(e)}")
@@ -353,10 +344,14 @@ class DiffieHellmanApp(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(self, "Выберите файл")
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    text_widget.clear()
-                    text_widget.insertPlainText(content)
+                with open(file_path, 'rb') as file:
+                    content = file.read().decode('utf-8')
+                text_widget.clear()
+                text_widget.insertPlainText(content)
+            except UnicodeDecodeError:
+                QMessageBox.warning(self, "Предупреждение",
+                                    "Файл не является текстом. Для двоичных файлов используйте "
+                                    "пункты меню \"Файл\" → \"Зашифровать файл...\" / \"Расшифровать файл...\"")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось открыть файл: {str(e)}")
                 
@@ -365,12 +360,52 @@ class DiffieHellmanApp(QMainWindow):
         file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить как")
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(content)
+                with open(file_path, 'wb') as file:
+                    file.write(content.encode('utf-8'))
                 QMessageBox.information(self, "Успех", "Файл успешно сохранен!")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл: {str(e)}")
     
+    def encrypt_file(self):
+        """Потоковое шифрование файла любого типа"""
+        if not self.session:
+            QMessageBox.critical(self, "Ошибка", "Сначала сгенерируйте ключи!")
+            return
+        
+        input_path, _ = QFileDialog.getOpenFileName(self, "Выберите файл для шифрования")
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(self, "Сохранить зашифрованный файл как")
+        if not output_path:
+            return
+        
+        try:
+            # Прерванное ранее шифрование этого файла тем же ключом продолжается с контрольной точки
+            resumed = actions.encrypt_file(self.session, input_path, output_path)
+            note = " (продолжено с контрольной точки)" if resumed else ""
+            QMessageBox.information(self, "Успех", f"Файл успешно зашифрован: {output_path}{note}")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка шифрования файла: {str(e)}")
+    
+    def decrypt_file(self):
+        """Потоковое расшифрование файла"""
+        if not self.session:
+            QMessageBox.critical(self, "Ошибка", "Сначала сгенерируйте ключи!")
+            return
+        
+        input_path, _ = QFileDialog.getOpenFileName(self, "Выберите файл для расшифрования")
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(self, "Сохранить расшифрованный файл как")
+        if not output_path:
+            return
+        
+        try:
+            actions.decrypt_file(self.session, input_path, output_path)
+            QMessageBox.information(self, "Успех", f"Файл успешно расшифрован: {output_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка расшифрования файла: {str(e)}")
+    
     def encrypt_data(self):
         """Шифрование данных"""
         if not self.shared_secret:
@@ -383,21 +418,8 @@ class DiffieHellmanApp(QMainWindow):
             return
         
         try:
-            # Подготовка ключа для AES (нужно ровно 32 байта)
-            key = hashlib.sha256(str(self.shared_secret).encode()).digest()
-            
-            # Шифрование с помощью AES
-            padder = padding.PKCS7(algorithms.AES.block_size).padder()
-            padded_data = padder.update(plaintext.encode()) + padder.finalize()
-            
-            # Используем случайный IV (вектор инициализации)
-            iv = os.urandom(16)
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
-            encryptor = cipher.encryptor()
-            ciphertext = encryptor.update(padded_data) + encryptor.finalize()
-            
-            # Комбинируем IV и шифротекст и кодируем в base64 для удобства отображения
-            result = base64.b64encode(iv + ciphertext).decode('utf-8')
+            # Шифрование AES-CBC на общем ключе, результат в base64 для удобства отображения
+            result = actions.encrypt_text(self.session, plaintext)
             
             self.encrypt_output.clear()
             self.encrypt_output.insertPlainText(result)
@@ -417,27 +439,10 @@ class DiffieHellmanApp(QMainWindow):
             return
         
         try:
-            # Подготовка ключа для AES
-            key = hashlib.sha256(str(self.shared_secret).encode()).digest()
-            
-            # Декодируем из base64
-            ciphertext_full = base64.b64decode(ciphertext_b64)
-            
-            # Разделяем IV и сам шифротекст
-            iv = ciphertext_full[:16]
-            ciphertext = ciphertext_full[16:]
-            
-            # Расшифровываем с помощью AES
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
-            decryptor = cipher.decryptor()
-            padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-            
-            # Убираем паддинг
-            unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
-            plaintext = unpadder.update(padded_plaintext) + unpadder.finalize()
+            plaintext = actions.decrypt_text(self.session, ciphertext_b64)
             
             self.decrypt_output.clear()
-            self.decrypt_output.insertPlainText(plaintext.decode('utf-8'))
+            self.decrypt_output.insertPlainText(plaintext)
             
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка расшифрования: {str(e)}")
@@ -0,0 +1,239 @@
+"""
+Сеанс симметричного шифрования AES-CBC на общем секрете Диффи-Хеллмана.
+"""
+import base64
+import hashlib
+import json
+import os
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.backends import default_backend
+
+from cipher.checkpoint import commit, key_fingerprint, open_checkpoint
+from cipher.interface import ENCRYPT, RESUMABLE, SYMMETRIC, CipherAlgorithm
+
+# Размер вектора инициализации AES в байтах
+IV_SIZE = 16
+
+# Размер части данных при потоковой обработке
+CHUNK_SIZE = 64 * 1024
+
+
+class DiffieHellmanSession(CipherAlgorithm):
+    name = 'dh'
+    capabilities = frozenset({ENCRYPT, RESUMABLE, SYMMETRIC})
+    
+    def __init__(self, shared_secret):
+        """
+        Сеанс шифрования на общем секретном ключе.
+        
+        Шифротекст - вектор инициализации (16 байт), за которым следуют данные
+        AES-256-CBC с дополнением PKCS7.
+        
+        :param shared_secret: Общий секретный ключ Диффи-Хеллмана
+        """
+        # Подготовка ключа для AES (нужно ровно 32 байта)
+        self.key = hashlib.sha256(str(shared_secret).encode()).digest()
+    
+    @classmethod
+    def from_key(cls, key):
+        """
+        Создание сеанса по готовому ключу AES (например, загруженному из файла).
+        
+        :param key: Ключ AES длиной 32 байта
+        :return: Объект DiffieHellmanSession
+        """
+        if len(key) != 32:
+            raise ValueError("Ключ сеанса должен быть длиной 32 байта")
+        session = cls.__new__(cls)
+        session.key = bytes(key)
+        return session
+    
+    @classmethod
+    def keygen(cls, key_size=1024, **options):
+        """
+        Сеанс на новом общем секрете: обмен ключами Диффи-Хеллмана между двумя
+        локальными сторонами (общий интерфейс CipherAlgorithm).
+        
+        :param key_size: Размер модуля p в битах
+        :param options: Параметры DiffieHellman (p, g, rng)
+        :return: Объект DiffieHellmanSession
+        """
+        # Импорт здесь: модуль diffie_hellman сам импортирует этот модуль
+        from cipher.diffie_hellman.diffie_hellman import DiffieHellman
+        
+        alice = DiffieHellman(key_size, **options)
+        bob = DiffieHellman(key_size, p=alice.p, g=alice.g, rng=options.get('rng'))
+        return alice.create_session(bob.public_key)
+    
+    def save(self, path):
+        """
+        Сохранение ключа сеанса в JSON-файл.
+        
+        :param path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'key': self.key.hex()}, f, indent=2)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка ключа сеанса из JSON-файла, сохраненного через save.
+        
+        :param path: Путь к файлу
+        :return: Объект DiffieHellmanSession
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_key(bytes.fromhex(json.load(f)['key']))
+    
+    def _cipher(self, iv):
+        """Объект AES-CBC с ключом сеанса и заданным вектором инициализации"""
+        return Cipher(algorithms.AES(self.key), modes.CBC(iv), backend=default_backend())
+    
+    def encrypt_bytes(self, data):
+        """
+        Шифрование байтов.
+        
+        :param data: Байты для шифрования
+        :return: Вектор инициализации и шифротекст
+        """
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        padded_data = padder.update(data) + padder.finalize()
+        
+        # Используем случайный IV (вектор инициализации)
+        iv = os.urandom(IV_SIZE)
+        encryptor = self._cipher(iv).encryptor()
+        return iv + encryptor.update(padded_data) + encryptor.finalize()
+    
+    def decrypt_bytes(self, data):
+        """
+        Дешифрование байтов, полученных через encrypt_bytes.
+        
+        :param data: Вектор инициализации и шифротекст
+        :return: Расшифрованные байты
+        """
+        if len(data) < IV_SIZE:
+            raise ValueError("Шифротекст слишком короткий")
+        
+        # Разделяем IV и сам шифротекст
+        decryptor = self._cipher(bytes(data[:IV_SIZE])).decryptor()
+        padded_plaintext = decryptor.update(data[IV_SIZE:]) + decryptor.finalize()
+        
+        # Убираем паддинг
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        return unpadder.update(padded_plaintext) + unpadder.finalize()
+    
+    def encrypt_string(self, text):
+        """
+        Шифрование текста (обертка над encrypt_bytes).
+        
+        :param text: Текст для шифрования
+        :return: Шифротекст в base64 для удобства отображения
+        """
+        return base64.b64encode(self.encrypt_bytes(text.encode('utf-8'))).decode('utf-8')
+    
+    def decrypt_string(self, text):
+        """
+        Дешифрование текста (обертка над decrypt_bytes).
+        
+        :param text: Шифротекст в base64
+        :return: Расшифрованный текст
+        """
+        return self.decrypt_bytes(base64.b64decode(text)).decode('utf-8')
+    
+    def encrypt_stream(self, src, dst):
+        """
+        Потоковое шифрование из одного двоичного файлового объекта в другой.
+        
+        :param src: Двоичный файловый объект с открытым текстом
+        :param dst: Двоичный файловый объект для шифротекста
+        """
+        iv = os.urandom(IV_SIZE)
+        encryptor = self._cipher(iv).encryptor()
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        
+        dst.write(iv)
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(encryptor.update(padder.update(chunk)))
+        dst.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+    
+    def decrypt_stream(self, src, dst):
+        """
+        Потоковое дешифрование из одного двоичного файлового объекта в другой.
+        
+        :param src: Двоичный файловый объект с шифротекстом
+        :param dst: Двоичный файловый объект для открытого текста
+        """
+        iv = src.read(IV_SIZE)
+        if len(iv) < IV_SIZE:
+            raise ValueError("Шифротекст слишком короткий")
+        
+        decryptor = self._cipher(iv).decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(unpadder.update(decryptor.update(chunk)))
+        dst.write(unpadder.update(decryptor.finalize()) + unpadder.finalize())
+    
+    def encrypt_file(self, input_path, output_path):
+        """
+        Шифрование файла.
+        
+        После каждой части сохраняется контрольная точка (output_path + .ckpt).
+        Части кратны блоку AES, поэтому в режиме CBC шифрование продолжается
+        с последнего записанного блока шифротекста как с вектора инициализации.
+        
+        :param input_path: Путь к исходному файлу
+        :param output_path: Путь к зашифрованному файлу
+        :return: True, если шифрование было продолжено с контрольной точки
+        """
+        checkpoint, resumed = open_checkpoint(
+            input_path, output_path, key_fingerprint(hashlib.sha256(self.key).hexdigest()),
+            lambda cp: IV_SIZE + cp.bytes_consumed)
+        
+        with open(input_path, 'rb') as src:
+            if resumed:
+                dst = open(output_path, 'r+b')
+                dst.truncate(IV_SIZE + checkpoint.bytes_consumed)
+                dst.seek(-IV_SIZE, os.SEEK_END)
+                iv = dst.read(IV_SIZE)
+                src.seek(checkpoint.bytes_consumed)
+            else:
+                dst = open(output_path, 'wb')
+                iv = os.urandom(IV_SIZE)
+                dst.write(iv)
+                commit(dst, checkpoint)
+            
+            with dst:
+                encryptor = self._cipher(iv).encryptor()
+                padder = padding.PKCS7(algorithms.AES.block_size).padder()
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(encryptor.update(padder.update(chunk)))
+                    if len(chunk) == CHUNK_SIZE:
+                        # Полная часть шифруется целиком, без остатка в буфере дополнения
+                        checkpoint.bytes_consumed += len(chunk)
+                        checkpoint.blocks_emitted += len(chunk) // IV_SIZE
+                        commit(dst, checkpoint)
+                dst.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+        
+        checkpoint.remove()
+        return resumed
+    
+    def decrypt_file(self, input_path, output_path):
+        """
+        Дешифрование файла.
+        
+        :param input_path: Путь к зашифрованному файлу
+        :param output_path: Путь к расшифрованному файлу
+        """
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            self.decrypt_stream(src, dst)
@@ -1,4 +1,5 @@
 """
 Пакет для работы с алгоритмом шифрования Эль-Гамаля.
 """
+from .domain import ElGamalDomain
 from .elgamal import ElGamal
@@ -0,0 +1,104 @@
+"""
+Действия графического интерфейса Эль-Гамаля без виджетов.
+
+Обработчики кнопок ElGamalApp читают поля ввода и показывают результат или ошибку,
+а сама работа выполняется функциями этого модуля. Их же вызывает cipher.profiling,
+поэтому профилируется тот же код, что выполняется по кнопке.
+"""
+import base64
+import json
+import os
+
+from cipher.binfile import is_block_file
+from cipher.elgamal.domain import ElGamalDomain, default_q_bits
+from cipher.elgamal.elgamal import FILE_MAGICS, ElGamal
+
+# Каталог файлов-кэшей параметров домена (domain_<размер>.json)
+DOMAIN_CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_domain(key_size, schnorr=False):
+    """
+    Параметры домена из файла-кэша: их генерация - самая долгая часть создания ключей.
+
+    Тип домена выбирается так же, как для ElGamal(key_size) (см. default_q_bits),
+    файл с доменом другого типа перезаписывается.
+
+    :param key_size: Размер модуля p в битах
+    :param schnorr: Группа Шнорра с коротким q вместо безопасного простого
+    :return: Объект ElGamalDomain
+    """
+    path = os.path.join(DOMAIN_CACHE_DIR, f'domain_{key_size}.json')
+    return ElGamalDomain.load_or_generate(path, key_size, default_q_bits(key_size, schnorr))
+
+
+def generate_keys(domain):
+    """
+    Новая пара ключей в общем домене.
+
+    :param domain: Параметры домена ElGamalDomain
+    :return: Объект ElGamal
+    """
+    return ElGamal(domain=domain)
+
+
+def encrypt_text(cipher, text):
+    """
+    Шифрование текста, двоичный шифротекст отображается в base64.
+
+    :param cipher: Объект ElGamal
+    :param text: Текст для шифрования
+    :return: Строка base64
+    """
+    return base64.b64encode(cipher.encrypt_string(text)).decode('ascii')
+
+
+def decrypt_text(cipher, text):
+    """
+    Дешифрование текста из текстового поля: base64 двоичного формата
+    или старый формат - JSON-массив пар (a, b).
+
+    :param cipher: Объект ElGamal
+    :param text: Содержимое текстового поля
+    :return: Расшифрованный текст
+    :raises json.JSONDecodeError: Если старый формат не является корректным JSON
+    """
+    if text.startswith('['):
+        encrypted_data = [(int(a), int(b)) for a, b in json.loads(text)]
+    else:
+        encrypted_data = base64.b64decode(text, validate=True)
+    return cipher.decrypt_string(encrypted_data)
+
+
+def is_encrypted_file(path):
+    """
+    Является ли файл шифротекстом двоичного формата (он расшифровывается потоково,
+    без загрузки в текстовое поле).
+
+    :param path: Путь к файлу
+    :return: True, если файл начинается с сигнатуры шифротекста Эль-Гамаля
+    """
+    return is_block_file(path, FILE_MAGICS)
+
+
+def encrypt_file(cipher, input_path, output_path):
+    """
+    Шифрование файла в двоичный формат.
+
+    :param cipher: Объект ElGamal
+    :param input_path: Путь к исходному файлу
+    :param output_path: Путь к зашифрованному файлу
+    :return: True, если шифрование было продолжено с контрольной точки
+    """
+    return cipher.encrypt_file(input_path, output_path)
+
+
+def decrypt_file(cipher, input_path, output_path):
+    """
+    Дешифрование файла двоичного формата.
+
+    :param cipher: Объект ElGamal
+    :param input_path: Путь к зашифрованному файлу
+    :param output_path: Путь к расшифрованному файлу
+    """
+    cipher.decrypt_file(input_path, output_path)
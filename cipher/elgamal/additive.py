@@ -0,0 +1,210 @@
+"""
+Экспоненциальный (аддитивный) режим Эль-Гамаля.
+
+Вместо M шифруется g^M, поэтому произведение шифротекстов (ElGamal.aggregate)
+дает шифротекст g^(M1 + M2 + ...) - сумму зашифрованных чисел. После дешифрования
+остается найти M по g^M, что возможно только для небольших M: дискретный логарифм
+в диапазоне [0, max_value] находится методом шагов младенца и великана
+(baby-step giant-step) за O(sqrt(max_value)) умножений.
+
+Байты записей шифруются так же - как коды g^m (byte_codes), а обратная таблица
+из 256 значений заменяет поиск дискретного логарифма.
+
+Таблица шагов младенца зависит только от (p, g) и диапазона, поэтому строится один раз
+и может сохраняться на диск. Файл таблицы:
+    заголовок - сигнатура (4 байта), версия (1 байт), max_value (8 байт),
+                количество шагов младенца m (8 байт), SHA-256 от (p, g) (32 байта);
+    данные    - младшие 64 бита g^j mod p для j = 0..m-1 (по 8 байт, big-endian).
+"""
+import array
+import math
+import os
+import struct
+import sys
+
+from cipher.checkpoint import key_fingerprint
+
+# Сигнатура и версия файла таблицы
+TABLE_MAGIC = b'EGDL'
+TABLE_VERSION = 1
+
+# Заголовок файла таблицы
+TABLE_HEADER = struct.Struct('>4sBQQ32s')
+
+# В таблице хранятся только младшие биты g^j: совпадение проверяется возведением в степень
+KEY_MASK = (1 << 64) - 1
+
+# Количество различных значений байта
+BYTE_VALUES = 256
+
+
+def byte_codes(p, g):
+    """
+    Коды байтов для шифрования записей: g^m mod p для m = 0..255.
+
+    Код лежит в подгруппе, порожденной g, поэтому шифротекст не раскрывает проекцию
+    сообщения на другие подгруппы (в группе Шнорра по ней восстанавливается сам байт).
+
+    :param p: Модуль p
+    :param g: Образующая g
+    :return: Список из 256 кодов
+    """
+    codes = []
+    value = 1
+    for _ in range(BYTE_VALUES):
+        codes.append(value)
+        value = value * g % p
+    return codes
+
+
+class DiscreteLogTable:
+    def __init__(self, p, g, max_value, baby_steps=None):
+        """
+        Таблица для поиска M по g^M mod p при 0 <= M <= max_value.
+
+        Память и время поиска настраиваются количеством шагов младенца m: таблица
+        содержит m значений, а поиск выполняет не более ceil((max_value + 1) / m)
+        умножений. По умолчанию m = sqrt(max_value + 1), что уравновешивает одно и другое.
+
+        :param p: Модуль p
+        :param g: Образующая g
+        :param max_value: Наибольшее восстанавливаемое значение
+        :param baby_steps: Количество шагов младенца m (None - корень из размера диапазона)
+        """
+        if max_value < 0:
+            raise ValueError("Наибольшее значение должно быть неотрицательным")
+        if baby_steps is None:
+            baby_steps = math.isqrt(max_value) + 1
+        if baby_steps < 1:
+            raise ValueError("Количество шагов младенца должно быть положительным")
+
+        self.p = p
+        self.g = g
+        self.max_value = max_value
+        self.baby_steps = baby_steps
+
+        keys = array.array('Q')
+        value = 1
+        for _ in range(baby_steps):
+            keys.append(value & KEY_MASK)
+            value = value * g % p
+        self._init_lookup(keys)
+
+    def _init_lookup(self, keys):
+        """Словарь младшие биты g^j -> j (при совпадении младших битов остается меньшее j)"""
+        self._keys = keys
+        self._lookup = {}
+        for j, key in enumerate(keys):
+            self._lookup.setdefault(key, j)
+        # Шаг великана g^(-m) mod p
+        self._giant = pow(self.g, -self.baby_steps, self.p)
+
+    @property
+    def giant_steps(self):
+        """Наибольшее количество шагов великана при поиске"""
+        return -(-(self.max_value + 1) // self.baby_steps)
+
+    def solve(self, value):
+        """
+        Поиск M из [0, max_value] с g^M = value (mod p).
+
+        :param value: Элемент g^M mod p
+        :return: M
+        :raises ValueError: Если M вне диапазона таблицы
+        """
+        p, g, m = self.p, self.g, self.baby_steps
+        giant = self._giant
+        lookup = self._lookup
+
+        gamma = value % p
+        for i in range(self.giant_steps):
+            j = lookup.get(gamma & KEY_MASK)
+            if j is not None:
+                candidate = i * m + j
+                # Младшие биты могут совпасть случайно - кандидат проверяется
+                if candidate <= self.max_value and pow(g, candidate, p) == value % p:
+                    return candidate
+            gamma = gamma * giant % p
+
+        raise ValueError(f"Значение вне диапазона [0, {self.max_value}]")
+
+    def save(self, path):
+        """
+        Сохранение таблицы в файл (через временный файл и атомарную замену).
+
+        :param path: Путь к файлу
+        """
+        keys = array.array('Q', self._keys)
+        if sys.byteorder == 'little':
+            keys.byteswap()
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, self.max_value, self.baby_steps,
+                                      bytes.fromhex(key_fingerprint(self.p, self.g))))
+            keys.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, p, g):
+        """
+        Загрузка таблицы, сохраненной через save.
+
+        :param path: Путь к файлу
+        :param p: Модуль p
+        :param g: Образующая g
+        :return: Объект DiscreteLogTable
+        :raises ValueError: Если файл поврежден или построен для других (p, g)
+        """
+        with open(path, 'rb') as f:
+            header = f.read(TABLE_HEADER.size)
+            if len(header) < TABLE_HEADER.size:
+                raise ValueError("Файл слишком короткий для заголовка таблицы")
+            magic, version, max_value, baby_steps, fingerprint = TABLE_HEADER.unpack(header)
+            if magic != TABLE_MAGIC or version != TABLE_VERSION:
+                raise ValueError("Файл не является таблицей дискретного логарифма")
+            if fingerprint != bytes.fromhex(key_fingerprint(p, g)):
+                raise ValueError("Таблица построена для других параметров (p, g)")
+
+            keys = array.array('Q')
+            try:
+                keys.fromfile(f, baby_steps)
+            except EOFError:
+                raise ValueError("Файл таблицы обрывается") from None
+        if sys.byteorder == 'little':
+            keys.byteswap()
+
+        table = cls.__new__(cls)
+        table.p = p
+        table.g = g
+        table.max_value = max_value
+        table.baby_steps = baby_steps
+        table._init_lookup(keys)
+        return table
+
+    @classmethod
+    def load_or_build(cls, path, p, g, max_value, baby_steps=None):
+        """
+        Загрузка таблицы из файла-кэша или построение и сохранение новой.
+
+        Файл, построенный для других (p, g) или меньшего диапазона, перезаписывается.
+
+        :param path: Путь к файлу-кэшу
+        :param p: Модуль p
+        :param g: Образующая g
+        :param max_value: Наибольшее восстанавливаемое значение
+        :param baby_steps: Количество шагов младенца (None - корень из размера диапазона)
+        :return: Объект DiscreteLogTable
+        """
+        if os.path.exists(path):
+            try:
+                table = cls.load(path, p, g)
+            except (OSError, ValueError):
+                table = None
+            if table is not None and table.max_value >= max_value and (
+                    baby_steps is None or table.baby_steps == baby_steps):
+                return table
+
+        table = cls(p, g, max_value, baby_steps)
+        table.save(path)
+        return table
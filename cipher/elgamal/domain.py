@@ -0,0 +1,230 @@
+"""
+Параметры домена (p, q, g) для алгоритма Эль-Гамаля.
+
+Генерация домена - самая дорогая часть создания ключа, поэтому домен создается
+один раз, кэшируется в памяти процесса и на диске и используется многими ключами.
+"""
+import json
+import math
+import os
+import secrets
+import sympy
+
+# Произведение нечетных простых чисел до 2000 для быстрого отсева кандидатов через gcd
+_SIEVE_PRODUCT = math.prod(sympy.primerange(3, 2000))
+
+# Размер порядка подгруппы группы Шнорра по умолчанию в битах
+DEFAULT_Q_BITS = 256
+
+# Кэш доменов в памяти процесса: (key_size, q_bits) -> ElGamalDomain
+_cache = {}
+
+
+class ElGamalDomain:
+    def __init__(self, p, q, g):
+        """
+        Параметры домена Эль-Гамаля.
+        
+        :param p: Простой модуль
+        :param q: Простой порядок подгруппы, q делит p-1
+        :param g: Образующая подгруппы порядка q
+        """
+        self.p = p
+        self.q = q
+        self.g = g
+    
+    @property
+    def is_safe_prime(self):
+        """Является ли p безопасным простым числом p = 2q + 1"""
+        return self.p == 2 * self.q + 1
+    
+    @classmethod
+    def generate(cls, key_size, q_bits=None):
+        """
+        Генерация нового домена.
+        
+        Если q_bits не задан, p выбирается безопасным простым p = 2q + 1, иначе строится
+        группа Шнорра p = m*q + 1 с простым q длиной q_bits бит (показатели по модулю
+        короткого q ускоряют шифрование и дешифрование).
+        В обоих случаях g - образующая подгруппы простого порядка q.
+        
+        :param key_size: Размер модуля p в битах
+        :param q_bits: Размер порядка подгруппы в битах (None - безопасное простое)
+        :return: Объект ElGamalDomain
+        """
+        if key_size < 16:
+            raise ValueError("Слишком маленький размер модуля")
+        
+        if q_bits is None:
+            p, q = _generate_safe_prime(key_size)
+        else:
+            if not 2 <= q_bits < key_size:
+                raise ValueError("Размер подгруппы должен быть меньше размера модуля")
+            p, q = _generate_schnorr_group(key_size, q_bits)
+        
+        # Образующая подгруппы порядка q: g = h^((p-1)/q) mod p, g != 1
+        cofactor = (p - 1) // q
+        while True:
+            g = pow(secrets.randbelow(p - 3) + 2, cofactor, p)
+            if g != 1:
+                break
+        
+        domain = cls(p, q, g)
+        domain.validate()
+        return domain
+    
+    @classmethod
+    def cached(cls, key_size, q_bits=None):
+        """
+        Получение домена из кэша процесса (с генерацией при первом обращении).
+        
+        :param key_size: Размер модуля p в битах
+        :param q_bits: Размер порядка подгруппы в битах (None - безопасное простое)
+        :return: Объект ElGamalDomain
+        """
+        key = (key_size, q_bits)
+        if key not in _cache:
+            _cache[key] = cls.generate(key_size, q_bits)
+        return _cache[key]
+    
+    def validate(self):
+        """
+        Проверка корректности параметров домена.
+        
+        :raises ValueError: Если параметры некорректны
+        """
+        p, q, g = self.p, self.q, self.g
+        
+        if not (sympy.isprime(p) and sympy.isprime(q)):
+            raise ValueError("Модуль p и порядок q должны быть простыми числами")
+        if (p - 1) % q != 0:
+            raise ValueError("Порядок q должен делить p-1")
+        if not 1 < g < p or pow(g, q, p) != 1:
+            raise ValueError("g не является образующей подгруппы порядка q")
+    
+    def to_dict(self):
+        """
+        Сериализация домена в словарь.
+        
+        :return: Словарь с параметрами p, q, g
+        """
+        return {'p': self.p, 'q': self.q, 'g': self.g}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Восстановление домена из словаря с проверкой параметров.
+        
+        :param data: Словарь с параметрами p, q, g
+        :return: Объект ElGamalDomain
+        """
+        domain = cls(data['p'], data['q'], data['g'])
+        domain.validate()
+        return domain
+    
+    def save(self, path):
+        """
+        Сохранение домена в JSON-файл.
+        
+        :param path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка домена из JSON-файла.
+        
+        :param path: Путь к файлу
+        :return: Объект ElGamalDomain
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+    
+    @classmethod
+    def load_or_generate(cls, path, key_size, q_bits=None):
+        """
+        Загрузка домена из файла-кэша или генерация и сохранение нового.
+        
+        Файл с доменом другого размера или другого типа перезаписывается.
+        
+        :param path: Путь к файлу-кэшу
+        :param key_size: Размер модуля p в битах
+        :param q_bits: Размер порядка подгруппы в битах (None - безопасное простое)
+        :return: Объект ElGamalDomain
+        """
+        if os.path.exists(path):
+            try:
+                domain = cls.load(path)
+            except (OSError, ValueError, KeyError):
+                domain = None
+            if domain is not None and domain.p.bit_length() == key_size and (
+                    domain.is_safe_prime if q_bits is None else domain.q.bit_length() == q_bits):
+                return domain
+        
+        domain = cls.generate(key_size, q_bits)
+        domain.save(path)
+        return domain
+
+
+def default_q_bits(key_size, schnorr=False):
+    """
+    Размер порядка подгруппы для домена по умолчанию (общий для ElGamal и интерфейса).
+    
+    По умолчанию p - безопасное простое, и ключ шифрует любое сообщение M < p.
+    Группа Шнорра с коротким q ускоряет шифрование и дешифрование, но шифровать
+    в ней можно только элементы подгруппы порядка q (байты, экспоненциальный режим),
+    поэтому она выбирается явно.
+    
+    :param key_size: Размер модуля p в битах
+    :param schnorr: Использовать группу Шнорра с q не длиннее DEFAULT_Q_BITS и key_size/2
+    :return: Размер q в битах или None (безопасное простое)
+    """
+    return min(DEFAULT_Q_BITS, key_size // 2) if schnorr else None
+
+
+def _generate_safe_prime(key_size):
+    """
+    Поиск безопасного простого p = 2q + 1 длиной key_size бит.
+    
+    Кандидаты q выбираются с q = 5 mod 6 (иначе q или 2q+1 делится на 3),
+    затем отсеиваются через gcd с произведением малых простых
+    и только после этого проверяются тестом на простоту.
+    
+    :param key_size: Размер p в битах
+    :return: Пара (p, q)
+    """
+    low = 2**(key_size - 2)
+    while True:
+        q = low + secrets.randbelow(low)
+        q += 5 - q % 6
+        p = 2 * q + 1
+        if p.bit_length() != key_size:
+            continue
+        if math.gcd(q * p, _SIEVE_PRODUCT) != 1:
+            continue
+        if sympy.isprime(q) and sympy.isprime(p):
+            return p, q
+
+
+def _generate_schnorr_group(key_size, q_bits):
+    """
+    Поиск группы Шнорра: простых q длиной q_bits бит и p = m*q + 1 длиной key_size бит.
+    
+    :param key_size: Размер p в битах
+    :param q_bits: Размер q в битах
+    :return: Пара (p, q)
+    """
+    q = sympy.randprime(2**(q_bits - 1), 2**q_bits)
+    
+    # Множитель m четный, чтобы p было нечетным
+    low = -(-2**(key_size - 1) // (2 * q))
+    high = (2**key_size - 1) // (2 * q)
+    while True:
+        m = 2 * (low + secrets.randbelow(high - low))
+        p = m * q + 1
+        if math.gcd(p, _SIEVE_PRODUCT) != 1:
+            continue
+        if sympy.isprime(p):
+            return p, q
@@ -1,78 +1,247 @@
 """
 Реализация алгоритма шифрования Эль-Гамаля.
 """
-import random
-import sympy
+import functools
+import json
 
+from cipher.binfile import (BlockCiphertext, BlockFileReader, BlockFileWriter, BlockStreamReader,
+                            iter_records, pack_header, parse_header)
+from cipher.checkpoint import encrypt_blocks_resumable
+from cipher.elgamal.additive import DiscreteLogTable, byte_codes
+from cipher.elgamal.domain import ElGamalDomain, default_q_bits
+from cipher.elgamal.homomorphic import multiply_batch, product_batch, rerandomize_batch, tree_product
+from cipher.elgamal.nonce import NonceSampler
+from cipher.elgamal.signature import DEFAULT_POOL_SIZE, ELGAMAL, SCHNORR, NoncePool, hash_to_int
+from cipher.interface import ADDITIVE, ENCRYPT, HOMOMORPHIC, RESUMABLE, SIGN, CipherAlgorithm
+from cipher.keys import ElGamalPublicKey
+from cipher.modular import ModulusContext
+from cipher.multiexp import multi_pow
+from cipher.parallel import map_chunks
+from cipher.randomness import default_source
+from cipher.validation import check_element, check_residue, has_quadratic_residue_subgroup
 
-class ElGamal:
-    def __init__(self, key_size=1024):
+# Сигнатура двоичного файла с шифротекстом Эль-Гамаля: байт m шифруется как код g^m
+FILE_MAGIC = b'EGAE'
+
+# Сигнатура прежнего формата, в котором шифровался сам байт m (только для дешифрования)
+LEGACY_FILE_MAGIC = b'EGAB'
+
+# Сигнатуры, которые принимаются при дешифровании
+FILE_MAGICS = (FILE_MAGIC, LEGACY_FILE_MAGIC)
+
+# Количество байтов, обрабатываемых за один проход при работе с файлами
+FILE_CHUNK_SIZE = 4096
+
+
+class ElGamal(CipherAlgorithm):
+    name = 'elgamal'
+    capabilities = frozenset({ENCRYPT, SIGN, HOMOMORPHIC, ADDITIVE, RESUMABLE})
+    
+    def __init__(self, key_size=1024, domain=None, rng=None, schnorr=False):
         """
         Инициализация алгоритма Эль-Гамаля.
         
-        :param key_size: Размер ключа в битах
+        :param key_size: Размер ключа в битах (используется, если домен не передан)
+        :param domain: Параметры домена ElGamalDomain. Если None, используется домен
+                       из кэша процесса (см. cipher.elgamal.domain.default_q_bits).
+        :param rng: Источник случайных чисел для ключа и одноразовых k
+                    (None - буферизованный os.urandom, см. cipher.randomness)
+        :param schnorr: Домен по умолчанию - группа Шнорра с подгруппой порядка до 256 бит
+                        (быстрее, но encrypt принимает только элементы подгруппы).
+                        По умолчанию - безопасное простое, шифруется любое M < p.
         """
+        self.rng = rng if rng is not None else default_source
+        
+        if domain is None:
+            domain = ElGamalDomain.cached(key_size, default_q_bits(key_size, schnorr))
+        self.domain = domain
+        
         # Генерация ключей
-        self.public_key, self.private_key = self._generate_keypair(key_size)
+        self.public_key, self.private_key = self._generate_keypair()
         
-    def _generate_keypair(self, key_size):
+        self._init_key_state()
+    
+    @classmethod
+    def keygen(cls, key_size=1024, **options):
         """
-        Генерация пары ключей Эль-Гамаля.
+        Создание объекта ElGamal с новым ключом (общий интерфейс CipherAlgorithm).
         
         :param key_size: Размер ключа в битах
-        :return: Кортеж (открытый ключ, закрытый ключ)
+        :param options: domain, rng, schnorr (см. __init__)
+        :return: Объект ElGamal
+        """
+        return cls(key_size, **options)
+    
+    def _init_key_state(self):
         """
-        # Генерация большого простого числа p
-        p = sympy.randprime(2**(key_size-1), 2**key_size)
+        Предвычисление значений, которые зависят только от ключа
+        и используются при каждом шифровании и дешифровании.
+        """
+        # Контекст модуля p с таблицами для фиксированных оснований g и y,
+        # которые возводятся в степень при каждом шифровании (показатели меньше q)
+        p, g, y = self.public_key
+        q = self.domain.q
+        self.context = ModulusContext(p)
+        self.context.precompute(g, q.bit_length())
+        self.context.precompute(y, q.bit_length())
+        
+        # Генератор одноразовых k из [1, q-1] для собственного ключа
+        self._nonce_sampler = NonceSampler(p, q, self.rng)
+        
+        # Коды байтов g^m для записей и обратная таблица код -> байт для дешифрования
+        self._byte_codes = byte_codes(p, g)
+        self._byte_lookup = {code: m for m, code in enumerate(self._byte_codes)}
+        
+        # Показатель q-x для дешифрования одним возведением в степень:
+        # a лежит в подгруппе порядка q, поэтому a^(q-x) = a^(-x) mod p
+        self._decrypt_exponent = q - self.private_key
+        
+        # Пул одноразовых значений для подписи создается при первой подписи
+        self._signature_pool = None
+        
+        # Для безопасного простого p компонента a шифротекста проверяется символом Якоби
+        self._check_subgroup = has_quadratic_residue_subgroup(p, g, self.domain.is_safe_prime)
+    
+    def _generate_keypair(self):
+        """
+        Генерация пары ключей Эль-Гамаля в параметрах домена.
         
-        # Находим примитивный корень g по модулю p
-        # На практике часто используются небольшие числа, например 2 или 3
-        g = 2
+        Дорогая часть (поиск p, q и проверка образующей g) выполняется один раз
+        при создании домена, а ключ получается одним возведением в степень.
         
-        # Убедимся, что g действительно является примитивным корнем
-        # Это сложная операция, на практике обычно используются проверенные значения
+        :return: Кортеж (открытый ключ, закрытый ключ)
+        """
+        p, q, g = self.domain.p, self.domain.q, self.domain.g
         
-        # Генерация закрытого ключа x (случайное число от 1 до p-2)
-        x = random.randint(1, p - 2)
+        # Генерация закрытого ключа x (случайное число от 1 до q-1)
+        x = self.rng.randbelow(q - 1) + 1
         
         # Вычисление открытого ключа y = g^x mod p
         y = pow(g, x, p)
         
         # Открытый ключ: тройка (p, g, y)
-        public_key = (p, g, y)
+        public_key = ElGamalPublicKey(p, g, y)
         # Закрытый ключ: x
         private_key = x
         
         return public_key, private_key
         
+    def to_dict(self, include_private=True):
+        """
+        Сериализация ключей в словарь (например, для сохранения в JSON).
+        
+        :param include_private: Включать ли закрытый ключ
+        :return: Словарь с параметрами домена и ключа
+        """
+        data = {'domain': self.domain.to_dict(), 'y': self.public_key[2]}
+        if include_private:
+            data['x'] = self.private_key
+        return data
+    
+    @classmethod
+    def from_dict(cls, data, rng=None):
+        """
+        Восстановление объекта ElGamal из словаря, полученного через to_dict.
+        
+        :param data: Словарь с параметрами ключа (должен содержать закрытый ключ)
+        :param rng: Источник случайных чисел для одноразовых k (None - по умолчанию)
+        :return: Объект ElGamal
+        """
+        domain = ElGamalDomain.from_dict(data['domain'])
+        x, y = data['x'], data['y']
+        if pow(domain.g, x, domain.p) != y:
+            raise ValueError("Закрытый ключ не соответствует открытому")
+        
+        elgamal = cls.__new__(cls)
+        elgamal.rng = rng if rng is not None else default_source
+        elgamal.domain = domain
+        elgamal.public_key = ElGamalPublicKey(domain.p, domain.g, y)
+        elgamal.private_key = x
+        elgamal._init_key_state()
+        
+        return elgamal
+    
+    def save(self, path):
+        """
+        Сохранение ключей в JSON-файл.
+        
+        :param path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка ключей из JSON-файла, сохраненного через save.
+        
+        :param path: Путь к файлу
+        :return: Объект ElGamal
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+    
+    def key_context(self, public_key=None):
+        """
+        Значения, производные от открытого ключа, для циклов шифрования.
+        
+        Для собственного ключа возвращается состояние, подготовленное при создании ключа
+        (контекст модуля с таблицами для g и y, генератор k из [1, q-1]),
+        для чужого - создается новое, которое стоит переиспользовать для всех блоков.
+        
+        :param public_key: Открытый ключ. Если None, используется собственный открытый ключ.
+        :return: Кортеж (ElGamalPublicKey, ModulusContext, NonceSampler)
+        """
+        if public_key is None or public_key is self.public_key or public_key == self.public_key:
+            return self.public_key, self.context, self._nonce_sampler
+        
+        public_key = ElGamalPublicKey.coerce(public_key)
+        return public_key, ModulusContext(public_key.p), NonceSampler(public_key.p, rng=self.rng)
+    
     def encrypt(self, plaintext, public_key=None):
         """
         Шифрование сообщения по алгоритму Эль-Гамаля.
         
+        В группе Шнорра (короткое q) сообщение должно лежать в подгруппе порядка q:
+        для произвольного M шифротекст раскрывает M^q mod p, а по нему - небольшое M.
+        Байты шифруются через encrypt_bytes, числа - через encrypt_additive.
+        
         :param plaintext: Сообщение для шифрования (целое число)
         :param public_key: Открытый ключ получателя. Если None, используется собственный открытый ключ.
         :return: Пара (a, b) - зашифрованное сообщение
+        :raises ValueError: Если сообщение не меньше p или вне подгруппы порядка q группы Шнорра
         """
-        if public_key is None:
-            public_key = self.public_key
-        
-        p, g, y = public_key
+        public_key, context, sampler = self.key_context(public_key)
+        p = public_key.p
         
         # Проверка, что сообщение меньше модуля p
         if plaintext >= p:
             raise ValueError(f"Сообщение слишком длинное. Должно быть меньше {p}")
+        if p == self.domain.p and not self.domain.is_safe_prime and pow(plaintext, self.domain.q, p) != 1:
+            raise ValueError("В группе Шнорра сообщение должно лежать в подгруппе порядка q")
         
-        # Выбор случайного k, взаимно простого с p-1
-        while True:
-            k = random.randint(1, p - 2)
-            if sympy.gcd(k, p - 1) == 1:
-                break
+        return self._encrypt_element(plaintext, public_key, context, sampler)
+    
+    def _encrypt_element(self, plaintext, public_key, context, sampler):
+        """
+        Шифрование элемента группы без проверки сообщения.
+        
+        :param plaintext: Сообщение (элемент группы)
+        :param public_key: Открытый ключ ElGamalPublicKey
+        :param context: Контекст модуля p ключа
+        :param sampler: Генератор одноразовых k ключа
+        :return: Пара (a, b)
+        """
+        p, g, y = public_key
+        
+        # Выбор случайного k
+        k = sampler.sample()
         
         # Вычисление a = g^k mod p
-        a = pow(g, k, p)
+        a = context.pow(g, k)
         
         # Вычисление b = (y^k * M) mod p
-        b = (pow(y, k, p) * plaintext) % p
+        b = (context.pow(y, k) * plaintext) % p
         
         return a, b
         
@@ -81,68 +250,512 @@ class ElGamal:
         Дешифрование сообщения по алгоритму Эль-Гамаля.
         
         :param ciphertext: Пара (a, b) - зашифрованное сообщение
-        :param private_key: Закрытый ключ. Если None, используется собственный закрытый ключ.
+        :param private_key: Закрытый ключ x в собственной группе или пара (p, x) для ключа
+                            другой группы. Если None, используется собственный закрытый ключ.
         :return: Расшифрованное сообщение
         """
-        if private_key is None:
-            private_key = self.private_key
-        
         a, b = ciphertext
-        p = self.public_key[0]
-        x = private_key
+        p, exponent = self._private_key_params(private_key)
+        
+        # Некорректный шифротекст отклоняется до возведения в степень (см. cipher.validation)
+        check_element(a, p, 'elgamal.ciphertext', self._check_subgroup and p == self.context.modulus)
+        check_residue(b, p, 'elgamal.ciphertext')
         
         # Вычисление M = b * (a^x)^(-1) mod p
-        # Это эквивалентно M = b * a^(-x) mod p
+        # Порядок a делит q (для собственного ключа) или p-1, поэтому (a^x)^(-1) = a^(q-x)
+        # или a^(p-1-x) и достаточно одного возведения в степень вместо двух
+        plaintext = (b * pow(a, exponent, p)) % p
         
-        # Вычисляем a^x mod p
-        a_x = pow(a, x, p)
+        return plaintext
+    
+    def decrypt_many(self, ciphertexts, private_key=None, workers=None):
+        """
+        Пакетное дешифрование списка пар (a, b).
         
-        # Находим мультипликативно обратное к a^x по модулю p
-        a_x_inv = pow(a_x, p - 2, p)
+        Показатель дешифрования вычисляется один раз на пакет, большие пакеты
+        распределяются по пулу процессов. Шифротексты проверяются так же, как в decrypt,
+        до запуска пула.
         
-        # Восстанавливаем исходное сообщение M
-        plaintext = (b * a_x_inv) % p
+        :param ciphertexts: Список пар (a, b)
+        :param private_key: Закрытый ключ x или пара (p, x) (см. decrypt)
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Список расшифрованных сообщений в том же порядке
+        """
+        p, exponent = self._private_key_params(private_key)
+        check_subgroup = self._check_subgroup and p == self.context.modulus
+        for a, b in ciphertexts:
+            check_element(a, p, 'elgamal.ciphertext', check_subgroup)
+            check_residue(b, p, 'elgamal.ciphertext')
         
-        return plaintext
+        func = functools.partial(_decrypt_batch, p, exponent)
+        return map_chunks(func, ciphertexts, workers)
+    
+    def multiply(self, left, right, public_key=None, workers=None):
+        """
+        Поэлементное гомоморфное умножение шифротекстов.
+        
+        Пара i результата - шифротекст произведения открытых текстов left[i] и right[i].
+        
+        :param left: Список пар (a, b)
+        :param right: Список пар (a, b) той же длины, зашифрованных тем же ключом
+        :param public_key: Открытый ключ шифротекстов. Если None, используется собственный.
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Список пар (a, b)
+        """
+        if len(left) != len(right):
+            raise ValueError("Списки шифротекстов должны быть одной длины")
+        public_key, _, _ = self.key_context(public_key)
+        func = functools.partial(multiply_batch, public_key.p)
+        return map_chunks(func, list(zip(left, right)), workers)
+    
+    def rerandomize(self, ciphertexts, public_key=None, workers=None):
+        """
+        Перешифрование: (a, b) -> (a * g^r, b * y^r) со свежим случайным r.
+        
+        Открытые тексты не меняются, но новые шифротексты нельзя сопоставить с исходными
+        (например, перед публикацией свернутого значения). Показатели r выбираются
+        в текущем процессе одним запросом к источнику случайных чисел.
+        
+        :param ciphertexts: Список пар (a, b)
+        :param public_key: Открытый ключ шифротекстов. Если None, используется собственный.
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Список пар (a, b) в том же порядке
+        """
+        public_key, context, sampler = self.key_context(public_key)
+        items = [(a, b, r) for (a, b), r in zip(ciphertexts, sampler.sample_many(len(ciphertexts)))]
+        func = functools.partial(rerandomize_batch, context, public_key.g, public_key.y)
+        return map_chunks(func, items, workers)
+    
+    def aggregate(self, ciphertexts, public_key=None, workers=None):
+        """
+        Свертка шифротекстов в один шифротекст произведения всех открытых текстов.
+        
+        Части списка сворачиваются деревом (в пуле процессов для больших списков),
+        затем так же сворачиваются произведения частей. Результат расшифровывается
+        одним вызовом decrypt; открытый текст - произведение по модулю p.
+        
+        :param ciphertexts: Непустой список пар (a, b)
+        :param public_key: Открытый ключ шифротекстов. Если None, используется собственный.
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Пара (a, b)
+        """
+        if not ciphertexts:
+            raise ValueError("Нет шифротекстов для свертки")
+        p = self.key_context(public_key)[0].p
+        partial_products = map_chunks(functools.partial(product_batch, p), ciphertexts, workers)
+        return tree_product(p, partial_products)
+    
+    def encrypt_additive(self, value, public_key=None):
+        """
+        Шифрование числа в экспоненциальном режиме: шифруется g^value.
+        
+        Произведение таких шифротекстов (aggregate) - шифротекст суммы чисел.
+        
+        :param value: Неотрицательное целое число (небольшое - его восстанавливают по таблице)
+        :param public_key: Открытый ключ получателя. Если None, используется собственный открытый ключ.
+        :return: Пара (a, b)
+        """
+        if value < 0:
+            raise ValueError("Число должно быть неотрицательным")
+        public_key, context, sampler = self.key_context(public_key)
+        # g^value лежит в подгруппе образующей g, поэтому дополнительная проверка не нужна
+        return self._encrypt_element(context.pow(public_key.g, value), public_key, context, sampler)
+    
+    def discrete_log_table(self, max_value, baby_steps=None, path=None):
+        """
+        Таблица для дешифрования в экспоненциальном режиме (см. cipher.elgamal.additive).
+        
+        :param max_value: Наибольшее восстанавливаемое значение (например, наибольшая сумма)
+        :param baby_steps: Количество шагов младенца (None - корень из размера диапазона)
+        :param path: Путь к файлу-кэшу таблицы (None - таблица только в памяти)
+        :return: Объект DiscreteLogTable
+        """
+        p, g = self.public_key.p, self.public_key.g
+        if path is None:
+            return DiscreteLogTable(p, g, max_value, baby_steps)
+        return DiscreteLogTable.load_or_build(path, p, g, max_value, baby_steps)
+    
+    def decrypt_additive(self, ciphertext, table, private_key=None):
+        """
+        Дешифрование шифротекста экспоненциального режима.
+        
+        :param ciphertext: Пара (a, b), полученная через encrypt_additive или aggregate
+        :param table: Таблица DiscreteLogTable для g собственного ключа
+        :param private_key: Закрытый ключ. Если None, используется собственный закрытый ключ.
+        :return: Зашифрованное число
+        :raises ValueError: Если число вне диапазона таблицы
+        """
+        return table.solve(self.decrypt(ciphertext, private_key))
+    
+    def _private_key_params(self, private_key):
+        """
+        Модуль и показатель для дешифрования одним возведением в степень.
+        
+        Для собственного ключа показатель равен q-x, для произвольного x - p-1-x
+        (подходит для любого a, взаимно простого с p).
+        
+        :param private_key: Закрытый ключ x, пара (p, x) или None (собственный закрытый ключ)
+        :return: Кортеж (p, показатель q-x или p-1-x)
+        """
+        p = self.context.modulus
+        if isinstance(private_key, tuple):
+            p, private_key = private_key
+        if p == self.context.modulus and private_key in (None, self.private_key):
+            return p, self._decrypt_exponent
+        return p, p - 1 - private_key
+    
+    def _check_byte_key(self, private_key):
+        """
+        Проверка закрытого ключа для дешифрования байтов.
+        
+        Ширина записей и обратная таблица кодов g^m построены для собственного домена,
+        поэтому пара (p, x) с другим модулем не принимается (ее g неизвестен).
+        
+        :param private_key: Закрытый ключ x, пара (p, x) или None
+        :raises ValueError: Если ключ относится к другому модулю
+        """
+        if isinstance(private_key, tuple) and private_key[0] != self.context.modulus:
+            raise ValueError("Байты расшифровываются только ключом собственного домена")
+    
+    def nonce_pool(self, size=DEFAULT_POOL_SIZE, background=False):
+        """
+        Пул предвычисленных троек (k, g^k mod p, k^(-1) mod q) для подписи собственным ключом.
+        
+        :param size: Размер пула (учитывается при первом вызове)
+        :param background: Запустить пополнение пула в фоновом потоке
+        :return: Объект NoncePool
+        """
+        if self._signature_pool is None:
+            g = self.public_key.g
+            self._signature_pool = NoncePool(self.domain.q, self.context.table(g).pow,
+                                             self._nonce_sampler, size)
+        if background:
+            self._signature_pool.start()
+        return self._signature_pool
+    
+    def sign(self, message, scheme=ELGAMAL):
+        """
+        Подпись сообщения собственным закрытым ключом.
+        
+        Одноразовое k и g^k берутся из пула (см. nonce_pool), поэтому подпись
+        сводится к хешированию и умножениям по модулю q.
+        
+        :param message: Подписываемое сообщение (байты или строка UTF-8)
+        :param scheme: Схема подписи: 'elgamal' (по умолчанию) или 'schnorr'
+        :return: Подпись в байтах: r || s для Эль-Гамаля, e || s для Шнорра
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        
+        q = self.domain.q
+        x = self.private_key
+        q_len = (q.bit_length() + 7) // 8
+        pool = self.nonce_pool()
+        
+        if scheme == ELGAMAL:
+            h = hash_to_int(q, message)
+            while True:
+                k, r, k_inv = pool.take()
+                s = (h - x * r) * k_inv % q
+                if s:
+                    return r.to_bytes(self.public_key.byte_length, 'big') + s.to_bytes(q_len, 'big')
+        
+        if scheme == SCHNORR:
+            k, r, _ = pool.take()
+            e = hash_to_int(q, r.to_bytes(self.public_key.byte_length, 'big'), message)
+            s = (k + x * e) % q
+            return e.to_bytes(q_len, 'big') + s.to_bytes(q_len, 'big')
+        
+        raise ValueError(f"Неизвестная схема подписи: {scheme}")
+    
+    def verify(self, message, signature, public_key=None, scheme=ELGAMAL):
+        """
+        Проверка подписи.
+        
+        Произведение двух степеней в уравнении проверки вычисляется за один проход
+        (метод Штрауса, см. cipher.multiexp).
+        
+        :param message: Сообщение (байты или строка UTF-8)
+        :param signature: Подпись, полученная через sign
+        :param public_key: Открытый ключ подписавшего (в том же домене).
+                           Если None, используется собственный открытый ключ.
+        :param scheme: Схема подписи: 'elgamal' или 'schnorr'
+        :return: True, если подпись верна
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        
+        public_key, context, _ = self.key_context(public_key)
+        p, g, y = public_key
+        q = self.domain.q
+        if (p, g) != (self.domain.p, self.domain.g):
+            raise ValueError("Ключ подписавшего относится к другому домену")
+        if not 1 < y < p:
+            return False
+        
+        q_len = (q.bit_length() + 7) // 8
+        
+        if scheme == ELGAMAL:
+            if len(signature) != public_key.byte_length + q_len:
+                return False
+            r = int.from_bytes(signature[:public_key.byte_length], 'big')
+            s = int.from_bytes(signature[public_key.byte_length:], 'big')
+            if not (0 < r < p and 0 < s < q):
+                return False
+            # y^r * r^s = g^H(m); y лежит в подгруппе порядка q, поэтому y^r = y^(r mod q)
+            h = hash_to_int(q, message)
+            return multi_pow(((y, r % q), (r, s)), p) == context.pow(g, h)
+        
+        if scheme == SCHNORR:
+            if len(signature) != 2 * q_len:
+                return False
+            e = int.from_bytes(signature[:q_len], 'big')
+            s = int.from_bytes(signature[q_len:], 'big')
+            if not (0 <= e < q and 0 <= s < q):
+                return False
+            # R = g^s * y^(q-e) = g^(s - x*e) = g^k
+            r = multi_pow(((g, s), (y, q - e)), p)
+            return hash_to_int(q, r.to_bytes(public_key.byte_length, 'big'), message) == e
+        
+        raise ValueError(f"Неизвестная схема подписи: {scheme}")
     
     def encrypt_string(self, text, public_key=None):
         """
-        Шифрование текстовой строки по алгоритму Эль-Гамаля.
+        Шифрование текстовой строки (обертка над encrypt_bytes).
         
         :param text: Текст для шифрования
         :param public_key: Открытый ключ
-        :return: Список пар (a, b) для каждого символа текста
+        :return: Шифротекст в виде bytes
         """
-        if public_key is None:
-            public_key = self.public_key
-            
-        # Кодируем текст в байты
-        text_bytes = text.encode('utf-8')
-        
-        # Шифруем каждый байт отдельно
-        result = []
-        for byte in text_bytes:
-            encrypted = self.encrypt(byte, public_key)
-            result.append(encrypted)
-            
-        return result
+        return self.encrypt_bytes(text.encode('utf-8'), public_key)
     
     def decrypt_string(self, encrypted_data, private_key=None):
         """
-        Дешифрование зашифрованной строки.
+        Дешифрование строки (обертка над decrypt_bytes).
+        
+        Для совместимости принимается и старый формат - список пар (a, b) для каждого байта.
         
-        :param encrypted_data: Список пар (a, b) для каждого байта
+        :param encrypted_data: Шифротекст в виде bytes или список пар (a, b)
         :param private_key: Закрытый ключ
         :return: Расшифрованный текст
         """
-        if private_key is None:
-            private_key = self.private_key
-        
-        # Расшифровываем каждый байт
-        decrypted_bytes = bytearray()
-        for pair in encrypted_data:
-            byte = self.decrypt(pair, private_key)
-            decrypted_bytes.append(byte)
+        if isinstance(encrypted_data, (bytes, bytearray, memoryview)):
+            decrypted_bytes = self.decrypt_bytes(encrypted_data, private_key)
+        else:
+            # Расшифровываем все байты одним пакетом
+            decrypted_bytes = bytes(self.decrypt_many(encrypted_data, private_key))
         
         # Преобразуем байты в строку
         return decrypted_bytes.decode('utf-8')
+    
+    def encrypt_bytes(self, data, public_key=None):
+        """
+        Шифрование произвольных байтов.
+        
+        Результат записан в том же двоичном формате, что и файлы (см. cipher.binfile):
+        каждый байт m - запись из пары (a, b) фиксированной ширины, шифрующей код g^m.
+        
+        :param data: Байты для шифрования
+        :param public_key: Открытый ключ
+        :return: Шифротекст в виде bytes
+        """
+        public_key, _, _ = self.key_context(public_key)
+        header = pack_header(FILE_MAGIC, public_key.record_width, 1, len(data))
+        return header + self._encrypt_records(data, public_key)
+    
+    def encrypt_blocks(self, data, public_key=None):
+        """
+        Шифрование байтов в компактный контейнер записей (a, b) фиксированной ширины
+        вместо списка пар чисел.
+        
+        :param data: Байты для шифрования
+        :param public_key: Открытый ключ
+        :return: Объект BlockCiphertext
+        """
+        return BlockCiphertext(self.encrypt_bytes(data, public_key), FILE_MAGIC)
+    
+    def decrypt_bytes(self, data, private_key=None):
+        """
+        Дешифрование байтов, полученных через encrypt_bytes (или содержимого файла).
+        
+        :param data: Шифротекст в виде bytes или BlockCiphertext
+        :param private_key: Закрытый ключ
+        :return: Расшифрованные байты
+        :raises ValueError: Если шифротекст обрезан, дополнен или не соответствует ключу
+                            (в том числе если передан ключ (p, x) другого домена)
+        """
+        self._check_byte_key(private_key)
+        if isinstance(data, BlockCiphertext):
+            data = data.buffer
+        width, _, plaintext_length, count = parse_header(data, FILE_MAGICS)
+        if width != self.public_key.record_width:
+            raise ValueError("Данные зашифрованы ключом другого размера")
+        
+        result = self._decrypt_records(iter_records(data, width, 0, count), private_key, bytes(data[:4]))
+        _check_length(len(result), plaintext_length)
+        return result
+    
+    def encrypt_file(self, input_path, output_path, public_key=None):
+        """
+        Шифрование файла в двоичный формат: каждый байт - запись из пары (a, b)
+        фиксированной ширины.
+        
+        Шифротекст пишется частями с контрольной точкой (output_path + .ckpt),
+        прерванное шифрование продолжается повторным вызовом с тем же ключом.
+        
+        :param input_path: Путь к исходному файлу (читается в двоичном режиме)
+        :param output_path: Путь к зашифрованному файлу
+        :param public_key: Открытый ключ
+        :return: True, если шифрование было продолжено с контрольной точки
+        """
+        public_key, _, _ = self.key_context(public_key)
+        
+        return encrypt_blocks_resumable(
+            input_path, output_path, FILE_MAGIC, public_key.record_width, 1, FILE_CHUNK_SIZE,
+            lambda data: self._encrypt_records(data, public_key),
+            public_key.fingerprint)
+    
+    def encrypt_stream(self, src, dst, public_key=None):
+        """
+        Потоковое шифрование из одного двоичного файлового объекта в другой.
+        
+        :param src: Двоичный файловый объект с открытым текстом
+        :param dst: Двоичный файловый объект для шифротекста (должен поддерживать seek)
+        :param public_key: Открытый ключ
+        """
+        public_key, _, _ = self.key_context(public_key)
+        
+        with BlockFileWriter(dst, FILE_MAGIC, public_key.record_width, 1) as writer:
+            while True:
+                data = src.read(FILE_CHUNK_SIZE)
+                if not data:
+                    break
+                writer.write(self._encrypt_records(data, public_key), len(data))
+    
+    def decrypt_stream(self, src, dst, private_key=None):
+        """
+        Потоковое дешифрование из одного двоичного файлового объекта в другой.
+        
+        Для файлов на диске быстрее decrypt_file, который читает шифротекст через mmap.
+        
+        :param src: Двоичный файловый объект с шифротекстом
+        :param dst: Двоичный файловый объект для открытого текста
+        :param private_key: Закрытый ключ
+        :raises ValueError: Если шифротекст обрезан, дополнен или не соответствует ключу
+                            (в том числе если передан ключ (p, x) другого домена)
+        """
+        self._check_byte_key(private_key)
+        reader = BlockStreamReader(src, FILE_MAGICS)
+        width = reader.record_width
+        if width != self.public_key.record_width:
+            raise ValueError("Данные зашифрованы ключом другого размера")
+        
+        written = 0
+        for chunk in reader.chunks(FILE_CHUNK_SIZE):
+            records = iter_records(chunk, width, 0, len(chunk) // width, offset=0)
+            written += dst.write(self._decrypt_records(records, private_key, reader.magic))
+        _check_length(written, reader.plaintext_length)
+    
+    def decrypt_file(self, input_path, output_path, private_key=None):
+        """
+        Дешифрование файла в двоичном формате через mmap.
+        
+        Пары (a, b) читаются срезами memoryview прямо из отображенного в память файла
+        и расшифровываются частями, результат пишется через буферизованный поток.
+        
+        :param input_path: Путь к зашифрованному файлу
+        :param output_path: Путь к расшифрованному файлу
+        :param private_key: Закрытый ключ
+        :raises ValueError: Если файл обрезан, дополнен или не соответствует ключу
+                            (в том числе если передан ключ (p, x) другого домена)
+        """
+        self._check_byte_key(private_key)
+        with BlockFileReader(input_path, FILE_MAGICS) as reader, open(output_path, 'wb') as dst:
+            if reader.record_width != self.public_key.record_width:
+                raise ValueError("Файл зашифрован ключом другого размера")
+            
+            written = 0
+            for start in range(0, reader.record_count, FILE_CHUNK_SIZE):
+                written += dst.write(self._decrypt_records(reader.records(start, start + FILE_CHUNK_SIZE),
+                                                           private_key, reader.magic))
+            _check_length(written, reader.plaintext_length)
+    
+    def _encrypt_records(self, data, public_key):
+        """
+        Шифрование байтов в последовательность записей (a, b) фиксированной ширины.
+        
+        Байт m шифруется как код g^m (см. cipher.elgamal.additive.byte_codes).
+        
+        :param data: Байты открытого текста
+        :param public_key: Открытый ключ
+        :return: bytearray с записями, выделенный один раз по длине данных
+        """
+        public_key, context, sampler = self.key_context(public_key)
+        p, g, y = public_key
+        width = public_key.byte_length
+        records = bytearray(public_key.record_width * len(data))
+        
+        # Ключ, таблицы оснований и коды байтов разрешаются один раз на все байты
+        g_table, y_table = context.table(g), context.table(y)
+        pow_g = g_table.pow if g_table else lambda k: pow(g, k, p)
+        pow_y = y_table.pow if y_table else lambda k: pow(y, k, p)
+        codes = self._byte_codes if public_key == self.public_key else byte_codes(p, g)
+        
+        # Одноразовые k для всех байтов выбираются одним запросом к источнику
+        pos = 0
+        for byte, k in zip(data, sampler.sample_many(len(data))):
+            records[pos:pos + width] = pow_g(k).to_bytes(width, 'big')
+            records[pos + width:pos + 2 * width] = (pow_y(k) * codes[byte] % p).to_bytes(width, 'big')
+            pos += 2 * width
+        
+        return records
+    
+    def _decrypt_records(self, records, private_key, magic=FILE_MAGIC):
+        """
+        Дешифрование последовательности записей (a, b) фиксированной ширины.
+        
+        :param records: Срезы memoryview записей
+        :param private_key: Закрытый ключ
+        :param magic: Сигнатура формата (LEGACY_FILE_MAGIC - записи шифруют сам байт)
+        :return: Расшифрованные байты
+        :raises ValueError: Если расшифрованное значение не является кодом байта
+                            или ключ относится к другому домену
+        """
+        self._check_byte_key(private_key)
+        width = self.context.byte_length
+        pairs = [(int.from_bytes(record[:width], 'big'), int.from_bytes(record[width:], 'big'))
+                 for record in records]
+        values = self.decrypt_many(pairs, private_key, workers=1)
+        if magic == LEGACY_FILE_MAGIC:
+            return bytes(values)
+        
+        lookup = self._byte_lookup
+        try:
+            return bytes([lookup[value] for value in values])
+        except KeyError:
+            raise ValueError("Расшифрованное значение не является кодом байта") from None
+
+
+def _check_length(length, plaintext_length):
+    """
+    Сверка длины расшифрованных данных с длиной открытого текста из заголовка
+    (каждая запись - один байт, поэтому размер блока в заголовке должен быть равен 1).
+    
+    :param length: Количество расшифрованных байтов
+    :param plaintext_length: Длина открытого текста из заголовка
+    :raises ValueError: Если длины не совпадают
+    """
+    if length != plaintext_length:
+        raise ValueError("Длина расшифрованных данных не соответствует заголовку")
+
+
+def _decrypt_batch(p, exponent, ciphertexts):
+    """
+    Дешифрование части пакета: M = b * a^(-x) mod p.
+    
+    :param p: Модуль p
+    :param exponent: Показатель q-x или p-1-x
+    :param ciphertexts: Список пар (a, b)
+    :return: Список расшифрованных сообщений
+    """
+    return [(b * pow(a, exponent, p)) % p for a, b in ciphertexts]
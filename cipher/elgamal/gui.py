@@ -2,6 +2,7 @@
 Графический интерфейс пользователя для алгоритма шифрования Эль-Гамаля.
 Реализация на PyQt6 с темной темой.
 """
+import base64
 import json
 import os
 import sys
@@ -12,14 +13,22 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QAction
 from PyQt6.QtCore import Qt, QSize
-from elgamal import ElGamal
+
+# Корень репозитория нужен в sys.path для импорта общих модулей пакета cipher
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cipher.elgamal import actions
+
+# Используем небольшой размер ключа для демонстрации (для продакшена нужно больше)
+KEY_SIZE = 512
 
 class ElGamalApp(QMainWindow):
     def __init__(self):
         super().__init__()
         # Инициализация алгоритма Эль-Гамаля
-        # Используем небольшой размер ключа для демонстрации (для продакшена нужно больше)
-        self.cipher = ElGamal(key_size=512)
+        # Параметры домена загружаются из кэша и общие для всех генерируемых ключей
+        self.domain = actions.load_domain(KEY_SIZE)
+        self.cipher = actions.generate_keys(self.domain)
         
         self.setWindowTitle("Шифрование Эль-Гамаля")
         self.setGeometry(100, 100, 900, 700)
@@ -113,6 +122,16 @@ class ElGamalApp(QMainWindow):
         # Меню "Файл"
         file_menu = menubar.addMenu("Файл")
         
+        encrypt_file_action = QAction("Зашифровать файл...", self)
+        encrypt_file_action.triggered.connect(self.encrypt_file)
+        file_menu.addAction(encrypt_file_action)
+        
+        decrypt_file_action = QAction("Расшифровать файл...", self)
+        decrypt_file_action.triggered.connect(self.decrypt_file)
+        file_menu.addAction(decrypt_file_action)
+        
+        file_menu.addSeparator()
+        
         exit_action = QAction("Выход", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -264,6 +283,7 @@ class ElGamalApp(QMainWindow):
         x = self.cipher.private_key
         
         key_text = f"Открытый ключ: (p: {p}, g: {g}, y: {y})\n"
+        key_text += f"Порядок подгруппы: q: {self.domain.q}\n"
         key_text += f"Закрытый ключ: x: {x}"
         
         self.key_info.setText(key_text)
@@ -271,7 +291,7 @@ class ElGamalApp(QMainWindow):
     def generate_new_keys(self):
         """Генерация новой пары ключей"""
         try:
-            self.cipher = ElGamal(key_size=512)
+            self.cipher = actions.generate_keys(self.domain)
             self.update_key_info()
             QMessageBox.information(self, "Успех", "Новые ключи успешно сгенерированы")
         except Exception as e:
@@ -285,12 +305,8 @@ class ElGamalApp(QMainWindow):
                 QMessageBox.warning(self, "Предупреждение", "Введите текст для шифрования")
                 return
             
-            encrypted = self.cipher.encrypt_string(plaintext)
-            
-            # Преобразуем в JSON для отображения
-            encrypted_json = json.dumps([(int(a), int(b)) for a, b in encrypted], indent=2)
-            
-            self.encrypt_output.setText(encrypted_json)
+            # Двоичный шифротекст отображается в base64
+            self.encrypt_output.setText(actions.encrypt_text(self.cipher, plaintext))
             
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка при шифровании: {str(e)}")
@@ -303,16 +319,13 @@ class ElGamalApp(QMainWindow):
                 QMessageBox.warning(self, "Предупреждение", "Введите зашифрованный текст для расшифрования")
                 return
             
-            # Парсим JSON
-            encrypted_data = json.loads(encrypted_json)
-            encrypted_data = [(int(a), int(b)) for a, b in encrypted_data]
-            
-            decrypted = self.cipher.decrypt_string(encrypted_data)
+            # base64 двоичного формата или старый формат - JSON-массив пар (a, b)
+            decrypted = actions.decrypt_text(self.cipher, encrypted_json)
             
             self.decrypt_output.setText(decrypted)
             
         except json.JSONDecodeError:
-            QMessageBox.critical(self, "Ошибка", "Неверный формат зашифрованных данных. Ожидается JSON-массив.")
+            QMessageBox.critical(self, "Ошибка", "Неверный формат зашифрованных данных. Ожидается base64 или JSON-массив.")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка при расшифровании: {str(e)}")
     
@@ -327,9 +340,12 @@ class ElGamalApp(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
+                with open(file_path, 'rb') as file:
                     content = file.read()
-                self.encrypt_input.setText(content)
+                self.encrypt_input.setText(content.decode('utf-8'))
+            except UnicodeDecodeError:
+                # Двоичный файл шифруется потоково, без загрузки в текстовое поле
+                self.encrypt_file_from(file_path)
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось открыть файл: {str(e)}")
     
@@ -339,19 +355,71 @@ class ElGamalApp(QMainWindow):
             self,
             "Выберите файл для расшифрования",
             "",
-            "JSON файлы (*.json);;Все файлы (*.*)"
+            "Файлы Эль-Гамаля (*.egab);;JSON файлы (*.json);;Все файлы (*.*)"
         )
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
+                if actions.is_encrypted_file(file_path):
+                    # Двоичный файл расшифровывается потоково, без загрузки в текстовое поле
+                    self.decrypt_file_to(file_path)
+                    return
+                with open(file_path, 'rb') as file:
                     content = file.read()
-                self.decrypt_input.setText(content)
+                self.decrypt_input.setText(content.decode('utf-8'))
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось открыть файл: {str(e)}")
     
+    def encrypt_file(self):
+        """Шифрование файла в двоичный формат"""
+        input_path, _ = QFileDialog.getOpenFileName(self, "Выберите файл для шифрования", "", "Все файлы (*.*)")
+        if input_path:
+            self.encrypt_file_from(input_path)
+    
+    def encrypt_file_from(self, input_path):
+        """Шифрование файла с выбором пути для результата"""
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Сохранить зашифрованный файл",
+            "",
+            "Файлы Эль-Гамаля (*.egab);;Все файлы (*.*)"
+        )
+        if not output_path:
+            return
+        
+        try:
+            # Прерванное ранее шифрование этого файла тем же ключом продолжается с контрольной точки
+            resumed = actions.encrypt_file(self.cipher, input_path, output_path)
+            note = " (продолжено с контрольной точки)" if resumed else ""
+            QMessageBox.information(self, "Успех", f"Файл успешно зашифрован: {output_path}{note}")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при шифровании файла: {str(e)}")
+    
+    def decrypt_file(self):
+        """Расшифрование файла в двоичном формате"""
+        input_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Выберите файл для расшифрования",
+            "",
+            "Файлы Эль-Гамаля (*.egab);;Все файлы (*.*)"
+        )
+        if input_path:
+            self.decrypt_file_to(input_path)
+    
+    def decrypt_file_to(self, input_path):
+        """Расшифрование двоичного файла с выбором пути для результата"""
+        output_path, _ = QFileDialog.getSaveFileName(self, "Сохранить расшифрованный файл", "", "Все файлы (*.*)")
+        if not output_path:
+            return
+        
+        try:
+            actions.decrypt_file(self.cipher, input_path, output_path)
+            QMessageBox.information(self, "Успех", f"Файл успешно расшифрован: {output_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при расшифровании файла: {str(e)}")
+    
     def save_encrypted_text(self):
-        """Сохранение зашифрованного текста в файл"""
+        """Сохранение зашифрованного текста в двоичный файл"""
         encrypted_text = self.encrypt_output.toPlainText().strip()
         if not encrypted_text:
             QMessageBox.warning(self, "Предупреждение", "Нет данных для сохранения")
@@ -361,13 +429,13 @@ class ElGamalApp(QMainWindow):
             self,
             "Сохранить зашифрованный текст",
             "",
-            "JSON файлы (*.json);;Все файлы (*.*)"
+            "Файлы Эль-Гамаля (*.egab);;Все файлы (*.*)"
         )
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(encrypted_text)
+                with open(file_path, 'wb') as file:
+                    file.write(base64.b64decode(encrypted_text))
                 QMessageBox.information(self, "Успех", f"Файл успешно сохранен: {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении файла: {str(e)}")
@@ -388,8 +456,8 @@ class ElGamalApp(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(decrypted_text)
+                with open(file_path, 'wb') as file:
+                    file.write(decrypted_text.encode('utf-8'))
                 QMessageBox.information(self, "Успех", f"Файл успешно сохранен: {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении файла: {str(e)}")
@@ -0,0 +1,70 @@
+"""
+Гомоморфные операции над шифротекстами Эль-Гамаля.
+
+Шифротексты (a, b) = (g^k, y^k * M) одного открытого ключа мультипликативно гомоморфны:
+    (a1 * a2, b1 * b2)       - шифротекст произведения M1 * M2 (k = k1 + k2);
+    (a * g^r, b * y^r)       - новый шифротекст того же M (перешифрование без ключа).
+
+Поэтому тысячи зашифрованных значений можно свернуть в один шифротекст и расшифровать
+один раз. Функции модуля работают над частями списков и передаются в пул процессов
+(cipher.parallel.map_chunks), поэтому принимают только простые значения.
+"""
+
+
+def tree_product(p, ciphertexts):
+    """
+    Произведение шифротекстов попарным сворачиванием (деревом).
+
+    :param p: Модуль p
+    :param ciphertexts: Непустой список пар (a, b)
+    :return: Пара (a, b) - шифротекст произведения открытых текстов
+    """
+    level = list(ciphertexts)
+    if not level:
+        raise ValueError("Нет шифротекстов для произведения")
+    while len(level) > 1:
+        paired = [((a1 * a2) % p, (b1 * b2) % p)
+                  for (a1, b1), (a2, b2) in zip(level[0::2], level[1::2])]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def product_batch(p, ciphertexts):
+    """
+    Произведение части пакета (для пула процессов).
+
+    :param p: Модуль p
+    :param ciphertexts: Список пар (a, b)
+    :return: Список из одной пары - произведения части
+    """
+    return [tree_product(p, ciphertexts)]
+
+
+def multiply_batch(p, pairs):
+    """
+    Поэлементное произведение шифротекстов.
+
+    :param p: Модуль p
+    :param pairs: Список пар шифротекстов ((a1, b1), (a2, b2))
+    :return: Список пар (a1 * a2 mod p, b1 * b2 mod p)
+    """
+    return [((a1 * a2) % p, (b1 * b2) % p) for (a1, b1), (a2, b2) in pairs]
+
+
+def rerandomize_batch(context, g, y, items):
+    """
+    Перешифрование части пакета.
+
+    :param context: Контекст модуля p (ModulusContext, желательно с таблицами для g и y)
+    :param g: Образующая g
+    :param y: Открытый ключ y
+    :param items: Список троек (a, b, r), r - случайный показатель
+    :return: Список пар (a * g^r mod p, b * y^r mod p)
+    """
+    p = context.modulus
+    g_table, y_table = context.table(g), context.table(y)
+    pow_g = g_table.pow if g_table else lambda r: pow(g, r, p)
+    pow_y = y_table.pow if y_table else lambda r: pow(y, r, p)
+    return [((a * pow_g(r)) % p, (b * pow_y(r)) % p) for a, b, r in items]
@@ -0,0 +1,63 @@
+"""
+Выбор одноразовых случайных чисел k для алгоритма Эль-Гамаля.
+"""
+import math
+
+from cipher.randomness import default_source
+
+
+class NonceSampler:
+    def __init__(self, p, q=None, rng=None):
+        """
+        Генератор одноразовых k для одного ключа.
+        
+        Если известен простой порядок q подгруппы, в которой лежат g и y, k выбирается
+        из [1, q-1] без отбраковки: любое такое k взаимно просто с q.
+        Иначе k должно быть взаимно просто с p-1: так как p-1 четно, k выбирается сразу
+        среди нечетных чисел из [1, p-2], а оставшиеся общие делители отсекаются через math.gcd.
+        
+        :param p: Простой модуль ключа
+        :param q: Простой порядок подгруппы (None - неизвестен)
+        :param rng: Источник случайных чисел (None - буферизованный os.urandom)
+        """
+        self.p = p
+        self.q = q
+        self.rng = rng if rng is not None else default_source
+        self._order = p - 1
+        self._half = self._order // 2
+    
+    def sample(self):
+        """
+        Выбор случайного k.
+        
+        Используется источник rng (по умолчанию - криптографически стойкий).
+        
+        :return: Случайное число k из [1, q-1] или из [1, p-2], взаимно простое с p-1
+        """
+        if self.q is not None:
+            return self.rng.randbelow(self.q - 1) + 1
+        
+        order = self._order
+        half = self._half
+        randbelow = self.rng.randbelow
+        while True:
+            k = 2 * randbelow(half) + 1
+            if math.gcd(k, order) == 1:
+                return k
+    
+    def sample_many(self, count):
+        """
+        Выбор count случайных k одним запросом к источнику случайных чисел.
+        
+        :param count: Количество значений
+        :return: Список случайных k с теми же свойствами, что у sample
+        """
+        if self.q is not None:
+            return [k + 1 for k in self.rng.randbelow_many(self.q - 1, count)]
+        
+        order = self._order
+        result = []
+        while len(result) < count:
+            candidates = self.rng.randbelow_many(self._half, count - len(result))
+            result.extend(k for k in (2 * c + 1 for c in candidates) if math.gcd(k, order) == 1)
+        return result
@@ -0,0 +1,133 @@
+"""
+Подпись Эль-Гамаля и Шнорра в подгруппе простого порядка q.
+
+Оба варианта работают в параметрах домена ElGamalDomain (g порождает подгруппу
+порядка q), поэтому все показатели и обратные элементы берутся по модулю q:
+    Эль-Гамаль: r = g^k mod p, s = (H(m) - x*r) * k^(-1) mod q,
+                проверка y^r * r^s = g^H(m) (mod p);
+    Шнорр:      R = g^k mod p, e = H(R || m) mod q, s = k + x*e mod q,
+                проверка H(g^s * y^(-e) || m) = e.
+
+Дорогая часть подписи - g^k и k^(-1) - не зависит от сообщения и заранее
+вычисляется пулом NoncePool, так что при подписи остаются хеширование
+и пара умножений по модулю q.
+"""
+import collections
+import hashlib
+import os
+import threading
+import weakref
+
+# Схемы подписи
+ELGAMAL = 'elgamal'
+SCHNORR = 'schnorr'
+SCHEMES = (ELGAMAL, SCHNORR)
+
+# Размер пула предвычисленных одноразовых значений по умолчанию
+DEFAULT_POOL_SIZE = 64
+
+
+def hash_to_int(q, *parts):
+    """
+    Хеш SHA-256 от конкатенации частей, приведенный по модулю q.
+
+    :param q: Порядок подгруппы
+    :param parts: Байтовые строки
+    :return: Число из [0, q)
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return int.from_bytes(digest.digest(), 'big') % q
+
+
+class NoncePool:
+    def __init__(self, q, pow_g, sampler, size=DEFAULT_POOL_SIZE):
+        """
+        Пул предвычисленных одноразовых значений (k, g^k mod p, k^(-1) mod q) для подписи.
+
+        Каждая тройка выдается ровно один раз. Пул можно пополнять в фоновом потоке
+        (start), тогда он дополняется, когда в нем остается меньше половины троек;
+        если пул пуст, тройка вычисляется сразу. Повторное использование k раскрывает
+        закрытый ключ, поэтому тройки не сериализуются и сбрасываются в дочернем
+        процессе после fork.
+
+        :param q: Порядок подгруппы
+        :param pow_g: Функция k -> g^k mod p (например, таблица фиксированного основания)
+        :param sampler: Генератор одноразовых k (NonceSampler)
+        :param size: Размер пула
+        """
+        self.q = q
+        self.size = size
+        self._pow_g = pow_g
+        self._sampler = sampler
+        self._init_state()
+
+    def _init_state(self):
+        self._items = collections.deque()
+        self._wanted = threading.Event()
+        self._thread = None
+        _pools.add(self)
+
+    def _make(self):
+        k = self._sampler.sample()
+        return k, self._pow_g(k), pow(k, -1, self.q)
+
+    def fill(self):
+        """Пополнение пула до полного размера в текущем потоке"""
+        while len(self._items) < self.size:
+            self._items.append(self._make())
+
+    def start(self):
+        """Запуск фонового потока, пополняющего пул"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='elgamal-nonce-pool', daemon=True)
+        self._thread.start()
+        self._wanted.set()
+
+    def _run(self):
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            self.fill()
+
+    def take(self):
+        """
+        Выдача одной тройки.
+
+        :return: Кортеж (k, g^k mod p, k^(-1) mod q)
+        """
+        try:
+            item = self._items.popleft()
+        except IndexError:
+            item = self._make()
+        if self._thread is not None and len(self._items) < self.size // 2:
+            self._wanted.set()
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_items', '_wanted', '_thread'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def _reset_after_fork(self):
+        # Поток родителя в дочернем процессе не существует, тройки родителя использовать нельзя
+        self._items = collections.deque()
+        self._wanted = threading.Event()
+        self._thread = None
+
+
+# Пулы процесса, которые нужно очистить в дочернем процессе после fork
+_pools = weakref.WeakSet()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: [pool._reset_after_fork() for pool in list(_pools)])
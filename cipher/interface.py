@@ -0,0 +1,135 @@
+"""
+Общий интерфейс алгоритмов шифрования пакета.
+
+Классы RSA, ElGamal и DiffieHellmanSession наследуют CipherAlgorithm, поэтому пакетная
+обработка, пул процессов, потоковое шифрование и замеры производительности пишутся
+один раз для всех алгоритмов: объект алгоритма получается через keygen или load,
+а данные шифруются через encrypt_bytes/decrypt_bytes, потоки и файлы.
+Алгоритмы различаются возможностями (capabilities), например, подписью
+или гомоморфными операциями. Реестр алгоритмов по названию - в cipher/__init__.py.
+"""
+import abc
+
+# Возможности алгоритмов
+ENCRYPT = 'encrypt'            # encrypt_bytes/decrypt_bytes, потоки и файлы
+SIGN = 'sign'                  # sign/verify
+HOMOMORPHIC = 'homomorphic'    # multiply/aggregate/rerandomize над шифротекстами
+ADDITIVE = 'additive'          # экспоненциальный режим со сложением зашифрованных чисел
+RESUMABLE = 'resumable'        # encrypt_file продолжает прерванное шифрование
+RANDOM_ACCESS = 'random_access'  # read_range читает диапазон без дешифрования всего файла
+BLINDING = 'blinding'          # ослепление закрытой операции
+SYMMETRIC = 'symmetric'        # симметричный шифр на общем секрете
+
+
+class CipherAlgorithm(abc.ABC):
+    """
+    Базовый класс алгоритма шифрования.
+
+    Подклассы задают name и capabilities и реализуют keygen, save, load,
+    encrypt_bytes и decrypt_bytes. Потоковые и файловые методы по умолчанию выражены
+    через encrypt_bytes/decrypt_bytes и читают данные целиком; алгоритмы с
+    собственной потоковой обработкой переопределяют их.
+    """
+
+    # Название алгоритма в реестре
+    name = None
+
+    # Множество возможностей алгоритма (константы модуля)
+    capabilities = frozenset()
+
+    @classmethod
+    @abc.abstractmethod
+    def keygen(cls, key_size=1024, **options):
+        """
+        Создание объекта алгоритма с новым ключом.
+
+        :param key_size: Размер ключа в битах
+        :param options: Параметры конкретного алгоритма
+        :return: Объект алгоритма
+        """
+
+    @abc.abstractmethod
+    def save(self, path):
+        """
+        Сохранение ключа в JSON-файл.
+
+        :param path: Путь к файлу
+        """
+
+    @classmethod
+    @abc.abstractmethod
+    def load(cls, path):
+        """
+        Загрузка ключа из JSON-файла, сохраненного через save.
+
+        :param path: Путь к файлу
+        :return: Объект алгоритма
+        """
+
+    @abc.abstractmethod
+    def encrypt_bytes(self, data):
+        """
+        Шифрование байтов собственным ключом.
+
+        :param data: Байты открытого текста
+        :return: Шифротекст в виде bytes
+        """
+
+    @abc.abstractmethod
+    def decrypt_bytes(self, data):
+        """
+        Дешифрование байтов, полученных через encrypt_bytes.
+
+        :param data: Шифротекст
+        :return: Байты открытого текста
+        """
+
+    @classmethod
+    def supports(cls, capability):
+        """
+        Проверка возможности алгоритма.
+
+        :param capability: Возможность (константа модуля)
+        :return: True, если алгоритм ее поддерживает
+        """
+        return capability in cls.capabilities
+
+    def encrypt_stream(self, src, dst):
+        """
+        Шифрование из одного двоичного файлового объекта в другой.
+
+        :param src: Двоичный файловый объект с открытым текстом
+        :param dst: Двоичный файловый объект для шифротекста
+        """
+        dst.write(self.encrypt_bytes(src.read()))
+
+    def decrypt_stream(self, src, dst):
+        """
+        Дешифрование из одного двоичного файлового объекта в другой.
+
+        :param src: Двоичный файловый объект с шифротекстом
+        :param dst: Двоичный файловый объект для открытого текста
+        """
+        dst.write(self.decrypt_bytes(src.read()))
+
+    def encrypt_file(self, input_path, output_path):
+        """
+        Шифрование файла.
+
+        :param input_path: Путь к исходному файлу
+        :param output_path: Путь к зашифрованному файлу
+        :return: True, если шифрование было продолжено с контрольной точки
+        """
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            self.encrypt_stream(src, dst)
+        return False
+
+    def decrypt_file(self, input_path, output_path):
+        """
+        Дешифрование файла.
+
+        :param input_path: Путь к зашифрованному файлу
+        :param output_path: Путь к расшифрованному файлу
+        """
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            self.decrypt_stream(src, dst)
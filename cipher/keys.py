@@ -0,0 +1,127 @@
+"""
+Компактные типы ключей RSA и Эль-Гамаля.
+
+Ключи ведут себя как кортежи, которыми они были раньше (распаковка
+n, e = public_key, индексация, сравнение с кортежем), но хранятся в объектах
+со __slots__ и сразу содержат производные значения: длину модуля в битах
+и байтах, размер блока открытого текста, ширину записи шифротекста.
+Отпечаток ключа вычисляется при первом обращении и запоминается.
+"""
+from cipher.checkpoint import key_fingerprint
+
+
+class _Key:
+    # Имена компонентов ключа в порядке кортежа
+    _fields = ()
+    __slots__ = ('_fingerprint',)
+
+    @classmethod
+    def coerce(cls, key):
+        """
+        Приведение ключа к типу класса.
+
+        :param key: Объект класса или кортеж компонентов ключа
+        :return: Объект класса (тот же объект, если приведение не нужно)
+        """
+        if isinstance(key, cls):
+            return key
+        return cls(*key)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __iter__(self):
+        return iter(self._values())
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        return self._values()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, tuple):
+            return self._values() == other
+        if isinstance(other, _Key):
+            return type(other) is type(self) and self._values() == other._values()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __reduce__(self):
+        # При передаче между процессами достаточно компонентов ключа,
+        # производные значения вычисляются заново в конструкторе
+        return type(self), self._values()
+
+    def __repr__(self):
+        args = ', '.join(f'{name}={getattr(self, name)}' for name in self._fields)
+        return f'{type(self).__name__}({args})'
+
+    @property
+    def fingerprint(self):
+        """SHA-256 от компонентов ключа (см. cipher.checkpoint.key_fingerprint)"""
+        if self._fingerprint is None:
+            self._fingerprint = key_fingerprint(*self._values())
+        return self._fingerprint
+
+
+class RSAPublicKey(_Key):
+    _fields = ('n', 'e')
+    __slots__ = ('n', 'e', 'bit_length', 'byte_length', 'block_size')
+
+    def __init__(self, n, e):
+        """
+        Открытый ключ RSA.
+
+        :param n: Модуль
+        :param e: Открытая экспонента
+        """
+        self.n = n
+        self.e = e
+        self.bit_length = n.bit_length()
+        # Ширина блока шифротекста и размер блока открытого текста (блок меньше модуля)
+        self.byte_length = (self.bit_length + 7) // 8
+        self.block_size = (self.bit_length - 1) // 8
+        self._fingerprint = None
+
+
+class RSAPrivateKey(_Key):
+    _fields = ('n', 'd')
+    __slots__ = ('n', 'd', 'bit_length', 'byte_length', 'block_size')
+
+    def __init__(self, n, d):
+        """
+        Закрытый ключ RSA.
+
+        :param n: Модуль
+        :param d: Закрытая экспонента
+        """
+        self.n = n
+        self.d = d
+        self.bit_length = n.bit_length()
+        self.byte_length = (self.bit_length + 7) // 8
+        self.block_size = (self.bit_length - 1) // 8
+        self._fingerprint = None
+
+
+class ElGamalPublicKey(_Key):
+    _fields = ('p', 'g', 'y')
+    __slots__ = ('p', 'g', 'y', 'bit_length', 'byte_length', 'record_width')
+
+    def __init__(self, p, g, y):
+        """
+        Открытый ключ Эль-Гамаля.
+
+        :param p: Простой модуль
+        :param g: Образующая
+        :param y: Открытое значение g^x mod p
+        """
+        self.p = p
+        self.g = g
+        self.y = y
+        self.bit_length = p.bit_length()
+        self.byte_length = (self.bit_length + 7) // 8
+        # Запись шифротекста - пара (a, b), каждое число шириной в модуль
+        self.record_width = 2 * self.byte_length
+        self._fingerprint = None
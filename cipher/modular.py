@@ -0,0 +1,120 @@
+"""
+Контекст модуля для многократного возведения в степень по одному модулю.
+
+Контекст создается один раз на ключ: в нем хранятся производные значения модуля
+и таблицы предвычислений для фиксированных оснований (например, g и y в Эль-Гамале).
+"""
+
+# Размер окна (в битах) таблицы фиксированного основания по умолчанию
+DEFAULT_WINDOW = 4
+
+
+class FixedBaseTable:
+    def __init__(self, base, modulus, exponent_bits, window=DEFAULT_WINDOW):
+        """
+        Таблица предвычислений для возведения фиксированного основания в степень.
+        
+        Строка i таблицы содержит base^(j * 2^(window*i)) mod modulus для j = 0..2^window-1,
+        поэтому возведение в степень сводится к одному умножению на каждую
+        ненулевую цифру показателя без возведений в квадрат.
+        
+        :param base: Фиксированное основание
+        :param modulus: Модуль
+        :param exponent_bits: Максимальная длина показателя в битах
+        :param window: Размер окна в битах
+        """
+        self.base = base
+        self.modulus = modulus
+        self.exponent_bits = exponent_bits
+        self.window = window
+        self._mask = (1 << window) - 1
+        
+        self._rows = []
+        row_base = base % modulus
+        for _ in range(-(-exponent_bits // window)):
+            row = [1]
+            for _ in range(self._mask):
+                row.append(row[-1] * row_base % modulus)
+            self._rows.append(row)
+            # Основание следующей строки: base^(2^(window*(i+1)))
+            row_base = row[-1] * row_base % modulus
+    
+    def pow(self, exponent):
+        """
+        Вычисление base^exponent mod modulus.
+        
+        Показатели вне диапазона таблицы вычисляются встроенной функцией pow.
+        
+        :param exponent: Показатель степени
+        :return: Результат возведения в степень
+        """
+        if exponent < 0 or exponent.bit_length() > self.exponent_bits:
+            return pow(self.base, exponent, self.modulus)
+        
+        modulus = self.modulus
+        mask = self._mask
+        window = self.window
+        
+        result = 1
+        for row in self._rows:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % modulus
+            exponent >>= window
+        
+        return result % modulus
+
+
+class ModulusContext:
+    def __init__(self, modulus):
+        """
+        Контекст модуля.
+        
+        :param modulus: Модуль
+        """
+        self.modulus = modulus
+        self.bit_length = modulus.bit_length()
+        self.byte_length = (self.bit_length + 7) // 8
+        
+        # Таблицы для фиксированных оснований: основание -> FixedBaseTable
+        self._tables = {}
+    
+    def precompute(self, base, exponent_bits=None, window=DEFAULT_WINDOW):
+        """
+        Построение таблицы для основания, которое будет многократно возводиться в степень.
+        
+        :param base: Фиксированное основание
+        :param exponent_bits: Максимальная длина показателя (по умолчанию - длина модуля)
+        :param window: Размер окна в битах
+        """
+        if exponent_bits is None:
+            exponent_bits = self.bit_length
+        self._tables[base] = FixedBaseTable(base, self.modulus, exponent_bits, window)
+    
+    def table(self, base):
+        """
+        Таблица фиксированного основания (для циклов, где основание не меняется
+        и поиск таблицы на каждом возведении в степень лишний).
+        
+        :param base: Основание
+        :return: Объект FixedBaseTable или None, если таблица не построена
+        """
+        return self._tables.get(base)
+    
+    def pow(self, base, exponent):
+        """
+        Вычисление base^exponent по модулю контекста.
+        
+        Для оснований с предвычисленной таблицей используется таблица,
+        для остальных - встроенная функция pow.
+        
+        :param base: Основание
+        :param exponent: Показатель степени
+        :return: Результат возведения в степень
+        """
+        table = self._tables.get(base)
+        if table is not None:
+            return table.pow(exponent)
+        return pow(base, exponent, self.modulus)
@@ -0,0 +1,101 @@
+"""
+Одновременное возведение в степень нескольких оснований (прием Шамира, метод Штрауса).
+
+Произведение b_1^e_1 * ... * b_t^e_t mod m вычисляется за один проход по показателям
+окнами по w битов: на каждое окно приходится w возведений в квадрат, общих для всех
+оснований, и умножения на предвычисленные степени оснований. По сравнению с t
+отдельными вызовами pow экономятся (t-1) цепочек возведений в квадрат.
+
+Предвычисления выбираются по оценке числа умножений:
+    совместная таблица  - произведения b_1^d_1 * ... * b_t^d_t для всех наборов цифр
+                          окна, одно умножение на окно (выгодна для 2-3 оснований);
+    раздельные таблицы  - b_i^d для каждого основания, до t умножений на окно.
+"""
+
+# Наибольший размер окна в битах
+MAX_WINDOW = 6
+
+# Наибольшее количество элементов совместной таблицы
+MAX_JOINT_TABLE = 1 << 8
+
+
+def _cost(bits, count, window, joint):
+    """Оценка числа умножений (без возведений в квадрат, одинаковых для всех вариантов)"""
+    windows = -(-bits // window)
+    if joint:
+        return (1 << (window * count)) + windows
+    return count * ((1 << window) + windows)
+
+
+def choose_window(bits, count):
+    """
+    Выбор размера окна и вида таблицы.
+
+    :param bits: Длина наибольшего показателя в битах
+    :param count: Количество оснований
+    :return: Кортеж (размер окна, True для совместной таблицы)
+    """
+    options = [(window, joint) for window in range(1, MAX_WINDOW + 1) for joint in (True, False)
+               if not joint or (1 << (window * count)) <= MAX_JOINT_TABLE]
+    return min(options, key=lambda option: _cost(bits, count, *option))
+
+
+def multi_pow(pairs, modulus, window=None, joint=None):
+    """
+    Вычисление произведения степеней по модулю.
+
+    :param pairs: Последовательность пар (основание, показатель), показатели неотрицательны
+    :param modulus: Модуль
+    :param window: Размер окна в битах (None - выбирается по длине показателей)
+    :param joint: Использовать совместную таблицу (None - выбирается вместе с окном)
+    :return: Произведение base^exponent по всем парам mod modulus
+    """
+    pairs = list(pairs)
+    bases = [base % modulus for base, _ in pairs]
+    exponents = [exponent for _, exponent in pairs]
+    if any(exponent < 0 for exponent in exponents):
+        raise ValueError("Показатели должны быть неотрицательными")
+
+    bits = max((exponent.bit_length() for exponent in exponents), default=0)
+    if not bits:
+        return 1 % modulus
+
+    if window is None or joint is None:
+        best_window, best_joint = choose_window(bits, len(bases))
+        window = best_window if window is None else window
+        joint = best_joint if joint is None else joint
+
+    mask = (1 << window) - 1
+
+    # Степени каждого основания: powers[i][d] = bases[i]^d, d < 2^window
+    powers = []
+    for base in bases:
+        row = [1]
+        for _ in range(mask):
+            row.append(row[-1] * base % modulus)
+        powers.append(row)
+
+    if joint:
+        # table[индекс набора цифр] = произведение bases[i]^d_i; индекс - цифры окна подряд
+        table = [1]
+        for row in powers:
+            table = [value * power % modulus for power in row for value in table]
+
+    result = 1
+    for shift in range(-(-bits // window) * window - window, -1, -window):
+        for _ in range(window):
+            result = result * result % modulus
+
+        if joint:
+            index = 0
+            for i, exponent in enumerate(exponents):
+                index |= ((exponent >> shift) & mask) << (window * i)
+            if index:
+                result = result * table[index] % modulus
+        else:
+            for row, exponent in zip(powers, exponents):
+                digit = (exponent >> shift) & mask
+                if digit:
+                    result = result * row[digit] % modulus
+
+    return result % modulus
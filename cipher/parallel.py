@@ -0,0 +1,56 @@
+"""
+Распределение пакетных операций по пулу процессов.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Минимальный размер пакета, начиная с которого имеет смысл запускать пул процессов
+MIN_PARALLEL_ITEMS = 1024
+
+
+def chunked(items, chunk_size):
+    """
+    Разбиение списка на последовательные части.
+    
+    :param items: Список элементов
+    :param chunk_size: Максимальный размер части
+    :return: Генератор частей списка
+    """
+    for i in range(0, len(items), chunk_size):
+        yield items[i:i + chunk_size]
+
+
+def map_chunks(func, items, workers=None, chunk_size=None):
+    """
+    Применение функции к частям списка в пуле процессов с сохранением порядка.
+    
+    Функция должна принимать список и возвращать список (обычно той же длины;
+    результаты частей склеиваются по порядку, поэтому функция может и свертывать
+    часть в один элемент), а также поддерживать pickle (функция модуля или метод
+    объекта с простыми полями).
+    Небольшие пакеты обрабатываются в текущем процессе.
+    
+    :param func: Функция, обрабатывающая часть списка
+    :param items: Обрабатываемые элементы
+    :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+    :param chunk_size: Размер части (None - подбирается по числу процессов)
+    :return: Список результатов в исходном порядке
+    """
+    items = list(items)
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    if workers <= 1 or len(items) < MIN_PARALLEL_ITEMS:
+        return func(items)
+    
+    if chunk_size is None:
+        # Несколько частей на процесс, чтобы выровнять нагрузку
+        chunk_size = -(-len(items) // (workers * 4))
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(func, chunked(items, chunk_size)):
+            results.extend(part)
+    
+    return results
@@ -0,0 +1,398 @@
+"""
+Профилирование действий графических интерфейсов без PyQt.
+
+Обработчики кнопок (RSAApplication.encrypt_text, ElGamalApp.decrypt_text,
+DiffieHellmanApp.generate_keys и т.д.) выполняют работу функциями модулей actions
+пакетов cipher.rsa, cipher.elgamal и cipher.diffie_hellman, и каждый сценарий вызывает
+ту же функцию без виджетов: ключи и входной текст или файл заданного размера
+готовятся заранее, профилируется только само действие. Для каждого сценария и размера
+в выходной каталог записываются:
+    <сценарий>-<размер>.pstats     - статистика cProfile (модуль pstats, snakeviz);
+    <сценарий>-<размер>.collapsed  - стеки вызовов в формате collapsed для flame graph
+                                     (flamegraph.pl, speedscope), значения в микросекундах;
+    <сценарий>-<размер>.memory.txt - пиковая память tracemalloc и крупнейшие места выделения;
+а в history.jsonl добавляется строка с временем, пиковой памятью и самыми дорогими
+функциями, чтобы сравнивать запуски между собой.
+
+Замер времени, cProfile, сбор стеков и tracemalloc выполняются отдельными проходами,
+чтобы накладные расходы одного не искажали другой. Профилируется только текущий
+процесс: работа процессов пула видна как ожидание результатов.
+
+Запуск из корня репозитория:
+    python -m cipher.profiling
+    python -m cipher.profiling elgamal.encrypt_text elgamal.decrypt_text --sizes 1024 16384
+    python -m cipher.profiling --list
+"""
+import argparse
+import collections
+import cProfile
+import json
+import os
+import pstats
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cipher.diffie_hellman import actions as dh_actions
+from cipher.elgamal import actions as elgamal_actions
+from cipher.rsa import actions as rsa_actions
+from cipher.rsa.rsa import RSA
+
+# Символы синтетического текста: латиница, цифры и кириллица (многобайтовая в UTF-8)
+TEXT_ALPHABET = string.ascii_letters + string.digits + ' .,абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+# Глубина стека мест выделения памяти в tracemalloc
+TRACE_FRAMES = 10
+
+# Количество самых дорогих функций в history.jsonl
+HISTORY_TOP = 5
+
+
+def synthetic_text(size, seed=0):
+    """
+    Воспроизводимый текст заданной длины.
+
+    :param size: Количество символов
+    :param seed: Начальное значение генератора
+    :return: Строка
+    """
+    return ''.join(random.Random(seed).choices(TEXT_ALPHABET, k=size))
+
+
+def synthetic_file(path, size, seed=0):
+    """
+    Запись воспроизводимого двоичного файла заданного размера.
+
+    :param path: Путь к файлу
+    :param size: Размер в байтах
+    :param seed: Начальное значение генератора
+    :return: Путь к файлу
+    """
+    with open(path, 'wb') as f:
+        f.write(random.Random(seed).randbytes(size))
+    return path
+
+
+# Сценарии: функция подготовки получает размер ключа, размер входных данных и рабочий
+# каталог и возвращает функцию без аргументов - действие интерфейса
+
+
+def rsa_encrypt_text(key_size, size, workdir):
+    """RSAApplication.encrypt_text: шифрование текста, результат в base64"""
+    rsa = RSA(key_size)
+    text = synthetic_text(size)
+    return lambda: rsa_actions.encrypt_text(rsa, text)
+
+
+def rsa_decrypt_text(key_size, size, workdir):
+    """RSAApplication.decrypt_text: разбор base64 и дешифрование текста"""
+    rsa = RSA(key_size)
+    encrypted = rsa_actions.encrypt_text(rsa, synthetic_text(size))
+    return lambda: rsa_actions.decrypt_text(rsa, encrypted)
+
+
+def rsa_encrypt_file(key_size, size, workdir):
+    """RSAApplication.encrypt_file: потоковое шифрование файла"""
+    rsa = RSA(key_size)
+    input_path = synthetic_file(os.path.join(workdir, 'rsa.bin'), size)
+    return lambda: rsa_actions.encrypt_file(rsa, input_path, os.path.join(workdir, 'rsa.enc'))
+
+
+def rsa_decrypt_file(key_size, size, workdir):
+    """RSAApplication.decrypt_file: дешифрование файла двоичного формата"""
+    rsa = RSA(key_size)
+    input_path = os.path.join(workdir, 'rsa.enc')
+    rsa_actions.encrypt_file(rsa, synthetic_file(os.path.join(workdir, 'rsa.bin'), size), input_path)
+    return lambda: rsa_actions.decrypt_file(rsa, input_path, os.path.join(workdir, 'rsa.dec'))
+
+
+def elgamal_generate_keys(key_size, size, workdir):
+    """ElGamalApp.generate_new_keys: новая пара ключей в общем домене"""
+    domain = elgamal_actions.load_domain(key_size)
+    return lambda: elgamal_actions.generate_keys(domain)
+
+
+def elgamal_encrypt_text(key_size, size, workdir):
+    """ElGamalApp.encrypt_text: шифрование текста, результат в base64"""
+    cipher = elgamal_actions.generate_keys(elgamal_actions.load_domain(key_size))
+    text = synthetic_text(size)
+    return lambda: elgamal_actions.encrypt_text(cipher, text)
+
+
+def elgamal_decrypt_text(key_size, size, workdir):
+    """ElGamalApp.decrypt_text: разбор base64 и дешифрование текста"""
+    cipher = elgamal_actions.generate_keys(elgamal_actions.load_domain(key_size))
+    encrypted = elgamal_actions.encrypt_text(cipher, synthetic_text(size))
+    return lambda: elgamal_actions.decrypt_text(cipher, encrypted)
+
+
+def elgamal_encrypt_file(key_size, size, workdir):
+    """ElGamalApp.encrypt_file_from: шифрование файла в двоичный формат"""
+    cipher = elgamal_actions.generate_keys(elgamal_actions.load_domain(key_size))
+    input_path = synthetic_file(os.path.join(workdir, 'elgamal.bin'), size)
+    return lambda: elgamal_actions.encrypt_file(cipher, input_path, os.path.join(workdir, 'elgamal.egab'))
+
+
+def elgamal_decrypt_file(key_size, size, workdir):
+    """ElGamalApp.decrypt_file_to: дешифрование файла двоичного формата"""
+    cipher = elgamal_actions.generate_keys(elgamal_actions.load_domain(key_size))
+    input_path = os.path.join(workdir, 'elgamal.egab')
+    elgamal_actions.encrypt_file(cipher, synthetic_file(os.path.join(workdir, 'elgamal.bin'), size), input_path)
+    return lambda: elgamal_actions.decrypt_file(cipher, input_path, os.path.join(workdir, 'elgamal.dec'))
+
+
+def dh_generate_keys(key_size, size, workdir):
+    """DiffieHellmanApp.generate_keys: параметры, ключи двух сторон и сеанс на общем секрете"""
+    return lambda: dh_actions.generate_keys(key_size)
+
+
+def _dh_session(key_size):
+    """Сеанс на общем секрете двух сторон, как после DiffieHellmanApp.generate_keys"""
+    return dh_actions.generate_keys(key_size)[3]
+
+
+def dh_encrypt_data(key_size, size, workdir):
+    """DiffieHellmanApp.encrypt_data: шифрование текста AES на общем ключе"""
+    session = _dh_session(key_size)
+    text = synthetic_text(size)
+    return lambda: dh_actions.encrypt_text(session, text)
+
+
+def dh_decrypt_data(key_size, size, workdir):
+    """DiffieHellmanApp.decrypt_data: дешифрование текста AES на общем ключе"""
+    session = _dh_session(key_size)
+    encrypted = dh_actions.encrypt_text(session, synthetic_text(size))
+    return lambda: dh_actions.decrypt_text(session, encrypted)
+
+
+def dh_encrypt_file(key_size, size, workdir):
+    """DiffieHellmanApp.encrypt_file: потоковое шифрование файла"""
+    session = _dh_session(key_size)
+    input_path = synthetic_file(os.path.join(workdir, 'dh.bin'), size)
+    return lambda: dh_actions.encrypt_file(session, input_path, os.path.join(workdir, 'dh.enc'))
+
+
+def dh_decrypt_file(key_size, size, workdir):
+    """DiffieHellmanApp.decrypt_file: потоковое дешифрование файла"""
+    session = _dh_session(key_size)
+    input_path = os.path.join(workdir, 'dh.enc')
+    dh_actions.encrypt_file(session, synthetic_file(os.path.join(workdir, 'dh.bin'), size), input_path)
+    return lambda: dh_actions.decrypt_file(session, input_path, os.path.join(workdir, 'dh.dec'))
+
+
+# Сценарии: название -> (функция подготовки, размер ключа по умолчанию как в интерфейсе)
+SCENARIOS = {
+    'rsa.encrypt_text': (rsa_encrypt_text, 1024),
+    'rsa.decrypt_text': (rsa_decrypt_text, 1024),
+    'rsa.encrypt_file': (rsa_encrypt_file, 1024),
+    'rsa.decrypt_file': (rsa_decrypt_file, 1024),
+    'elgamal.generate_keys': (elgamal_generate_keys, 512),
+    'elgamal.encrypt_text': (elgamal_encrypt_text, 512),
+    'elgamal.decrypt_text': (elgamal_decrypt_text, 512),
+    'elgamal.encrypt_file': (elgamal_encrypt_file, 512),
+    'elgamal.decrypt_file': (elgamal_decrypt_file, 512),
+    'dh.generate_keys': (dh_generate_keys, 512),
+    'dh.encrypt_data': (dh_encrypt_data, 512),
+    'dh.decrypt_data': (dh_decrypt_data, 512),
+    'dh.encrypt_file': (dh_encrypt_file, 512),
+    'dh.decrypt_file': (dh_decrypt_file, 512),
+}
+
+
+class StackProfiler:
+    def __init__(self):
+        """
+        Детерминированный сбор стеков вызовов через sys.setprofile.
+
+        Собственное время каждой функции накапливается по полному стеку вызовов
+        (включая встроенные функции, например pow), что и нужно для flame graph.
+        """
+        self.stacks = collections.Counter()
+        self._stack = []
+        self._last = 0
+
+    @staticmethod
+    def _label(frame, event, arg):
+        """Название кадра: модуль:функция для Python-кода, имя встроенной функции для C"""
+        if event == 'c_call':
+            module = getattr(arg, '__module__', None)
+            name = getattr(arg, '__qualname__', repr(arg))
+            return f'{module}.{name}' if module else name
+        code = frame.f_code
+        return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if stack:
+            self.stacks[tuple(stack)] += now - self._last
+        if event in ('call', 'c_call'):
+            stack.append(self._label(frame, event, arg))
+        elif stack:
+            stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def run(self, func):
+        """
+        Выполнение функции со сбором стеков.
+
+        :param func: Функция без аргументов
+        :return: Результат функции
+        """
+        self._stack = []
+        sys.setprofile(self._callback)
+        try:
+            return func()
+        finally:
+            sys.setprofile(None)
+
+    def write_collapsed(self, path):
+        """
+        Запись стеков в формате collapsed: 'кадр;кадр;... микросекунды' в строке.
+
+        :param path: Путь к файлу
+        """
+        lines = []
+        for stack, elapsed in self.stacks.items():
+            micros = elapsed // 1000
+            if micros:
+                lines.append(f"{';'.join(stack)} {micros}\n")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(sorted(lines))
+
+
+def top_functions(stats, count):
+    """
+    Самые дорогие функции по собственному времени.
+
+    :param stats: Объект pstats.Stats
+    :param count: Количество функций
+    :return: Список пар ('файл:строка(функция)', секунды)
+    """
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [(f'{os.path.basename(filename)}:{line}({name})', round(total_time, 6))
+            for (filename, line, name), (_, _, total_time, _, _) in entries[:count]]
+
+
+def memory_report(func, path, top):
+    """
+    Пиковая память действия и крупнейшие места выделения.
+
+    Места выделения берутся из снимка после действия, пока его результат еще жив,
+    поэтому в отчет попадают буферы результата и кэши, созданные действием.
+
+    :param func: Функция без аргументов
+    :param path: Путь к текстовому отчету
+    :param top: Количество мест выделения в отчете
+    :return: Пиковая память в байтах
+    """
+    tracemalloc.start(TRACE_FRAMES)
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        # Результат освобождается до записи отчета; если действие завершилось
+        # исключением, переменная не создана и освобождать нечего
+        del result
+    finally:
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Пиковая память: {peak} байт ({peak / 1024:.1f} КБ)\n\n")
+        f.write("Крупнейшие места выделения после действия:\n")
+        for stat in snapshot.statistics('traceback')[:top]:
+            f.write(f"\n{stat.size} байт, {stat.count} блоков\n")
+            f.writelines(f"    {line}\n" for line in stat.traceback.format(most_recent_first=True))
+    return peak
+
+
+def profile_scenario(name, size, output_dir, key_size=None, repeat=1, top=20):
+    """
+    Профилирование одного сценария: pstats, collapsed-стеки и отчет о памяти.
+
+    :param name: Название сценария из SCENARIOS
+    :param size: Размер входных данных (символы текста или байты файла)
+    :param output_dir: Каталог для результатов
+    :param key_size: Размер ключа в битах (None - как в графическом интерфейсе)
+    :param repeat: Количество выполнений действия в проходах времени, cProfile и стеков
+    :param top: Количество мест выделения в отчете о памяти
+    :return: Словарь с итогами (записывается в history.jsonl)
+    """
+    prepare, default_key_size = SCENARIOS[name]
+    key_size = key_size or default_key_size
+    prefix = os.path.join(output_dir, f'{name}-{size}')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        action = prepare(key_size, size, workdir)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            action()
+        seconds = (time.perf_counter() - start) / repeat
+
+        profiler = cProfile.Profile()
+        for _ in range(repeat):
+            profiler.runcall(action)
+        profiler.dump_stats(f'{prefix}.pstats')
+
+        stacks = StackProfiler()
+        for _ in range(repeat):
+            stacks.run(action)
+        stacks.write_collapsed(f'{prefix}.collapsed')
+
+        peak = memory_report(action, f'{prefix}.memory.txt', top)
+
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scenario': name,
+        'size': size,
+        'key_size': key_size,
+        'seconds': round(seconds, 6),
+        'peak_bytes': peak,
+        'top': top_functions(pstats.Stats(profiler), HISTORY_TOP),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Профилирование действий графических интерфейсов без PyQt")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help="Профилируемые сценарии (по умолчанию все, список - --list)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 16384],
+                        help="Размеры входных данных (символы текста или байты файла)")
+    parser.add_argument('--key-size', type=int,
+                        help="Размер ключа в битах (по умолчанию как в графическом интерфейсе)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Количество выполнений действия в каждом проходе")
+    parser.add_argument('--top', type=int, default=20,
+                        help="Количество мест выделения в отчете о памяти")
+    parser.add_argument('--output-dir', default='profiles', help="Каталог для результатов")
+    parser.add_argument('--list', action='store_true', help="Вывести список сценариев")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in sorted(SCENARIOS):
+            print(f"{name:24} {SCENARIOS[name][0].__doc__}")
+        return
+
+    unknown = sorted(set(args.scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(unknown)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, 'history.jsonl'), 'a', encoding='utf-8') as history:
+        for name in args.scenarios or sorted(SCENARIOS):
+            for size in args.sizes:
+                result = profile_scenario(name, size, args.output_dir, args.key_size, args.repeat, args.top)
+                history.write(json.dumps(result, ensure_ascii=False) + '\n')
+                history.flush()
+                hottest = result['top'][0][0] if result['top'] else '-'
+                print(f"  {name:24} {size:8} {result['seconds'] * 1000:10.2f} мс  "
+                      f"пик {result['peak_bytes'] / 1024:9.1f} КБ  {hottest}")
+
+
+if __name__ == "__main__":
+    main()
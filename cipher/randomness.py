@@ -0,0 +1,219 @@
+"""
+Источники случайных чисел для генерации ключей и одноразовых значений.
+
+Источник передается в алгоритм параметром rng. По умолчанию используется
+BufferedRandomSource: байты читаются из os.urandom большими блоками, поэтому
+выбор одноразового k для каждого шифруемого байта не требует системного вызова.
+DeterministicRandomSource выдает воспроизводимую последовательность по начальному
+значению и предназначен только для тестов и замеров производительности.
+"""
+import abc
+import hashlib
+import os
+import threading
+import weakref
+
+import sympy
+
+# Размер блока, читаемого из os.urandom за один вызов
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class RandomSource(abc.ABC):
+    """
+    Базовый источник случайных чисел.
+
+    Подклассы реализуют token_bytes, остальные методы выражены через него.
+    """
+
+    @abc.abstractmethod
+    def token_bytes(self, length):
+        """
+        Случайные байты.
+
+        :param length: Количество байтов
+        :return: bytes длины length
+        """
+
+    def randbits(self, bits):
+        """
+        Случайное неотрицательное число длиной не более bits битов.
+
+        :param bits: Количество битов
+        :return: Число из [0, 2^bits)
+        """
+        if bits <= 0:
+            return 0
+        value = int.from_bytes(self.token_bytes((bits + 7) // 8), 'big')
+        return value >> (-bits % 8)
+
+    def randbelow(self, n):
+        """
+        Равномерно распределенное случайное число из [0, n).
+
+        Используется отбраковка: число из bits(n-1) битов принимается, если оно меньше n,
+        поэтому в среднем нужно меньше двух попыток.
+
+        :param n: Верхняя граница (не включается)
+        :return: Случайное число
+        """
+        if n <= 0:
+            raise ValueError("Верхняя граница должна быть положительной")
+        bits = (n - 1).bit_length()
+        while True:
+            value = self.randbits(bits)
+            if value < n:
+                return value
+
+    def randbelow_many(self, n, count):
+        """
+        Список из count независимых случайных чисел из [0, n).
+
+        Байты для всех чисел берутся из источника одним запросом, а отбракованные
+        значения добираются следующими, поэтому на число приходится только
+        преобразование байтов и сравнение.
+
+        :param n: Верхняя граница (не включается)
+        :param count: Количество чисел
+        :return: Список случайных чисел
+        """
+        if n <= 0:
+            raise ValueError("Верхняя граница должна быть положительной")
+        bits = (n - 1).bit_length()
+        length = (bits + 7) // 8
+        shift = -bits % 8
+        from_bytes = int.from_bytes
+
+        result = []
+        while len(result) < count:
+            missing = count - len(result)
+            data = self.token_bytes(missing * length)
+            for pos in range(0, missing * length, length):
+                value = from_bytes(data[pos:pos + length], 'big') >> shift
+                if value < n:
+                    result.append(value)
+        return result
+
+    def randrange(self, start, stop):
+        """
+        Случайное число из [start, stop).
+
+        :param start: Нижняя граница
+        :param stop: Верхняя граница (не включается)
+        :return: Случайное число
+        """
+        return start + self.randbelow(stop - start)
+
+    def randprime(self, low, high):
+        """
+        Случайное простое число из [low, high).
+
+        От случайной точки диапазона ищется следующее простое число; если оно
+        выходит за границу, выбирается новая точка.
+
+        :param low: Нижняя граница
+        :param high: Верхняя граница (не включается)
+        :return: Простое число
+        """
+        while True:
+            prime = sympy.nextprime(self.randrange(low, high) - 1)
+            if prime < high:
+                return prime
+
+
+class BufferedRandomSource(RandomSource):
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Криптографически стойкий источник на os.urandom с буферизацией.
+
+        Буфер не копируется при сериализации и сбрасывается в дочернем процессе
+        после fork, чтобы процессы пула не получили одни и те же байты.
+
+        :param buffer_size: Размер блока, читаемого из os.urandom за один вызов
+        """
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._buffer = b''
+        self._pos = 0
+        _buffered_sources.add(self)
+
+    def _reset(self):
+        """Сброс буфера (после fork буфер родителя не должен использоваться повторно)"""
+        self._lock = threading.Lock()
+        self._buffer = b''
+        self._pos = 0
+
+    def token_bytes(self, length):
+        with self._lock:
+            end = self._pos + length
+            if end > len(self._buffer):
+                if length >= self.buffer_size:
+                    return os.urandom(length)
+                self._buffer = os.urandom(self.buffer_size)
+                self._pos, end = 0, length
+            start, self._pos = self._pos, end
+            return self._buffer[start:end]
+
+    def randbits(self, bits):
+        # То же, что RandomSource.randbits, без промежуточного вызова token_bytes:
+        # на выборе k для каждого шифруемого байта вызовы методов заметны
+        if bits <= 0:
+            return 0
+        length = (bits + 7) // 8
+        with self._lock:
+            end = self._pos + length
+            if end > len(self._buffer):
+                self._buffer = os.urandom(max(self.buffer_size, length))
+                self._pos, end = 0, length
+            start, self._pos = self._pos, end
+            chunk = self._buffer[start:end]
+        return int.from_bytes(chunk, 'big') >> (-bits % 8)
+
+    def __getstate__(self):
+        return {'buffer_size': self.buffer_size}
+
+    def __setstate__(self, state):
+        self.buffer_size = state['buffer_size']
+        self._reset()
+        _buffered_sources.add(self)
+
+
+# Буферизованные источники процесса, которые нужно сбросить в дочернем процессе после fork
+_buffered_sources = weakref.WeakSet()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: [source._reset() for source in list(_buffered_sources)])
+
+
+class DeterministicRandomSource(RandomSource):
+    def __init__(self, seed):
+        """
+        Воспроизводимый источник: SHA-256 от начального значения и счетчика блоков.
+
+        Одинаковое начальное значение дает одинаковую последовательность на любой
+        платформе. Не использовать для настоящих ключей.
+
+        :param seed: Начальное значение (число, строка или байты)
+        """
+        if isinstance(seed, int):
+            seed = seed.to_bytes((seed.bit_length() + 8) // 8, 'big', signed=True)
+        elif isinstance(seed, str):
+            seed = seed.encode('utf-8')
+        self._seed = hashlib.sha256(bytes(seed)).digest()
+        self._counter = 0
+        self._buffer = b''
+
+    def token_bytes(self, length):
+        if length > len(self._buffer):
+            # Недостающие блоки вычисляются разом, в буфере остается меньше одного блока
+            blocks = -(-(length - len(self._buffer)) // hashlib.sha256().digest_size)
+            seed, counter = self._seed, self._counter
+            self._buffer += b''.join(hashlib.sha256(seed + (counter + i).to_bytes(8, 'big')).digest()
+                                     for i in range(blocks))
+            self._counter += blocks
+        result, self._buffer = self._buffer[:length], self._buffer[length:]
+        return result
+
+
+# Источник по умолчанию, общий для всех алгоритмов процесса
+default_source = BufferedRandomSource()
@@ -0,0 +1,4 @@
+"""
+Пакет для работы с алгоритмом шифрования RSA.
+"""
+from .rsa import RSA
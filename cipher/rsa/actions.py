@@ -0,0 +1,106 @@
+"""
+Действия графического интерфейса RSA без виджетов.
+
+Обработчики кнопок RSAApplication читают поля ввода и показывают результат или ошибку,
+а сама работа выполняется функциями этого модуля. Их же вызывает cipher.profiling,
+поэтому профилируется тот же код, что выполняется по кнопке.
+"""
+import base64
+
+from cipher.binfile import is_block_file
+from cipher.rsa.rsa import PADDING_BY_MAGIC
+
+
+def encrypt_text(rsa, text):
+    """
+    Шифрование текста, двоичный шифротекст отображается в base64.
+
+    :param rsa: Объект RSA
+    :param text: Текст для шифрования
+    :return: Строка base64
+    """
+    return base64.b64encode(rsa.encrypt_string(text)).decode('ascii')
+
+
+def parse_encrypted_text(text):
+    """
+    Разбор шифротекста из текстового поля: base64 двоичного формата
+    или старый формат - по одному зашифрованному блоку-числу в строке.
+
+    :param text: Содержимое текстового поля
+    :return: Двоичный шифротекст (bytes) или список блоков
+    """
+    try:
+        encrypted = base64.b64decode(text, validate=True)
+        if encrypted[:4] in PADDING_BY_MAGIC:
+            return encrypted
+    except ValueError:
+        pass
+
+    return [int(line.strip()) for line in text.split("\n") if line.strip()]
+
+
+def decrypt_text(rsa, text):
+    """
+    Дешифрование текста из текстового поля (см. parse_encrypted_text).
+
+    :param rsa: Объект RSA
+    :param text: Содержимое текстового поля
+    :return: Расшифрованный текст
+    :raises ValueError: Если блоки не распознаны или расшифрованные данные не являются текстом
+    """
+    encrypted = parse_encrypted_text(text)
+    if not encrypted:
+        raise ValueError("Не удалось распознать зашифрованные блоки")
+
+    decrypted = rsa.decrypt_string(encrypted)
+    if isinstance(decrypted, bytes):
+        raise ValueError("Расшифрованные данные не являются текстом, используйте вкладку работы с файлами")
+    return decrypted
+
+
+def encrypt_file(rsa, input_path, output_path):
+    """
+    Потоковое шифрование файла в двоичный формат с блоками фиксированной ширины.
+
+    :param rsa: Объект RSA
+    :param input_path: Путь к исходному файлу
+    :param output_path: Путь к зашифрованному файлу
+    :return: True, если шифрование было продолжено с контрольной точки
+    """
+    return rsa.encrypt_file(input_path, output_path)
+
+
+def decrypt_file(rsa, input_path, output_path):
+    """
+    Дешифрование файла двоичного формата (через mmap) или старого текстового формата.
+
+    :param rsa: Объект RSA
+    :param input_path: Путь к зашифрованному файлу
+    :param output_path: Путь к расшифрованному файлу
+    """
+    if is_block_file(input_path, tuple(PADDING_BY_MAGIC)):
+        rsa.decrypt_file(input_path, output_path)
+    else:
+        decrypt_text_file(rsa, input_path, output_path)
+
+
+def decrypt_text_file(rsa, input_path, output_path):
+    """
+    Дешифрование файла в старом текстовом формате (по одному блоку в строке).
+
+    :param rsa: Объект RSA
+    :param input_path: Путь к зашифрованному файлу
+    :param output_path: Путь к расшифрованному файлу
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        encrypted_content = f.read()
+
+    encrypted_blocks = [int(line.strip()) for line in encrypted_content.split("\n") if line.strip()]
+
+    decrypted_content = rsa.decrypt_string(encrypted_blocks)
+    if isinstance(decrypted_content, str):
+        decrypted_content = decrypted_content.encode('utf-8')
+
+    with open(output_path, 'wb') as f:
+        f.write(decrypted_content)
@@ -0,0 +1,215 @@
+"""
+Замеры производительности RSA.
+
+Запуск из корня репозитория:
+    python -m cipher.rsa.benchmark --key-size 3072
+"""
+import argparse
+import os
+import random
+import time
+
+from cipher.benchmark import measure
+from cipher.rsa.padding import PADDINGS, RAW, make_padding
+from cipher.rsa.rsa import RSA
+
+
+def bench_multiprime_decrypt(key_size, iterations):
+    """
+    Сравнение скорости дешифрования для 2-, 3- и 4-простых модулей.
+    
+    :param key_size: Размер ключа в битах
+    :param iterations: Количество дешифрований для каждого варианта
+    """
+    print(f"Дешифрование, ключ {key_size} бит, {iterations} операций")
+    
+    baseline = None
+    for num_primes in (2, 3, 4):
+        start = time.perf_counter()
+        rsa = RSA(key_size, num_primes=num_primes)
+        keygen_time = time.perf_counter() - start
+        
+        n, _ = rsa.public_key
+        ciphertext = rsa.encrypt(random.randrange(2, n))
+        
+        decrypt_time = measure(lambda: rsa.decrypt(ciphertext), iterations)
+        if baseline is None:
+            baseline = decrypt_time
+        
+        print(f"  простых: {num_primes}  генерация: {keygen_time:8.3f} с  "
+              f"дешифрование: {decrypt_time * 1000:8.3f} мс  "
+              f"({1 / decrypt_time:8.1f} оп/с, x{baseline / decrypt_time:.2f})")
+
+
+def bench_batch_decrypt(key_size, count, workers):
+    """
+    Сравнение пакетного дешифрования с обычным циклом по RSA.decrypt.
+    
+    :param key_size: Размер ключа в битах
+    :param count: Количество шифротекстов в пакете
+    :param workers: Количество процессов для decrypt_many (None - по числу ядер)
+    """
+    print(f"Пакетное дешифрование, ключ {key_size} бит, {count} шифротекстов")
+    
+    rsa = RSA(key_size)
+    # Небольшие независимые сообщения, как в типичной нагрузке
+    ciphertexts = [rsa.encrypt(random.getrandbits(128)) for _ in range(count)]
+    
+    start = time.perf_counter()
+    expected = [rsa.decrypt(c) for c in ciphertexts]
+    loop_time = time.perf_counter() - start
+    
+    variants = [("decrypt_many, 1 процесс", 1), ("decrypt_many, пул", workers)]
+    print(f"  {'цикл decrypt':<24} {loop_time:8.3f} с  ({count / loop_time:9.1f} оп/с)")
+    for title, variant_workers in variants:
+        start = time.perf_counter()
+        result = rsa.decrypt_many(ciphertexts, workers=variant_workers)
+        batch_time = time.perf_counter() - start
+        assert result == expected
+        print(f"  {title:<24} {batch_time:8.3f} с  ({count / batch_time:9.1f} оп/с, "
+              f"x{loop_time / batch_time:.2f})")
+
+
+def bench_verify_many(key_size, count, workers):
+    """
+    Сравнение пакетной проверки подписей с обычным циклом по RSA.verify.
+    
+    :param key_size: Размер ключа в битах
+    :param count: Количество подписей в пакете
+    :param workers: Количество процессов для verify_many (None - по числу ядер)
+    """
+    print(f"Проверка подписей PSS, ключ {key_size} бит, {count} подписей")
+    
+    rsa = RSA(key_size)
+    start = time.perf_counter()
+    items = [(message, rsa.sign(message)) for message in (random.randbytes(64) for _ in range(count))]
+    sign_time = time.perf_counter() - start
+    print(f"  {'подпись (CRT)':<24} {sign_time:8.3f} с  ({count / sign_time:9.1f} оп/с)")
+    
+    start = time.perf_counter()
+    assert all(rsa.verify(message, signature) for message, signature in items)
+    loop_time = time.perf_counter() - start
+    print(f"  {'цикл verify':<24} {loop_time:8.3f} с  ({count / loop_time:9.1f} оп/с)")
+    
+    for title, variant_workers in [("verify_many, 1 процесс", 1), ("verify_many, пул", workers)]:
+        start = time.perf_counter()
+        assert all(rsa.verify_many(items, workers=variant_workers))
+        batch_time = time.perf_counter() - start
+        print(f"  {title:<24} {batch_time:8.3f} с  ({count / batch_time:9.1f} оп/с, "
+              f"x{loop_time / batch_time:.2f})")
+
+
+def bench_blinding(key_size, iterations):
+    """
+    Накладные расходы ослепления закрытой операции (дешифрование через CRT).
+    
+    Варианты замеряются поочередно несколько раз, берется лучшее время каждого,
+    чтобы разница в несколько процентов не терялась в шуме.
+    
+    :param key_size: Размер ключа в битах
+    :param iterations: Количество дешифрований в одном замере
+    """
+    print(f"Ослепление, ключ {key_size} бит, {iterations} операций")
+    
+    rsa = RSA(key_size)
+    n, _ = rsa.public_key
+    ciphertexts = [rsa.encrypt(random.randrange(2, n)) for _ in range(iterations)]
+    expected = [rsa.decrypt(c) for c in ciphertexts]
+    
+    def run():
+        it = iter(ciphertexts)
+        return measure(lambda: rsa.decrypt(next(it)), iterations)
+    
+    rsa.set_blinding(True)
+    assert [rsa.decrypt(c) for c in ciphertexts] == expected
+    
+    plain_time = blinded_time = float('inf')
+    for _ in range(5):
+        rsa.set_blinding(False)
+        plain_time = min(plain_time, run())
+        rsa.set_blinding(True)
+        blinded_time = min(blinded_time, run())
+    
+    print(f"  без ослепления: {plain_time * 1000:8.3f} мс  с ослеплением: {blinded_time * 1000:8.3f} мс  "
+          f"({(blinded_time / plain_time - 1) * 100:+.1f}%)")
+
+
+def bench_padding(key_size, size):
+    """
+    Пропускная способность encrypt_bytes/decrypt_bytes для каждой схемы дополнения
+    и доля дополнения во времени обработки одного блока.
+    
+    :param key_size: Размер ключа в битах
+    :param size: Объем открытого текста в байтах
+    """
+    print(f"Дополнение блоков, ключ {key_size} бит, {size} байтов")
+    
+    rsa = RSA(key_size)
+    data = os.urandom(size)
+    n, e = rsa.public_key
+    k = rsa.public_key.byte_length
+    
+    for padding in PADDINGS:
+        rsa.padding = padding
+        start = time.perf_counter()
+        ciphertext = rsa.encrypt_bytes(data)
+        encrypt_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        assert rsa.decrypt_bytes(ciphertext) == data
+        decrypt_time = time.perf_counter() - start
+        
+        line = (f"  {padding:9} блок {rsa.block_layout()[1]:4} Б  "
+                f"шифрование: {size / encrypt_time / 1024:8.1f} КБ/с  "
+                f"дешифрование: {size / decrypt_time / 1024:8.1f} КБ/с")
+        
+        if padding != RAW:
+            padder = make_padding(padding, k)
+            block = data[:padder.capacity]
+            encoded = padder.encode(block)
+            pad_time = measure(lambda: padder.decode(padder.encode(block)), 200)
+            modexp_time = measure(lambda: pow(encoded, e, n), 50) + measure(lambda: rsa.decrypt(encoded), 20)
+            line += f"  дополнение: {pad_time * 1e6:6.1f} мкс ({pad_time / modexp_time * 100:.1f}% от шифрования и дешифрования блока)"
+        print(line)
+    
+    rsa.padding = RAW
+
+
+BENCHMARKS = ('multiprime', 'batch', 'verify', 'blinding', 'padding')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности RSA")
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"Запускаемые замеры: {', '.join(BENCHMARKS)} (по умолчанию все)")
+    parser.add_argument('--key-size', type=int, nargs='+', default=[3072, 4096],
+                        help="Размеры ключа в битах")
+    parser.add_argument('--iterations', type=int, default=50,
+                        help="Количество операций в каждом замере")
+    parser.add_argument('--batch-size', type=int, default=2000,
+                        help="Размер пакета для пакетного дешифрования и проверки подписей")
+    parser.add_argument('--padding-bytes', type=int, default=64 * 1024,
+                        help="Объем открытого текста для замера дополнения блоков")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Количество процессов для пакетных операций")
+    args = parser.parse_args()
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"неизвестные замеры: {', '.join(unknown)}")
+    args.benchmarks = args.benchmarks or list(BENCHMARKS)
+    
+    for key_size in args.key_size:
+        if 'multiprime' in args.benchmarks:
+            bench_multiprime_decrypt(key_size, args.iterations)
+        if 'batch' in args.benchmarks:
+            bench_batch_decrypt(key_size, args.batch_size, args.workers)
+        if 'verify' in args.benchmarks:
+            bench_verify_many(key_size, args.batch_size, args.workers)
+        if 'blinding' in args.benchmarks:
+            bench_blinding(key_size, args.iterations)
+        if 'padding' in args.benchmarks:
+            bench_padding(key_size, args.padding_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Ослепление закрытой операции RSA (RFC 8017, раздел 5.1.2, примечание).
+
+Вместо C^d вычисляется (C * r^e)^d * r^(-1) = C^d mod n со случайным r, поэтому время
+возведения в степень не зависит от шифротекста, выбранного вызывающей стороной.
+Новая пара (r^e, r^(-1)) получается из предыдущей возведением обоих значений в квадрат
+(два умножения вместо возведения в степень и обращения); через каждые REFRESH_INTERVAL
+использований r выбирается заново, чтобы последовательность пар не была предсказуемой.
+"""
+import math
+import os
+import threading
+import weakref
+
+from cipher.randomness import default_source
+
+# Количество использований пары до выбора нового r
+REFRESH_INTERVAL = 32
+
+
+class Blinding:
+    def __init__(self, n, e, rng=None, refresh_interval=REFRESH_INTERVAL):
+        """
+        Источник пар ослепления для одного ключа.
+
+        Пары не сериализуются и сбрасываются в дочернем процессе после fork,
+        чтобы процессы пула не использовали одну и ту же последовательность.
+
+        :param n: Модуль
+        :param e: Открытая экспонента
+        :param rng: Источник случайных чисел (None - буферизованный os.urandom)
+        :param refresh_interval: Количество использований пары до выбора нового r
+        """
+        self.n = n
+        self.e = e
+        self.rng = rng if rng is not None else default_source
+        self.refresh_interval = refresh_interval
+        self._reset()
+        _blindings.add(self)
+
+    def _reset(self):
+        """Сброс текущей пары (следующее использование выберет новое r)"""
+        self._lock = threading.Lock()
+        self._pair = None
+        self._uses = 0
+
+    def _new_pair(self):
+        """Выбор случайного r, взаимно простого с n"""
+        n = self.n
+        while True:
+            r = self.rng.randbelow(n - 2) + 2
+            if math.gcd(r, n) == 1:
+                return pow(r, self.e, n), pow(r, -1, n)
+
+    def next_pair(self):
+        """
+        Очередная пара ослепления.
+
+        :return: Кортеж (r^e mod n, r^(-1) mod n)
+        """
+        n = self.n
+        with self._lock:
+            if self._pair is None or self._uses >= self.refresh_interval:
+                self._pair = self._new_pair()
+                self._uses = 0
+            else:
+                blind, unblind = self._pair
+                self._pair = (blind * blind % n, unblind * unblind % n)
+            self._uses += 1
+            return self._pair
+
+    def blind(self, value):
+        """
+        Ослепление значения перед закрытой операцией.
+
+        :param value: Шифротекст или закодированное сообщение
+        :return: Кортеж (value * r^e mod n, r^(-1) mod n - множитель для снятия ослепления)
+        """
+        blind, unblind = self.next_pair()
+        return value * blind % self.n, unblind
+
+    def __getstate__(self):
+        return {'n': self.n, 'e': self.e, 'rng': self.rng, 'refresh_interval': self.refresh_interval}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+        _blindings.add(self)
+
+
+# Источники пар процесса, которые нужно сбросить в дочернем процессе после fork
+_blindings = weakref.WeakSet()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: [blinding._reset() for blinding in list(_blindings)])
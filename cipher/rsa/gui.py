@@ -4,7 +4,13 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QWidget, QVB
                            QGroupBox, QFileDialog, QMessageBox, QSplitter, QStyle)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPalette, QColor
-from rsa import RSA  # Импортируем класс RSA из модуля rsa
+import os
+
+# Корень репозитория нужен в sys.path для импорта общих модулей пакета cipher
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cipher.rsa import actions
+from cipher.rsa.rsa import RSA
 
 class RSAApplication(QMainWindow):
     def __init__(self):
@@ -249,8 +255,8 @@ class RSAApplication(QMainWindow):
                 QMessageBox.warning(self, "Предупреждение", "Введите текст для шифрования!")
                 return
             
-            encrypted_blocks = self.rsa.encrypt_string(input_text)
-            result = "\n".join([str(block) for block in encrypted_blocks])
+            # Двоичный шифротекст отображается в base64
+            result = actions.encrypt_text(self.rsa, input_text)
             
             self.output_text.clear()
             self.output_text.setPlainText(result)
@@ -266,17 +272,7 @@ class RSAApplication(QMainWindow):
                 QMessageBox.warning(self, "Предупреждение", "Введите зашифрованные блоки для расшифровки!")
                 return
             
-            # Преобразуем строки в числа (блоки)
-            encrypted_blocks = []
-            for line in input_text.split("\n"):
-                if line.strip():
-                    encrypted_blocks.append(int(line.strip()))
-            
-            if not encrypted_blocks:
-                QMessageBox.warning(self, "Предупреждение", "Не удалось распознать зашифрованные блоки!")
-                return
-                
-            decrypted_text = self.rsa.decrypt_string(encrypted_blocks)
+            decrypted_text = actions.decrypt_text(self.rsa, input_text)
             
             self.output_text.clear()
             self.output_text.setPlainText(decrypted_text)
@@ -312,20 +308,14 @@ class RSAApplication(QMainWindow):
             return
         
         try:
-            # Чтение файла
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Шифрование содержимого
-            encrypted_blocks = self.rsa.encrypt_string(content)
-            encrypted_content = "\n".join([str(block) for block in encrypted_blocks])
-            
-            # Запись зашифрованных данных
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(encrypted_content)
+            # Потоковое шифрование в двоичный формат с блоками фиксированной ширины;
+            # прерванное ранее шифрование этого файла продолжается с контрольной точки
+            resumed = actions.encrypt_file(self.rsa, input_file, output_file)
             
             self.status_text.clear()
             self.status_text.setPlainText(f"Файл успешно зашифрован и сохранен в {output_file}")
+            if resumed:
+                self.status_text.append("Шифрование продолжено с контрольной точки")
             
         except Exception as e:
             self.status_text.clear()
@@ -344,22 +334,8 @@ class RSAApplication(QMainWindow):
             return
         
         try:
-            # Чтение зашифрованного файла
-            with open(input_file, 'r', encoding='utf-8') as f:
-                encrypted_content = f.read()
-            
-            # Преобразование строк в числа (блоки)
-            encrypted_blocks = []
-            for line in encrypted_content.split("\n"):
-                if line.strip():
-                    encrypted_blocks.append(int(line.strip()))
-            
-            # Расшифровка
-            decrypted_content = self.rsa.decrypt_string(encrypted_blocks)
-            
-            # Запись расшифрованных данных
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(decrypted_content)
+            # Двоичный формат дешифруется через mmap без загрузки файла в память
+            actions.decrypt_file(self.rsa, input_file, output_file)
             
             self.status_text.clear()
             self.status_text.setPlainText(f"Файл успешно расшифрован и сохранен в {output_file}")
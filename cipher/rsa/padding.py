@@ -0,0 +1,207 @@
+"""
+Дополнение блоков для шифрования RSA (RFC 8017, разделы 7.1 и 7.2).
+
+Без дополнения (RAW) блок открытого текста шифруется как число: одинаковые блоки дают
+одинаковый шифротекст. Схемы с дополнением добавляют к каждому блоку случайные байты:
+    OAEP      - EME-OAEP с SHA-256 и маской MGF1, блок до k - 2*hLen - 2 байтов;
+    PKCS1_V15 - EME-PKCS1-v1_5 (00 02 || ненулевые случайные байты || 00 || M),
+                блок до k - 11 байтов; оставлена для совместимости.
+
+Объект дополнения создается на одну часть блоков: буферы DB и маски выделяются один раз,
+а хеш зерна MGF1 копируется для каждого счетчика вместо повторного хеширования,
+поэтому дополнение остается малой долей времени возведения в степень.
+Результат encode и аргумент decode - числа, которые сразу возводятся в степень.
+"""
+import hashlib
+import hmac
+
+from cipher.randomness import default_source
+
+# Схемы дополнения
+RAW = 'raw'
+OAEP = 'oaep'
+PKCS1_V15 = 'pkcs1v15'
+PADDINGS = (RAW, OAEP, PKCS1_V15)
+
+# Хеш-функция OAEP по умолчанию
+DEFAULT_OAEP_HASH = 'sha256'
+
+# Минимальная длина случайной части PKCS#1 v1.5
+PKCS1_MIN_PADDING = 8
+
+# Одинаковое сообщение для всех ошибок разбора, чтобы не различать их по тексту
+DECODE_ERROR = "Ошибка дешифрования: некорректное дополнение блока"
+
+
+def mgf1(seed, length, hash_name=DEFAULT_OAEP_HASH):
+    """
+    Функция генерации маски MGF1 (RFC 8017, приложение B.2.1).
+
+    :param seed: Начальное значение маски
+    :param length: Длина маски в байтах
+    :param hash_name: Имя хеш-функции модуля hashlib
+    :return: Маска длиной length байтов
+    """
+    hash_func = getattr(hashlib, hash_name)
+    digest_size = hash_func().digest_size
+    blocks = -(-length // digest_size)
+    return b''.join(hash_func(seed + i.to_bytes(4, 'big')).digest() for i in range(blocks))[:length]
+
+
+class OAEPPadding:
+    def __init__(self, k, hash_name=DEFAULT_OAEP_HASH, label=b'', rng=None):
+        """
+        Дополнение EME-OAEP для модуля длиной k байтов.
+
+        :param k: Длина модуля в байтах
+        :param hash_name: Имя хеш-функции модуля hashlib
+        :param label: Метка (должна совпадать при шифровании и дешифровании)
+        :param rng: Источник случайных чисел для зерна (None - буферизованный os.urandom)
+        """
+        self._hash = getattr(hashlib, hash_name)
+        self.h_len = h_len = self._hash().digest_size
+        self.k = k
+        self.capacity = k - 2 * h_len - 2
+        if self.capacity < 1:
+            raise ValueError("Модуль слишком короткий для OAEP с этой хеш-функцией")
+        self.rng = rng if rng is not None else default_source
+
+        self._db_len = db_len = k - h_len - 1
+        self._l_hash = self._hash(label).digest()
+
+        # DB = lHash || PS || 01 || M; lHash записывается один раз
+        self._db = bytearray(db_len)
+        self._db[:h_len] = self._l_hash
+        self._zeros = bytes(db_len)
+
+        # Буфер маски и счетчики MGF1 на всю длину DB
+        blocks = -(-db_len // h_len)
+        self._mask = bytearray(blocks * h_len)
+        self._counters = [i.to_bytes(4, 'big') for i in range(blocks)]
+        self._db_mask = (1 << (8 * db_len)) - 1
+
+    def _mgf(self, seed, length):
+        """Маска MGF1 длиной length байтов в общем буфере (действительна до следующего вызова)"""
+        mask, h_len = self._mask, self.h_len
+        base = self._hash(seed)
+        pos = 0
+        for counter in self._counters[:-(-length // h_len)]:
+            digest = base.copy()
+            digest.update(counter)
+            mask[pos:pos + h_len] = digest.digest()
+            pos += h_len
+        return int.from_bytes(memoryview(mask)[:length], 'big')
+
+    def encode(self, message):
+        """
+        Дополнение блока.
+
+        :param message: Байты блока (не длиннее capacity)
+        :return: Число EM = 00 || maskedSeed || maskedDB
+        """
+        m_len = len(message)
+        if m_len > self.capacity:
+            raise ValueError(f"Блок слишком длинный для OAEP: не более {self.capacity} байтов")
+
+        db, h_len, db_len = self._db, self.h_len, self._db_len
+        start = db_len - m_len
+        db[h_len:start - 1] = self._zeros[:start - 1 - h_len]
+        db[start - 1] = 1
+        db[start:] = message
+
+        seed = self.rng.token_bytes(h_len)
+        masked_db = int.from_bytes(db, 'big') ^ self._mgf(seed, db_len)
+        masked_seed = int.from_bytes(seed, 'big') ^ self._mgf(masked_db.to_bytes(db_len, 'big'), h_len)
+        return (masked_seed << (8 * db_len)) | masked_db
+
+    def decode(self, value):
+        """
+        Снятие дополнения.
+
+        :param value: Расшифрованное число EM
+        :return: Байты блока
+        :raises ValueError: Если дополнение некорректно
+        """
+        h_len, db_len = self.h_len, self._db_len
+        if value >> (8 * (self.k - 1)):
+            raise ValueError(DECODE_ERROR)
+
+        masked_db = value & self._db_mask
+        masked_seed = value >> (8 * db_len)
+        seed = masked_seed ^ self._mgf(masked_db.to_bytes(db_len, 'big'), h_len)
+        db = (masked_db ^ self._mgf(seed.to_bytes(h_len, 'big'), db_len)).to_bytes(db_len, 'big')
+
+        # Все проверки выполняются до принятия решения, ошибка одна для любых причин
+        rest = db[h_len:].lstrip(b'\x00')
+        valid = hmac.compare_digest(db[:h_len], self._l_hash)
+        if not (valid and rest[:1] == b'\x01'):
+            raise ValueError(DECODE_ERROR)
+        return rest[1:]
+
+
+class PKCS1v15Padding:
+    def __init__(self, k, rng=None):
+        """
+        Дополнение EME-PKCS1-v1_5 для модуля длиной k байтов.
+
+        :param k: Длина модуля в байтах
+        :param rng: Источник ненулевых случайных байтов (None - буферизованный os.urandom)
+        """
+        self.k = k
+        self.capacity = k - 3 - PKCS1_MIN_PADDING
+        if self.capacity < 1:
+            raise ValueError("Модуль слишком короткий для PKCS#1 v1.5")
+        self.rng = rng if rng is not None else default_source
+        self._prefix = 2 << (8 * (k - 2))
+
+    def _nonzero_bytes(self, length):
+        """Случайные байты без нулей: нулевые байты отбрасываются и добираются заново"""
+        data = self.rng.token_bytes(length).replace(b'\x00', b'')
+        while len(data) < length:
+            data += self.rng.token_bytes(length - len(data)).replace(b'\x00', b'')
+        return data
+
+    def encode(self, message):
+        """
+        Дополнение блока.
+
+        :param message: Байты блока (не длиннее capacity)
+        :return: Число EM = 00 || 02 || PS || 00 || M
+        """
+        m_len = len(message)
+        if m_len > self.capacity:
+            raise ValueError(f"Блок слишком длинный для PKCS#1 v1.5: не более {self.capacity} байтов")
+        ps = self._nonzero_bytes(self.k - 3 - m_len)
+        return self._prefix | (int.from_bytes(ps, 'big') << (8 * (m_len + 1))) | int.from_bytes(message, 'big')
+
+    def decode(self, value):
+        """
+        Снятие дополнения.
+
+        :param value: Расшифрованное число EM
+        :return: Байты блока
+        :raises ValueError: Если дополнение некорректно
+        """
+        if value >> (8 * (self.k - 2)) != 2:
+            raise ValueError(DECODE_ERROR)
+        em = value.to_bytes(self.k, 'big')
+        separator = em.find(0, 2)
+        if separator < 2 + PKCS1_MIN_PADDING:
+            raise ValueError(DECODE_ERROR)
+        return em[separator + 1:]
+
+
+def make_padding(scheme, k, rng=None):
+    """
+    Объект дополнения для схемы.
+
+    :param scheme: Схема дополнения (OAEP или PKCS1_V15)
+    :param k: Длина модуля в байтах
+    :param rng: Источник случайных чисел (None - буферизованный os.urandom)
+    :return: Объект OAEPPadding или PKCS1v15Padding
+    """
+    if scheme == OAEP:
+        return OAEPPadding(k, rng=rng)
+    if scheme == PKCS1_V15:
+        return PKCS1v15Padding(k, rng=rng)
+    raise ValueError(f"Неизвестная схема дополнения: {scheme}")
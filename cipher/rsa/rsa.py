@@ -1,58 +1,325 @@
 """
 Реализация алгоритма RSA для шифрования и дешифрования.
 """
-import random
-import sympy
+import functools
+import hashlib
+import json
 import math
 
+from cipher.binfile import (BlockCiphertext, BlockFileReader, BlockFileWriter, BlockStreamReader,
+                            iter_records, pack_header, parse_header, record_count)
+from cipher.checkpoint import encrypt_blocks_resumable, key_fingerprint
+from cipher.interface import BLINDING, ENCRYPT, RANDOM_ACCESS, RESUMABLE, SIGN, CipherAlgorithm
+from cipher.keys import RSAPrivateKey, RSAPublicKey
+from cipher.parallel import map_chunks
+from cipher.randomness import default_source
+from cipher.rsa.blinding import Blinding
+from cipher.rsa.padding import DECODE_ERROR, OAEP, PADDINGS, RAW, make_padding
+from cipher.rsa.signature import (DEFAULT_HASH, PKCS1_V15, PSS, SCHEMES, pkcs1_v15_encode, pss_encode,
+                                  verify_encoded)
 
-class RSA:
-    def __init__(self, key_size=1024):
+
+# Открытая экспонента по умолчанию
+# Обычно используется 65537 (0x10001), так как это простое число и имеет форму 2^k+1
+DEFAULT_PUBLIC_EXPONENT = 65537
+
+# Минимальный размер одного простого множителя модуля в битах
+MIN_PRIME_SIZE = 64
+
+# Сигнатура двоичного файла с шифротекстом RSA без дополнения
+FILE_MAGIC = b'RSAB'
+
+# Сигнатуры двоичного формата для каждой схемы дополнения блоков (см. cipher.rsa.padding)
+FILE_MAGICS = {RAW: FILE_MAGIC, OAEP: b'RSAO', PKCS1_V15: b'RSAP'}
+PADDING_BY_MAGIC = {magic: padding for padding, magic in FILE_MAGICS.items()}
+
+# Количество блоков, обрабатываемых за один проход при работе с файлами
+FILE_CHUNK_BLOCKS = 1024
+
+
+class RSA(CipherAlgorithm):
+    name = 'rsa'
+    capabilities = frozenset({ENCRYPT, SIGN, RESUMABLE, RANDOM_ACCESS, BLINDING})
+    
+    def __init__(self, key_size=1024, num_primes=2, blinding=False, padding=RAW, rng=None):
         """
         Инициализация RSA алгоритма.
         
         :param key_size: Размер ключа в битах
+        :param num_primes: Количество простых множителей модуля (2 - классический RSA,
+                           3-4 - multi-prime RSA по RFC 8017)
+        :param blinding: Ослеплять закрытую операцию собственного ключа (см. set_blinding)
+        :param padding: Дополнение блоков при шифровании байтов: 'raw' (без дополнения),
+                        'oaep' (OAEP с SHA-256) или 'pkcs1v15'. Дешифрование определяет
+                        схему по сигнатуре шифротекста.
+        :param rng: Источник случайных чисел для простых множителей и ослепления
+                    (None - буферизованный os.urandom, см. cipher.randomness)
         """
+        if num_primes < 2:
+            raise ValueError("Модуль RSA должен состоять как минимум из двух простых множителей")
+        if key_size // num_primes < MIN_PRIME_SIZE:
+            raise ValueError(f"Слишком много простых множителей для ключа размером {key_size} бит")
+        
+        self.num_primes = num_primes
+        self.padding = _check_padding(padding)
+        self.rng = rng if rng is not None else default_source
+        
         # Генерация ключевой пары
-        self.public_key, self.private_key = self._generate_keypair(key_size)
+        self.public_key, self.private_key, primes = self._generate_keypair(key_size)
+        
+        # Параметры для ускоренного дешифрования по китайской теореме об остатках
+        self._init_crt(primes)
+        
+        self.blinding = None
+        self.set_blinding(blinding)
+        
+    @classmethod
+    def keygen(cls, key_size=1024, **options):
+        """
+        Создание объекта RSA с новым ключом (общий интерфейс CipherAlgorithm).
         
+        :param key_size: Размер ключа в битах
+        :param options: num_primes, blinding, padding, rng (см. __init__)
+        :return: Объект RSA
+        """
+        return cls(key_size, **options)
+    
     def _generate_keypair(self, key_size):
         """
         Генерация ключевой пары RSA.
         
         :param key_size: Размер ключа
-        :return: Кортеж (открытый ключ, закрытый ключ)
+        :return: Кортеж (открытый ключ, закрытый ключ, список простых множителей)
         """
-        # Размер каждого простого числа должен быть примерно половиной от общего размера ключа
-        prime_size = key_size // 2
-        
-        # Генерация двух больших простых чисел p и q
-        p = sympy.randprime(2**(prime_size-1), 2**prime_size)
-        q = sympy.randprime(2**(prime_size-1), 2**prime_size)
+        e = DEFAULT_PUBLIC_EXPONENT
         
-        # Вычисление модуля n
-        n = p * q
+        # Размер каждого простого числа - доля от общего размера ключа,
+        # остаток битов распределяется по первым множителям
+        prime_size, remainder = divmod(key_size, self.num_primes)
+        sizes = [prime_size + 1 if i < remainder else prime_size for i in range(self.num_primes)]
         
-        # Вычисление функции Эйлера φ(n) = (p-1)*(q-1)
-        phi = (p - 1) * (q - 1)
-        
-        # Выбор открытой экспоненты e
-        # Обычно используется 65537 (0x10001), так как это простое число и имеет форму 2^k+1
-        e = 65537
+        # Генерация различных простых чисел r_1, ..., r_k с двумя старшими битами,
+        # равными 1: для двух множителей это гарантирует ровно key_size бит модуля,
+        # для трех и более набор генерируется заново, пока модуль не наберет key_size бит
+        # Числа, для которых e не взаимно просто с r_i - 1, отбрасываются
+        while True:
+            primes = []
+            for size in sizes:
+                while True:
+                    r = self.rng.randprime(3 << (size - 2), 1 << size)
+                    if r not in primes and math.gcd(e, r - 1) == 1:
+                        break
+                primes.append(r)
+            
+            # Вычисление модуля n
+            n = math.prod(primes)
+            if n.bit_length() == key_size:
+                break
         
-        # Убедимся, что e взаимно просто с phi
-        if math.gcd(e, phi) != 1:
-            raise ValueError("Выбранная открытая экспонента не подходит")
+        # Вычисление функции Эйлера φ(n) = (r_1-1)*...*(r_k-1)
+        phi = math.prod(r - 1 for r in primes)
         
         # Вычисление закрытой экспоненты d (мультипликативно обратное e по модулю phi)
         d = pow(e, -1, phi)
         
         # Открытый ключ: пара (n, e)
-        public_key = (n, e)
+        public_key = RSAPublicKey(n, e)
         # Закрытый ключ: пара (n, d)
-        private_key = (n, d)
+        private_key = RSAPrivateKey(n, d)
+        
+        return public_key, private_key, primes
+    
+    def _init_crt(self, primes):
+        """
+        Предвычисление параметров китайской теоремы об остатках (RFC 8017, раздел 3.2).
+        
+        Для каждого множителя r_i хранится экспонента d_i = d mod (r_i - 1), а для i > 1 -
+        коэффициент t_i = (r_1 * ... * r_(i-1))^(-1) mod r_i для восстановления по Гарнеру.
+        
+        :param primes: Список простых множителей модуля
+        """
+        _, d = self.private_key
+        
+        self.primes = list(primes)
+        self.exponents = [d % (r - 1) for r in self.primes]
+        
+        self.coefficients = []
+        product = self.primes[0]
+        for r in self.primes[1:]:
+            self.coefficients.append(pow(product, -1, r))
+            product *= r
+    
+    def _decrypt_crt(self, ciphertext):
+        """
+        Дешифрование собственным закрытым ключом по китайской теореме об остатках.
+        
+        Вместо одного возведения в степень по модулю n выполняется k возведений
+        по модулям r_i, которые в k раз короче, после чего результат собирается по Гарнеру.
+        
+        :param ciphertext: Зашифрованное сообщение
+        :return: Расшифрованное сообщение
+        """
+        primes = self.primes
+        exponents = self.exponents
+        
+        blinding = self.blinding
+        if blinding is not None:
+            ciphertext, unblind = blinding.blind(ciphertext)
+        
+        # m = m_1 mod r_1
+        plaintext = pow(ciphertext, exponents[0], primes[0])
+        product = primes[0]
+        for r, d_i, t_i in zip(primes[1:], exponents[1:], self.coefficients):
+            # m_i = C^(d_i) mod r_i
+            m_i = pow(ciphertext, d_i, r)
+            # h = (m_i - m) * t_i mod r_i, m = m + R * h
+            h = (m_i - plaintext) * t_i % r
+            plaintext += product * h
+            product *= r
+        
+        if blinding is not None:
+            plaintext = plaintext * unblind % product
+        
+        return plaintext
+    
+    def set_blinding(self, enabled=True):
+        """
+        Включение или выключение ослепления закрытой операции собственного ключа
+        (decrypt, decrypt_many, sign и дешифрование блоков) для недоверенных вызывающих сторон.
         
-        return public_key, private_key
+        Шифротекст умножается на r^e, а результат - на r^(-1); пара (r^e, r^(-1)) кэшируется
+        и между вызовами возводится в квадрат, так что ослепление стоит четырех умножений
+        по модулю n на операцию (см. cipher.rsa.blinding).
+        
+        :param enabled: Включить ослепление
+        """
+        if not enabled:
+            self.blinding = None
+        elif self.blinding is None:
+            n, e = self.public_key
+            self.blinding = Blinding(n, e, self.rng)
+    
+    def to_dict(self, include_private=True):
+        """
+        Сериализация ключей в словарь (например, для сохранения в JSON).
+        
+        Поля закрытого ключа повторяют структуру RSAPrivateKey из RFC 8017:
+        модуль, экспоненты, простые множители, CRT-экспоненты и коэффициенты.
+        
+        :param include_private: Включать ли закрытую часть ключа
+        :return: Словарь с параметрами ключа
+        """
+        n, e = self.public_key
+        data = {'n': n, 'e': e}
+        
+        if include_private:
+            _, d = self.private_key
+            data.update({
+                'd': d,
+                'primes': list(self.primes),
+                'exponents': list(self.exponents),
+                'coefficients': list(self.coefficients),
+            })
+        
+        return data
+    
+    @classmethod
+    def from_dict(cls, data, blinding=False, padding=RAW):
+        """
+        Восстановление объекта RSA из словаря, полученного через to_dict.
+        
+        CRT-параметры пересчитываются по простым множителям, а не берутся из словаря.
+        Если e*d != 1 (mod λ(n)), закрытая экспонента d вычисляется заново по множителям.
+        
+        :param data: Словарь с параметрами ключа (должен содержать закрытую часть)
+        :param blinding: Ослеплять закрытую операцию (см. set_blinding)
+        :param padding: Дополнение блоков при шифровании байтов
+        :return: Объект RSA
+        :raises ValueError: Если множители не дают модуль n или e не обратима по модулю λ(n)
+        """
+        n, e, d = data['n'], data['e'], data['d']
+        primes = data['primes']
+        
+        if len(primes) < 2 or math.prod(primes) != n:
+            raise ValueError("Простые множители не соответствуют модулю ключа")
+        
+        # Функция Кармайкла λ(n) = НОК(r_1-1, ..., r_k-1)
+        lam = math.lcm(*(r - 1 for r in primes))
+        if e * d % lam != 1:
+            if math.gcd(e, lam) != 1:
+                raise ValueError("Открытая экспонента не обратима по модулю λ(n)")
+            d = pow(e, -1, lam)
+        
+        rsa = cls.__new__(cls)
+        rsa.num_primes = len(primes)
+        rsa.padding = _check_padding(padding)
+        rsa.rng = default_source
+        rsa.public_key = RSAPublicKey(n, e)
+        rsa.private_key = RSAPrivateKey(n, d)
+        rsa._init_crt(primes)
+        rsa.blinding = None
+        rsa.set_blinding(blinding)
+        
+        return rsa
+    
+    def save(self, path):
+        """
+        Сохранение ключей в JSON-файл.
+        
+        :param path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    @classmethod
+    def load(cls, path, blinding=False, padding=RAW):
+        """
+        Загрузка ключей из JSON-файла, сохраненного через save.
+        
+        :param path: Путь к файлу
+        :param blinding: Ослеплять закрытую операцию (см. set_blinding)
+        :param padding: Дополнение блоков при шифровании байтов
+        :return: Объект RSA
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), blinding, padding)
+    
+    def key_context(self, public_key=None):
+        """
+        Открытый ключ с производными значениями (длина модуля, размер блока,
+        ширина записи, отпечаток), вычисленными один раз при создании ключа.
+        
+        :param public_key: Открытый ключ (RSAPublicKey или пара (n, e)).
+                           Если None, используется собственный открытый ключ.
+        :return: Объект RSAPublicKey
+        """
+        if public_key is None:
+            return self.public_key
+        return RSAPublicKey.coerce(public_key)
+    
+    def private_key_context(self, private_key=None):
+        """
+        Закрытый ключ с производными значениями (см. key_context).
+        
+        :param private_key: Закрытый ключ (RSAPrivateKey или пара (n, d)).
+                            Если None, используется собственный закрытый ключ.
+        :return: Объект RSAPrivateKey
+        """
+        if private_key is None:
+            return self.private_key
+        return RSAPrivateKey.coerce(private_key)
+    
+    def block_layout(self, public_key=None):
+        """
+        Параметры двоичного формата для шифрования байтов с текущей схемой дополнения.
+        
+        :param public_key: Открытый ключ. Если None, используется собственный открытый ключ.
+        :return: Кортеж (сигнатура формата, размер блока открытого текста)
+        """
+        public_key = self.key_context(public_key)
+        if self.padding == RAW:
+            return FILE_MAGIC, public_key.block_size
+        return FILE_MAGICS[self.padding], make_padding(self.padding, public_key.byte_length).capacity
     
     def encrypt(self, plaintext, public_key=None):
         """
@@ -83,8 +350,9 @@ class RSA:
         :param private_key: Закрытый ключ для дешифрования. Если None, используется собственный закрытый ключ.
         :return: Расшифрованное сообщение
         """
-        if private_key is None:
-            private_key = self.private_key
+        if private_key is None or private_key == self.private_key:
+            # Собственный ключ: используем быстрый путь через CRT
+            return self._decrypt_crt(ciphertext)
         
         n, d = private_key
         
@@ -92,65 +360,494 @@ class RSA:
         plaintext = pow(ciphertext, d, n)
         return plaintext
     
+    def decrypt_many(self, ciphertexts, private_key=None, workers=None):
+        """
+        Пакетное дешифрование списка шифротекстов одним ключом.
+        
+        Параметры ключа извлекаются один раз на пакет, для собственного ключа каждый
+        блок расшифровывается через CRT. Большие пакеты распределяются по пулу процессов.
+        
+        :param ciphertexts: Список зашифрованных сообщений
+        :param private_key: Закрытый ключ. Если None, используется собственный закрытый ключ.
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Список расшифрованных сообщений в том же порядке
+        """
+        if private_key is None or private_key == self.private_key:
+            func = self._decrypt_batch_crt
+        else:
+            func = functools.partial(_decrypt_batch, private_key)
+        
+        return map_chunks(func, ciphertexts, workers)
+    
+    def _decrypt_batch_crt(self, ciphertexts):
+        """
+        Дешифрование части пакета собственным ключом через CRT.
+        
+        :param ciphertexts: Список зашифрованных сообщений
+        :return: Список расшифрованных сообщений
+        """
+        primes = self.primes
+        exponents = self.exponents
+        r_1, d_1 = primes[0], exponents[0]
+        rest = list(zip(primes[1:], exponents[1:], self.coefficients))
+        blinding = self.blinding
+        
+        result = []
+        for ciphertext in ciphertexts:
+            if blinding is not None:
+                ciphertext, unblind = blinding.blind(ciphertext)
+            plaintext = pow(ciphertext, d_1, r_1)
+            product = r_1
+            for r, d_i, t_i in rest:
+                plaintext += product * ((pow(ciphertext, d_i, r) - plaintext) * t_i % r)
+                product *= r
+            if blinding is not None:
+                plaintext = plaintext * unblind % product
+            result.append(plaintext)
+        
+        return result
+    
+    def sign(self, message, scheme=PSS, hash_name=DEFAULT_HASH):
+        """
+        Подпись сообщения собственным закрытым ключом (хеширование и кодирование
+        по RFC 8017, затем возведение в степень d через CRT).
+        
+        Перед выдачей подпись проверяется открытой экспонентой: сбой в одной
+        из ветвей CRT иначе позволил бы разложить модуль по одной неверной подписи.
+        
+        :param message: Подписываемое сообщение (байты или строка UTF-8)
+        :param scheme: Схема подписи: 'pss' (по умолчанию) или 'pkcs1v15'
+        :param hash_name: Имя хеш-функции ('sha256', 'sha384', 'sha512')
+        :return: Подпись - байты длиной с модуль
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        
+        key = self.public_key
+        if scheme == PKCS1_V15:
+            encoded = pkcs1_v15_encode(message, key.byte_length, hash_name)
+        elif scheme == PSS:
+            salt = default_source.token_bytes(hashlib.new(hash_name).digest_size)
+            encoded = pss_encode(message, key.bit_length - 1, salt, hash_name)
+        else:
+            raise ValueError(f"Неизвестная схема подписи: {scheme}")
+        
+        m = int.from_bytes(encoded, 'big')
+        signature = self._decrypt_crt(m)
+        if pow(signature, key.e, key.n) != m:
+            raise RuntimeError("Ошибка при вычислении подписи")
+        
+        return signature.to_bytes(key.byte_length, 'big')
+    
+    def verify(self, message, signature, public_key=None, scheme=PSS, hash_name=DEFAULT_HASH):
+        """
+        Проверка подписи.
+        
+        :param message: Сообщение (байты или строка UTF-8)
+        :param signature: Подпись, полученная через sign
+        :param public_key: Открытый ключ подписавшего. Если None, используется собственный.
+        :param scheme: Схема подписи: 'pss' или 'pkcs1v15'
+        :param hash_name: Имя хеш-функции
+        :return: True, если подпись верна
+        """
+        public_key = self.key_context(public_key)
+        return _verify_batch(public_key, scheme, hash_name, [(message, signature)])[0]
+    
+    def verify_many(self, items, public_key=None, scheme=PSS, hash_name=DEFAULT_HASH, workers=None):
+        """
+        Пакетная проверка подписей одним открытым ключом.
+        
+        Проверка - одно возведение в степень e = 65537 (17 умножений) и хеширование,
+        поэтому большие пакеты распределяются по пулу процессов.
+        
+        :param items: Список пар (сообщение, подпись)
+        :param public_key: Открытый ключ подписавшего. Если None, используется собственный.
+        :param scheme: Схема подписи: 'pss' или 'pkcs1v15'
+        :param hash_name: Имя хеш-функции
+        :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        :return: Список результатов проверки (True/False) в том же порядке
+        """
+        public_key = self.key_context(public_key)
+        func = functools.partial(_verify_batch, public_key, scheme, hash_name)
+        return map_chunks(func, items, workers)
+    
     def encrypt_string(self, text, public_key=None):
         """
-        Шифрование текстовой строки по блокам.
+        Шифрование текстовой строки (обертка над encrypt_bytes).
         
         :param text: Текст для шифрования
         :param public_key: Открытый ключ
-        :return: Список зашифрованных блоков
+        :return: Шифротекст в виде bytes
         """
-        if public_key is None:
-            public_key = self.public_key
+        return self.encrypt_bytes(text.encode('utf-8'), public_key)
+    
+    def decrypt_string(self, encrypted_data, private_key=None):
+        """
+        Дешифрование строки (обертка над decrypt_bytes).
+        
+        Для совместимости принимается и старый формат - список зашифрованных блоков-чисел.
+        
+        :param encrypted_data: Шифротекст в виде bytes или список зашифрованных блоков
+        :param private_key: Закрытый ключ
+        :return: Расшифрованный текст (или байты, если они не являются текстом UTF-8)
+        """
+        if isinstance(encrypted_data, (bytes, bytearray, memoryview)):
+            decrypted_bytes = self.decrypt_bytes(encrypted_data, private_key)
+        else:
+            decrypted_bytes = self._decrypt_blocks(encrypted_data, private_key)
+        
+        # Преобразуем байты в строку
+        try:
+            return decrypted_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            # Если не удалось декодировать, вернем байты
+            return bytes(decrypted_bytes)
+    
+    def _decrypt_blocks(self, encrypted_blocks, private_key=None):
+        """
+        Дешифрование списка зашифрованных блоков-чисел (старый формат шифротекста).
+        
+        Все блоки, кроме последнего, имеют полный размер и восстанавливаются вместе
+        с ведущими нулевыми байтами. Длина последнего блока в списке чисел не хранится,
+        поэтому его ведущие нулевые байты теряются.
+        
+        :param encrypted_blocks: Список зашифрованных блоков
+        :param private_key: Закрытый ключ
+        :return: bytearray с открытым текстом
+        """
+        private_key = self.private_key_context(private_key)
         
-        n, _ = public_key
+        # Размер блока открытого текста, как при шифровании
+        block_size = private_key.block_size
         
-        # Определим размер блока в байтах (с запасом для безопасности)
-        block_size = (n.bit_length() - 1) // 8
+        blocks = self.decrypt_many(encrypted_blocks, private_key)
+        if not blocks:
+            return bytearray()
         
-        # Кодируем текст в байты
-        text_bytes = text.encode('utf-8')
+        # Буфер под результат выделяется один раз по количеству блоков
+        last = blocks.pop()
+        last_bytes = last.to_bytes((last.bit_length() + 7) // 8, 'big')
+        decrypted_bytes = bytearray(block_size * len(blocks) + len(last_bytes))
         
-        # Разбиваем на блоки и шифруем каждый блок
-        encrypted_blocks = []
-        for i in range(0, len(text_bytes), block_size):
-            block = text_bytes[i:i + block_size]
-            block_int = int.from_bytes(block, byteorder='big')
-            encrypted_block = self.encrypt(block_int, public_key)
-            encrypted_blocks.append(encrypted_block)
+        pos = 0
+        for block in blocks:
+            decrypted_bytes[pos:pos + block_size] = block.to_bytes(block_size, 'big')
+            pos += block_size
+        decrypted_bytes[pos:] = last_bytes
         
-        return encrypted_blocks
+        return decrypted_bytes
     
-    def decrypt_string(self, encrypted_blocks, private_key=None):
+    def encrypt_bytes(self, data, public_key=None):
         """
-        Дешифрование списка зашифрованных блоков в строку.
+        Шифрование произвольных байтов.
         
-        :param encrypted_blocks: Список зашифрованных блоков
+        Результат записан в том же двоичном формате, что и файлы (см. cipher.binfile):
+        заголовок с длиной открытого текста и блоки фиксированной ширины.
+        
+        :param data: Байты для шифрования
+        :param public_key: Открытый ключ
+        :return: Шифротекст в виде bytes
+        """
+        public_key = self.key_context(public_key)
+        magic, block_size = self.block_layout(public_key)
+        
+        header = pack_header(magic, public_key.byte_length, block_size, len(data))
+        return header + self._encrypt_records(data, public_key)
+    
+    def encrypt_blocks(self, data, public_key=None):
+        """
+        Шифрование байтов в компактный контейнер записей фиксированной ширины.
+        
+        :param data: Байты для шифрования
+        :param public_key: Открытый ключ
+        :return: Объект BlockCiphertext
+        """
+        return BlockCiphertext(self.encrypt_bytes(data, public_key), tuple(PADDING_BY_MAGIC))
+    
+    def decrypt_bytes(self, data, private_key=None):
+        """
+        Дешифрование байтов, полученных через encrypt_bytes (или содержимого файла).
+        
+        Двоичные данные восстанавливаются точно, включая ведущие нулевые байты.
+        
+        :param data: Шифротекст в виде bytes или BlockCiphertext
         :param private_key: Закрытый ключ
-        :return: Расшифрованный текст
+        :return: Расшифрованные байты
         """
-        if private_key is None:
-            private_key = self.private_key
+        private_key = self.private_key_context(private_key)
+        if isinstance(data, BlockCiphertext):
+            data = data.buffer
+        
+        width, block_size, plaintext_length, count = parse_header(data, tuple(PADDING_BY_MAGIC))
+        if width != private_key.byte_length:
+            raise ValueError("Данные зашифрованы ключом другого размера")
+        
+        records = iter_records(data, width, 0, count)
+        return bytes(self._decrypt_records(records, 0, block_size, plaintext_length, private_key,
+                                           PADDING_BY_MAGIC[bytes(data[:4])]))
+    
+    def encrypt_file(self, input_path, output_path, public_key=None):
+        """
+        Шифрование файла в двоичный формат с блоками фиксированной ширины.
+        
+        Шифротекст пишется частями, после каждой части сохраняется контрольная точка
+        (output_path + .ckpt). Если шифрование было прервано, повторный вызов с тем же
+        ключом продолжает его с последней сохраненной части.
+        
+        :param input_path: Путь к исходному файлу (читается в двоичном режиме)
+        :param output_path: Путь к зашифрованному файлу
+        :param public_key: Открытый ключ
+        :return: True, если шифрование было продолжено с контрольной точки
+        """
+        public_key = self.key_context(public_key)
+        magic, block_size = self.block_layout(public_key)
+        # Контрольная точка другой схемы дополнения не должна подойти к этому шифрованию
+        fingerprint = public_key.fingerprint
+        if self.padding != RAW:
+            fingerprint = key_fingerprint(fingerprint, self.padding)
+        
+        return encrypt_blocks_resumable(
+            input_path, output_path, magic, public_key.byte_length, block_size,
+            block_size * FILE_CHUNK_BLOCKS,
+            lambda data: self._encrypt_records(data, public_key),
+            fingerprint)
+    
+    def encrypt_stream(self, src, dst, public_key=None):
+        """
+        Потоковое шифрование из одного двоичного файлового объекта в другой.
+        
+        Данные читаются и шифруются частями, поэтому объем памяти не зависит от их размера.
+        
+        :param src: Двоичный файловый объект с открытым текстом
+        :param dst: Двоичный файловый объект для шифротекста (должен поддерживать seek)
+        :param public_key: Открытый ключ
+        """
+        public_key = self.key_context(public_key)
+        magic, block_size = self.block_layout(public_key)
+        width = public_key.byte_length
+        
+        with BlockFileWriter(dst, magic, width, block_size) as writer:
+            while True:
+                data = src.read(block_size * FILE_CHUNK_BLOCKS)
+                if not data:
+                    break
+                writer.write(self._encrypt_records(data, public_key), len(data))
+    
+    def decrypt_stream(self, src, dst, private_key=None):
+        """
+        Потоковое дешифрование из одного двоичного файлового объекта в другой.
         
-        n, _ = private_key
+        Для файлов на диске быстрее decrypt_file, который читает шифротекст через mmap.
         
-        # Определим размер блока в байтах
-        block_size = (n.bit_length() + 7) // 8
+        :param src: Двоичный файловый объект с шифротекстом
+        :param dst: Двоичный файловый объект для открытого текста
+        :param private_key: Закрытый ключ
+        """
+        private_key = self.private_key_context(private_key)
+        
+        reader = BlockStreamReader(src, tuple(PADDING_BY_MAGIC))
+        width = reader.record_width
+        if width != private_key.byte_length:
+            raise ValueError("Данные зашифрованы ключом другого размера")
+        
+        start = 0
+        for chunk in reader.chunks(FILE_CHUNK_BLOCKS):
+            count = len(chunk) // width
+            records = iter_records(chunk, width, 0, count, offset=0)
+            dst.write(self._decrypt_records(records, start, reader.block_size,
+                                            reader.plaintext_length, private_key,
+                                            PADDING_BY_MAGIC[reader.magic]))
+            start += count
+    
+    def decrypt_file(self, input_path, output_path, private_key=None):
+        """
+        Дешифрование файла в двоичном формате через mmap.
+        
+        Блоки читаются срезами memoryview прямо из отображенного в память файла
+        и расшифровываются частями, результат пишется через буферизованный поток,
+        поэтому промежуточные строки и списки размером с файл не создаются.
+        
+        :param input_path: Путь к зашифрованному файлу
+        :param output_path: Путь к расшифрованному файлу
+        :param private_key: Закрытый ключ
+        """
+        private_key = self.private_key_context(private_key)
+        
+        with BlockFileReader(input_path, tuple(PADDING_BY_MAGIC)) as reader, open(output_path, 'wb') as dst:
+            if reader.record_width != private_key.byte_length:
+                raise ValueError("Файл зашифрован ключом другого размера")
+            
+            for start in range(0, reader.record_count, FILE_CHUNK_BLOCKS):
+                records = reader.records(start, start + FILE_CHUNK_BLOCKS)
+                dst.write(self._decrypt_records(records, start, reader.block_size,
+                                                reader.plaintext_length, private_key,
+                                                PADDING_BY_MAGIC[reader.magic]))
+    
+    def read_range(self, input_path, offset, length, private_key=None):
+        """
+        Чтение диапазона байтов открытого текста из зашифрованного файла.
         
-        # Расшифровываем блоки и собираем байты
-        decrypted_bytes = bytearray()
-        for block in encrypted_blocks:
-            decrypted_block = self.decrypt(block, private_key)
+        Блоки в файле имеют фиксированную ширину, а блок i открытого текста начинается
+        со смещения i * block_size, поэтому номера нужных блоков вычисляются по заголовку
+        и расшифровываются только они: стоимость пропорциональна длине диапазона.
+        
+        :param input_path: Путь к зашифрованному файлу
+        :param offset: Смещение начала диапазона в открытом тексте
+        :param length: Длина диапазона в байтах
+        :param private_key: Закрытый ключ
+        :return: Байты открытого текста (короче length, если диапазон выходит за конец файла)
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("Смещение и длина диапазона не могут быть отрицательными")
+        
+        private_key = self.private_key_context(private_key)
+        
+        with BlockFileReader(input_path, tuple(PADDING_BY_MAGIC)) as reader:
+            if reader.record_width != private_key.byte_length:
+                raise ValueError("Файл зашифрован ключом другого размера")
             
-            # Преобразуем число обратно в байты
-            # Длина каждого блока может быть разной, поэтому не указываем фиксированную длину
-            block_bytes = decrypted_block.to_bytes((decrypted_block.bit_length() + 7) // 8, byteorder='big')
+            end = min(offset + length, reader.plaintext_length)
+            if offset >= end:
+                return b''
             
-            decrypted_bytes.extend(block_bytes)
+            block_size = reader.block_size
+            start = offset // block_size
+            stop = -(-end // block_size)
+            data = self._decrypt_records(reader.records(start, stop), start, block_size,
+                                         reader.plaintext_length, private_key,
+                                         PADDING_BY_MAGIC[reader.magic])
         
-        # Преобразуем байты в строку
-        try:
-            return decrypted_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            # Если не удалось декодировать, вернем байты
-            return decrypted_bytes
+        skip = offset - start * block_size
+        return bytes(data[skip:skip + end - offset])
+    
+    def _encrypt_records(self, data, public_key):
+        """
+        Шифрование байтов в последовательность записей фиксированной ширины.
+        
+        :param data: Байты открытого текста
+        :param public_key: Открытый ключ
+        :return: bytearray с записями, выделенный один раз по количеству блоков
+        """
+        public_key = self.key_context(public_key)
+        n, e = public_key
+        width = public_key.byte_length
+        
+        if self.padding == RAW:
+            block_size = public_key.block_size
+            encode = functools.partial(int.from_bytes, byteorder='big')
+        else:
+            # Объект дополнения с буферами создается один раз на часть блоков
+            padder = make_padding(self.padding, width)
+            block_size = padder.capacity
+            encode = padder.encode
+        
+        view = memoryview(data)
+        records = bytearray(width * -(-len(data) // block_size))
+        
+        # Блок короче модуля по построению, поэтому проверка из encrypt не нужна
+        pos = 0
+        for i in range(0, len(data), block_size):
+            block = pow(encode(view[i:i + block_size]), e, n)
+            records[pos:pos + width] = block.to_bytes(width, 'big')
+            pos += width
+        
+        return records
+    
+    def _decrypt_records(self, records, start, block_size, plaintext_length, private_key, padding=RAW):
+        """
+        Дешифрование последовательности записей фиксированной ширины.
+        
+        :param records: Срезы memoryview записей
+        :param start: Номер первой записи (для вычисления длины последнего блока)
+        :param block_size: Размер блока открытого текста
+        :param plaintext_length: Полная длина открытого текста
+        :param private_key: Закрытый ключ
+        :param padding: Схема дополнения блоков (по сигнатуре шифротекста)
+        :return: bytearray с открытым текстом, выделенный один раз по количеству блоков
+        :raises ValueError: Если записи выходят за число блоков открытого текста
+                            или блок не помещается в свою длину
+        """
+        blocks = self.decrypt_many([int.from_bytes(record, 'big') for record in records],
+                                   private_key, workers=1)
+        
+        # Количество записей контейнера проверено по заголовку (cipher.binfile.parse_header),
+        # здесь записи части сверяются с номерами блоков, а не обрезаются по длине
+        stop = start + len(blocks)
+        if stop > record_count(plaintext_length, block_size):
+            raise ValueError("Количество записей не соответствует длине открытого текста")
+        result = bytearray(min(stop * block_size, plaintext_length) - start * block_size)
+        
+        padder = None
+        if padding != RAW:
+            padder = make_padding(padding, self.private_key_context(private_key).byte_length)
+        
+        pos = 0
+        for block in blocks:
+            # Последний блок открытого текста может быть короче остальных
+            length = min(block_size, len(result) - pos)
+            if padder is None:
+                if block.bit_length() > 8 * length:
+                    raise ValueError("Расшифрованный блок длиннее блока открытого текста")
+                result[pos:pos + length] = block.to_bytes(length, 'big')
+            else:
+                message = padder.decode(block)
+                # Та же ошибка, что и для некорректного дополнения: причина отказа не раскрывается
+                if len(message) != length:
+                    raise ValueError(DECODE_ERROR)
+                result[pos:pos + length] = message
+            pos += length
+        
+        return result
+
+
+def _verify_batch(public_key, scheme, hash_name, items):
+    """
+    Проверка части пакета подписей.
+    
+    :param public_key: Открытый ключ RSAPublicKey
+    :param scheme: Схема подписи
+    :param hash_name: Имя хеш-функции
+    :param items: Список пар (сообщение, подпись)
+    :return: Список результатов проверки
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"Неизвестная схема подписи: {scheme}")
+    
+    n, e = public_key
+    bits, width = public_key.bit_length, public_key.byte_length
+    
+    results = []
+    for message, signature in items:
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        s = int.from_bytes(signature, 'big')
+        if len(signature) != width or s >= n:
+            results.append(False)
+            continue
+        results.append(verify_encoded(message, pow(s, e, n), bits, scheme, hash_name))
+    
+    return results
+
+
+def _decrypt_batch(private_key, ciphertexts):
+    """
+    Дешифрование части пакета произвольным закрытым ключом (n, d).
+    
+    :param private_key: Закрытый ключ
+    :param ciphertexts: Список зашифрованных сообщений
+    :return: Список расшифрованных сообщений
+    """
+    n, d = private_key
+    return [pow(ciphertext, d, n) for ciphertext in ciphertexts]
+
+
+def _check_padding(padding):
+    """
+    Проверка названия схемы дополнения.
+    
+    :param padding: Схема дополнения
+    :return: Та же схема
+    """
+    if padding not in PADDINGS:
+        raise ValueError(f"Неизвестная схема дополнения: {padding}")
+    return padding
@@ -0,0 +1,139 @@
+"""
+Кодирование сообщений для подписи RSA (RFC 8017, раздел 9).
+
+Перед подписью сообщение хешируется и кодируется в число длиной с модуль:
+    EMSA-PKCS1-v1_5 - детерминированное дополнение 00 01 FF..FF 00 || DigestInfo || хеш;
+    EMSA-PSS        - вероятностная схема со случайной солью и маской MGF1
+                      (cipher.rsa.padding.mgf1, общая с дополнением OAEP).
+"""
+import hashlib
+import hmac
+
+from cipher.rsa.padding import mgf1
+
+# Схемы подписи
+PKCS1_V15 = 'pkcs1v15'
+PSS = 'pss'
+SCHEMES = (PKCS1_V15, PSS)
+
+# Хеш-функция по умолчанию
+DEFAULT_HASH = 'sha256'
+
+# Префиксы DigestInfo (DER) для EMSA-PKCS1-v1_5 (RFC 8017, раздел 9.2, примечание 1)
+DIGEST_INFO_PREFIXES = {
+    'sha256': bytes.fromhex('3031300d060960864801650304020105000420'),
+    'sha384': bytes.fromhex('3041300d060960864801650304020205000430'),
+    'sha512': bytes.fromhex('3051300d060960864801650304020305000440'),
+}
+
+
+def _hash(hash_name):
+    """Конструктор хеш-функции по имени из DIGEST_INFO_PREFIXES"""
+    if hash_name not in DIGEST_INFO_PREFIXES:
+        raise ValueError(f"Неподдерживаемая хеш-функция: {hash_name}")
+    return getattr(hashlib, hash_name)
+
+
+def pkcs1_v15_encode(message, em_len, hash_name=DEFAULT_HASH):
+    """
+    Кодирование EMSA-PKCS1-v1_5.
+
+    :param message: Подписываемое сообщение (байты)
+    :param em_len: Длина результата в байтах (длина модуля)
+    :param hash_name: Имя хеш-функции
+    :return: Закодированное сообщение длиной em_len байтов
+    :raises ValueError: Если хеш-функция не поддерживается или модуль слишком короткий
+    """
+    # Имя проверяется в _hash до обращения к таблице префиксов
+    digest = _hash(hash_name)(message).digest()
+    t = DIGEST_INFO_PREFIXES[hash_name] + digest
+    if em_len < len(t) + 11:
+        raise ValueError("Модуль слишком короткий для подписи с этой хеш-функцией")
+    return b'\x00\x01' + b'\xff' * (em_len - len(t) - 3) + b'\x00' + t
+
+
+def pss_encode(message, em_bits, salt, hash_name=DEFAULT_HASH):
+    """
+    Кодирование EMSA-PSS.
+
+    :param message: Подписываемое сообщение (байты)
+    :param em_bits: Длина результата в битах (длина модуля минус 1)
+    :param salt: Случайная соль
+    :param hash_name: Имя хеш-функции
+    :return: Закодированное сообщение длиной ceil(em_bits / 8) байтов
+    """
+    hash_func = _hash(hash_name)
+    m_hash = hash_func(message).digest()
+    h_len = len(m_hash)
+    em_len = (em_bits + 7) // 8
+    if em_len < h_len + len(salt) + 2:
+        raise ValueError("Модуль слишком короткий для подписи с этой хеш-функцией")
+
+    h = hash_func(b'\x00' * 8 + m_hash + salt).digest()
+    db = b'\x00' * (em_len - len(salt) - h_len - 2) + b'\x01' + salt
+    masked_db = bytearray(a ^ b for a, b in zip(db, mgf1(h, len(db), hash_name)))
+    # Старшие биты сверх em_bits обнуляются, чтобы число было меньше модуля
+    masked_db[0] &= 0xFF >> (8 * em_len - em_bits)
+    return bytes(masked_db) + h + b'\xbc'
+
+
+def pss_verify(message, em, em_bits, salt_length, hash_name=DEFAULT_HASH):
+    """
+    Проверка кодирования EMSA-PSS.
+
+    :param message: Сообщение
+    :param em: Закодированное сообщение, восстановленное из подписи
+    :param em_bits: Длина закодированного сообщения в битах
+    :param salt_length: Длина соли в байтах
+    :param hash_name: Имя хеш-функции
+    :return: True, если кодирование соответствует сообщению
+    """
+    hash_func = _hash(hash_name)
+    m_hash = hash_func(message).digest()
+    h_len = len(m_hash)
+    em_len = (em_bits + 7) // 8
+    if len(em) != em_len or em_len < h_len + salt_length + 2 or em[-1] != 0xbc:
+        return False
+
+    masked_db, h = em[:em_len - h_len - 1], em[em_len - h_len - 1:-1]
+    top_mask = 0xFF >> (8 * em_len - em_bits)
+    if masked_db[0] & ~top_mask & 0xFF:
+        return False
+
+    db = bytearray(a ^ b for a, b in zip(masked_db, mgf1(h, len(masked_db), hash_name)))
+    db[0] &= top_mask
+
+    padding_length = em_len - h_len - salt_length - 2
+    if any(db[:padding_length]) or db[padding_length] != 0x01:
+        return False
+
+    salt = bytes(db[len(db) - salt_length:]) if salt_length else b''
+    return hmac.compare_digest(hash_func(b'\x00' * 8 + m_hash + salt).digest(), h)
+
+
+def verify_encoded(message, encoded, modulus_bits, scheme, hash_name=DEFAULT_HASH):
+    """
+    Проверка закодированного сообщения, полученного из подписи как s^e mod n.
+
+    :param message: Сообщение
+    :param encoded: Число s^e mod n
+    :param modulus_bits: Длина модуля в битах
+    :param scheme: Схема подписи (PKCS1_V15 или PSS)
+    :param hash_name: Имя хеш-функции
+    :return: True, если подпись верна
+    """
+    if scheme == PKCS1_V15:
+        em_len = (modulus_bits + 7) // 8
+        if encoded.bit_length() > 8 * em_len:
+            return False
+        expected = pkcs1_v15_encode(message, em_len, hash_name)
+        return hmac.compare_digest(encoded.to_bytes(em_len, 'big'), expected)
+
+    if scheme == PSS:
+        em_bits = modulus_bits - 1
+        if encoded.bit_length() > em_bits:
+            return False
+        em = encoded.to_bytes((em_bits + 7) // 8, 'big')
+        return pss_verify(message, em, em_bits, _hash(hash_name)().digest_size, hash_name)
+
+    raise ValueError(f"Неизвестная схема подписи: {scheme}")
@@ -0,0 +1,143 @@
+"""
+Проверка открытых ключей другой стороны и шифротекстов перед возведением в степень.
+
+Некорректные значения отбрасываются до дорогого возведения в степень:
+    проверка диапазона  - значение должно лежать в (1, p-1); для безопасного простого
+                          p = 2q + 1 это исключает подгруппы порядка 1 и 2, остальные
+                          подгруппы имеют порядок q и 2q;
+    проверка подгруппы  - если p безопасное и образующая g - квадратичный вычет,
+                          все допустимые значения лежат в подгруппе квадратичных вычетов
+                          порядка q, что проверяется символом Якоби (a/p) = 1
+                          без возведения в степень (в несколько раз дешевле
+                          возведения в степень с полноразмерным показателем).
+
+Для групп Шнорра с большим кофактором дешевой проверки подгруппы нет, поэтому
+для них выполняется только проверка диапазона. Отклоненные значения учитываются
+счетчиком rejections по источнику и причине.
+"""
+import collections
+import threading
+
+# Причины отклонения
+RANGE = 'range'
+SUBGROUP = 'subgroup'
+
+
+def jacobi(a, n):
+    """
+    Символ Якоби (a/n) для нечетного положительного n (бинарный алгоритм).
+
+    Для простого n совпадает с символом Лежандра: 1 - квадратичный вычет,
+    -1 - невычет, 0 - a делится на n.
+
+    :param a: Целое число
+    :param n: Нечетное положительное число
+    :return: -1, 0 или 1
+    """
+    if n <= 0 or not n & 1:
+        raise ValueError("Символ Якоби определен только для нечетного положительного n")
+    a %= n
+    result = 1
+    while a:
+        # Вынос множителей 2: (2/n) = -1 при n = 3, 5 (mod 8)
+        zeros = (a & -a).bit_length() - 1
+        a >>= zeros
+        if zeros & 1 and n & 7 in (3, 5):
+            result = -result
+        # Квадратичный закон взаимности
+        if a & n & 2:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+
+class RejectionCounter:
+    def __init__(self):
+        """
+        Потокобезопасный счетчик отклоненных значений: (источник, причина) -> количество.
+        """
+        self._lock = threading.Lock()
+        self._counts = collections.Counter()
+
+    def add(self, source, reason):
+        """
+        Учет одного отклоненного значения.
+
+        :param source: Место проверки (например, 'dh.peer_key')
+        :param reason: Причина (RANGE или SUBGROUP)
+        """
+        with self._lock:
+            self._counts[source, reason] += 1
+
+    def counts(self):
+        """
+        Снимок счетчиков.
+
+        :return: Словарь (источник, причина) -> количество
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def total(self, source=None):
+        """
+        Количество отклоненных значений.
+
+        :param source: Место проверки (None - по всем источникам)
+        :return: Количество
+        """
+        with self._lock:
+            return sum(count for (name, _), count in self._counts.items() if source in (None, name))
+
+    def reset(self):
+        """Обнуление счетчиков"""
+        with self._lock:
+            self._counts.clear()
+
+
+# Счетчик процесса
+rejections = RejectionCounter()
+
+
+def has_quadratic_residue_subgroup(p, g, safe_prime):
+    """
+    Можно ли проверять принадлежность подгруппе символом Якоби.
+
+    :param p: Модуль
+    :param g: Образующая
+    :param safe_prime: Является ли p безопасным простым числом
+    :return: True, если p безопасное и g - квадратичный вычет (порождает подгруппу порядка q)
+    """
+    return safe_prime and jacobi(g, p) == 1
+
+
+def check_element(value, p, source, check_subgroup=False):
+    """
+    Проверка элемента группы перед возведением в степень.
+
+    :param value: Проверяемое значение (открытый ключ или компонента шифротекста)
+    :param p: Модуль
+    :param source: Место проверки для счетчика rejections
+    :param check_subgroup: Проверять символом Якоби принадлежность подгруппе квадратичных вычетов
+    :raises ValueError: Если значение не прошло проверку
+    """
+    if not 1 < value < p - 1:
+        rejections.add(source, RANGE)
+        raise ValueError("Значение вне допустимого диапазона (1, p-1)")
+    if check_subgroup and jacobi(value, p) != 1:
+        rejections.add(source, SUBGROUP)
+        raise ValueError("Значение не принадлежит подгруппе простого порядка")
+
+
+def check_residue(value, p, source):
+    """
+    Проверка, что значение - вычет по модулю p (например, компонента b шифротекста,
+    которая равна 0 для нулевого открытого текста).
+
+    :param value: Проверяемое значение
+    :param p: Модуль
+    :param source: Место проверки для счетчика rejections
+    :raises ValueError: Если значение вне [0, p)
+    """
+    if not 0 <= value < p:
+        rejections.add(source, RANGE)
+        raise ValueError("Значение вне допустимого диапазона [0, p)")